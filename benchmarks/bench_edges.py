@@ -0,0 +1,51 @@
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from edge_builder import build_edges
+from bench_pipeline import git_commit
+
+# ── Config ─────────────────────────────────────────────────────────────────
+SIZES    = [100, 1000, 5000, 20000]
+METHODS  = ["delaunay", "knn"]
+SPACING  = 40        # pixels between neighbouring rooms
+REPEATS  = 3
+SEED     = 7
+
+# ── Synthetic floor ────────────────────────────────────────────────────────
+# Rooms on a jittered grid, SPACING pixels apart.
+def synthetic_nodes(count, rng):
+    side = int(np.ceil(np.sqrt(count)))
+    r, c = np.divmod(np.arange(count), side)
+    xy   = np.stack([c, r], axis=1) * SPACING + rng.uniform(-5, 5, (count, 2))
+    return [{"id": f"n{i}", "x": float(x), "y": float(y)} for i, (x, y) in enumerate(xy)]
+
+# ── Main ───────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Automatic edge builder scaling benchmark")
+    parser.add_argument("--sizes",   type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    args   = parser.parse_args()
+    rng    = np.random.default_rng(SEED)
+    commit = git_commit()
+
+    for count in args.sizes:
+        nodes = synthetic_nodes(count, rng)
+        for method in METHODS:
+            samples = []
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                edges = build_edges(nodes, method=method)
+                samples.append(time.perf_counter() - start)
+            print(json.dumps({"bench": "edge_builder", "nodes": count, "method": method,
+                              "edges": len(edges), "edges_per_node": round(len(edges) / count, 2),
+                              "best_ms": round(min(samples) * 1000, 2),
+                              "mean_ms": round(float(np.mean(samples)) * 1000, 2),
+                              "commit": commit}))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sign_matcher import SignMatcher
+from fuzzy_match import FuzzyMatcher, CONFUSABLE
+from bench_sign_matcher import BASE_SIGN_MAP
+from bench_pipeline import git_commit
+
+# ── Config ─────────────────────────────────────────────────────────────────
+SIZES     = [13, 1000, 5000]
+SAMPLES   = 4000       # synthetic OCR lines when no labelled files are given
+LOOKUPS   = 2000       # timed fuzzy lookups per sign map size
+MIN_CONF  = 0.4        # match_text ignores anything less confident
+SEED      = 22
+
+# Synthetic OCR channel, per character
+P_CONFUSE = 0.10       # swapped within its CONFUSABLE group
+P_DROP    = 0.02
+P_TYPO    = 0.02       # replaced by or followed by a random character
+P_SPACE   = 0.04       # space inserted or removed
+
+# ── Samples ────────────────────────────────────────────────────────────────
+# Labelled samples are JSONL lines {"text": ..., "node": ... | null}; null
+# marks a line that is not one of our signs. `--template LOG` turns the OCR
+# events of a replay.py log into that format, pre-filled with the exact
+# match, for correcting by hand.
+SIGNS = [
+    ("Room 045",            "room_045"), ("ROOM 045 Active Learning", "room_045"),
+    ("Active Learning",     "room_045"), ("Room 040",                 "room_040"),
+    ("ROOM 025",            "room_025"), ("Room 010",                 "room_010"),
+    ("Stairs",              "stairs"),   ("STAIR 2",                  "stairs"),
+    ("Room 125",            "125"),      ("130",                      "130"),
+    ("Room 135",            "135"),      ("140",                      "140"),
+    ("Main Hall",           "main_hall"), ("EXIT",                    "exit"),
+]
+
+# Corridor text that is not a sign we know, including other room numbers
+DISTRACTORS = [
+    "Fire Extinguisher", "No Entry", "PUSH", "Pull", "Authorised Personnel Only",
+    "Recycling", "Caution Wet Floor", "Printer", "Lab 2B", "Notice Board",
+    "Room 046", "Room 150", "Room 041", "Room 210", "Accessible Toilet",
+    "Lecture Theatre", "Lift", "Please close the door", "Next", "Cafe",
+]
+
+_GROUP = {ch: group for group in CONFUSABLE for ch in group}
+_CHARS = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+def corrupt(text, rng):
+    out = []
+    for ch in text:
+        low = ch.lower()
+        r   = rng.random()
+        if r < P_DROP:
+            continue
+        if r < P_DROP + P_CONFUSE and low in _GROUP:
+            ch = rng.choice(_GROUP[low].replace(low, "") or low)
+            ch = ch.upper() if rng.random() < 0.5 else ch
+        elif r < P_DROP + P_CONFUSE + P_TYPO:
+            ch = rng.choice([rng.choice(_CHARS), ch + rng.choice(_CHARS)])
+        if rng.random() < P_SPACE:
+            ch = "" if ch == " " else ch + " "
+        out.append(ch)
+    return "".join(out)
+
+def synthetic_samples(count, rng):
+    samples = []
+    for _ in range(count):
+        text, node = rng.choice(SIGNS) if rng.random() < 0.6 else (rng.choice(DISTRACTORS), None)
+        samples.append({"text": corrupt(text, rng), "node": node, "conf": 0.9})
+    return samples
+
+def load_samples(paths):
+    samples = []
+    for path in paths:
+        with open(path, "r") as f:
+            samples += [json.loads(line) for line in f if line.strip()]
+    return samples
+
+def template(log_path, exact):
+    with open(log_path, "r") as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    seen = set()
+    for event in events:
+        for text, conf in event.get("texts", []) if event.get("event") == "ocr" else []:
+            if conf > MIN_CONF and text not in seen:
+                seen.add(text)
+                print(json.dumps({"text": text, "node": exact.match(text.lower().strip())}))
+
+# ── Precision / recall ─────────────────────────────────────────────────────
+# Scored per OCR line, the way match_text sees them: exact first, then fuzzy.
+def score(samples, exact, fuzzy=None):
+    tp = fp = fn = 0
+    for s in samples:
+        if s.get("conf", 1.0) <= MIN_CONF:
+            continue
+        text = s["text"].lower().strip()
+        pred = exact.match(text)
+        if pred is None and fuzzy is not None:
+            pred = fuzzy.match(text)
+        if pred is not None and pred == s["node"]:
+            tp += 1
+        elif pred is not None:
+            fp += 1
+        if s["node"] is not None and pred != s["node"]:
+            fn += 1
+    return {"precision": round(tp / max(tp + fp, 1), 4),
+            "recall":    round(tp / max(tp + fn, 1), 4),
+            "false_pos": fp}
+
+# ── Lookup latency ─────────────────────────────────────────────────────────
+# Learned keys are whole OCR lines, mostly "room ..." with a number, so
+# they share bigrams heavily: the slow case for the posting lists.
+def grow_sign_map(size, rng):
+    words    = ["room", "lab", "office", "lecture", "hall", "toilet", "stair", "study",
+                "seminar", "kitchen", "store", "plant", "meeting", "reception"]
+    sign_map = dict(BASE_SIGN_MAP)
+    while len(sign_map) < size:
+        key = " ".join(rng.sample(words, rng.randint(1, 3))) + f" {rng.randint(1, 999):03d}"
+        sign_map[key] = rng.choice(list(BASE_SIGN_MAP.values()))
+    return sign_map
+
+def lookup_us(fuzzy, texts):
+    times = []
+    for text in texts:
+        start = time.perf_counter()
+        fuzzy.match(text)
+        times.append((time.perf_counter() - start) * 1e6)
+    return float(np.mean(times)), float(np.percentile(times, 99))
+
+# ── Main ───────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Fuzzy sign matching: precision/recall and latency")
+    parser.add_argument("samples",    nargs="*", help="labelled JSONL files (default: synthetic)")
+    parser.add_argument("--template", default=None, help="print a labelling template for a replay log")
+    args   = parser.parse_args()
+    rng    = random.Random(SEED)
+    exact  = SignMatcher(BASE_SIGN_MAP)
+    if args.template:
+        template(args.template, exact)
+        return
+
+    samples = load_samples(args.samples) if args.samples else synthetic_samples(SAMPLES, rng)
+    fuzzy   = FuzzyMatcher(BASE_SIGN_MAP)
+    commit  = git_commit()
+    source  = ",".join(args.samples) or "synthetic"
+    for mode, matcher in (("exact", None), ("fuzzy", fuzzy)):
+        print(json.dumps({"bench": "fuzzy_match", "mode": mode, "samples": len(samples),
+                          "source": source, **score(samples, exact, matcher), "commit": commit}))
+
+    texts = [s["text"].lower().strip() for s in samples[:LOOKUPS]]
+    for size in SIZES:
+        matcher      = FuzzyMatcher(grow_sign_map(size, rng))
+        mean, p99    = lookup_us(matcher, texts)
+        print(json.dumps({"bench": "fuzzy_lookup", "keys": len(matcher),
+                          "mean_us": round(mean, 1), "p99_us": round(p99, 1), "commit": commit}))
+
+if __name__ == "__main__":
+    main()
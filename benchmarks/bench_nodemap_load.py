@@ -0,0 +1,64 @@
+import os
+import sys
+import json
+import random
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from nodemap_binary import compile_nodemap_file
+from routing import FloorGraph
+
+# ── Config ─────────────────────────────────────────────────────────────────
+NODES   = 50000
+DEGREE  = 3
+LOOKUPS = 1000
+SEED    = 3
+
+# ── Synthetic campus export ────────────────────────────────────────────────
+def synthetic_nodemap(rng):
+    nodes = []
+    for i in range(NODES):
+        x, y = rng.uniform(0, 20000), rng.uniform(0, 20000)
+        nodes.append({"id": f"room_{i:06d}", "x": x, "y": y,
+                      "x1": x - 20, "y1": y - 20, "x2": x + 20, "y2": y + 20})
+    edges = [{"from": nodes[i]["id"], "to": nodes[rng.randrange(NODES)]["id"],
+              "dist": round(rng.uniform(10, 500), 1)}
+             for i in range(NODES) for _ in range(DEGREE)]
+    return {"nodes": nodes, "edges": edges}
+
+def timed(fn):
+    start  = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+# ── Main ───────────────────────────────────────────────────────────────────
+def main():
+    rng = random.Random(SEED)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "campus_nodemap.json")
+        with open(path, "w") as f:
+            json.dump(synthetic_nodemap(rng), f)
+
+        json_graph, json_ms = timed(lambda: FloorGraph.load("campus", path))
+        _, compile_ms       = timed(lambda: compile_nodemap_file(path))
+        bin_graph, bin_ms   = timed(lambda: FloorGraph.load("campus", path))
+
+        wanted = [f"room_{rng.randrange(NODES):06d}" for _ in range(LOOKUPS)]
+        for node_id in wanted[:50]:
+            i = json_graph.lookup(node_id)
+            assert bin_graph.lookup(node_id) == i
+            assert list(bin_graph.neighbors(i)) == list(json_graph.neighbors(i))
+
+        _, json_lookup_ms = timed(lambda: [json_graph.lookup(n) for n in wanted])
+        _, bin_lookup_ms  = timed(lambda: [bin_graph.lookup(n) for n in wanted])
+
+    print(f"🗺️  {NODES} nodes, {NODES * DEGREE} edges")
+    print(f"  JSON load       {json_ms:9.1f} ms")
+    print(f"  compile         {compile_ms:9.1f} ms (once, at the edges step)")
+    print(f"  memmap load     {bin_ms:9.1f} ms")
+    print(f"  {LOOKUPS} id lookups: JSON dict {json_lookup_ms:.1f} ms, "
+          f"memmap {bin_lookup_ms:.1f} ms")
+
+if __name__ == "__main__":
+    main()
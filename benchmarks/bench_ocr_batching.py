@@ -0,0 +1,106 @@
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import numpy as np
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+from stubs import FakeReader
+from bench_pipeline import corridor_frame, git_commit
+from text_regions import RegionReader
+from ocr_batcher import OCRBatcher
+
+# ── Config ─────────────────────────────────────────────────────────────────
+SESSIONS    = [1, 2, 4, 8, 16]
+BATCHES     = [1, 4, 8, 16]
+FPS         = 10.0        # offered per session
+SECONDS     = 5.0
+MAX_WAIT    = 0.010
+OCR_LATENCY = 0.03        # stub s per model call
+OCR_ITEM    = 0.004       # stub s per crop
+FRAMES      = 20
+
+# ── One phone ──────────────────────────────────────────────────────────────
+# Offers a frame every 1/fps seconds; a frame due while the previous one is
+# still being read is dropped (the server's latest-wins), so latency measures
+# the batcher rather than a growing client queue.
+def session(batcher, frames, fps, seconds, latencies, counts):
+    start, due, done, dropped = time.perf_counter(), 0, 0, 0
+    while True:
+        now = time.perf_counter()
+        if now - start >= seconds:
+            break
+        tick     = int((now - start) * fps)
+        dropped += max(tick - due, 0)
+        due      = tick + 1
+        sent     = time.perf_counter()
+        batcher.readtext(frames[done % len(frames)])
+        latencies.append(time.perf_counter() - sent)
+        done += 1
+        time.sleep(max(0.0, start + due / fps - time.perf_counter()))
+    counts.append((done, dropped))
+
+def run(reader, frames, sessions, max_batch, fps, seconds):
+    batcher   = OCRBatcher(reader, max_batch=max_batch, max_wait=MAX_WAIT)
+    latencies = []
+    counts    = []
+    threads   = [threading.Thread(target=session, args=(batcher, frames, fps, seconds,
+                                                        latencies, counts))
+                 for _ in range(sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    batcher.close()
+
+    ms        = np.array(latencies or [np.nan]) * 1000
+    processed = sum(c[0] for c in counts)
+    return {"bench": "ocr_batching", "sessions": sessions, "max_batch": max_batch,
+            "fps_offered": fps * sessions,
+            "fps_processed": round(processed / elapsed, 2),
+            "dropped":       sum(c[1] for c in counts),
+            "mean_batch":    round(batcher.mean_batch(), 2),
+            "p50_ms":        round(float(np.nanpercentile(ms, 50)), 2),
+            "p99_ms":        round(float(np.nanpercentile(ms, 99)), 2)}
+
+# ── Main ───────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Cross-session OCR micro-batching sweep")
+    parser.add_argument("--sessions",    type=int, nargs="+", default=SESSIONS)
+    parser.add_argument("--batches",     type=int, nargs="+", default=BATCHES)
+    parser.add_argument("--fps",         type=float, default=FPS)
+    parser.add_argument("--seconds",     type=float, default=SECONDS)
+    parser.add_argument("--ocr-latency", type=float, default=OCR_LATENCY)
+    parser.add_argument("--ocr-item",    type=float, default=OCR_ITEM)
+    parser.add_argument("--real-ocr",    action="store_true", help="use the installed easyocr")
+    parser.add_argument("--out",         default=None, help="append JSONL results to this file")
+    args = parser.parse_args()
+
+    if args.real_ocr:
+        import easyocr
+        model = easyocr.Reader(["en"], gpu=False)
+    else:
+        model = FakeReader(script=["Room 130", None, "Stairs"], latency=args.ocr_latency,
+                           item_latency=args.ocr_item)
+    reader = RegionReader(model)
+    rng    = np.random.default_rng(5)
+    frames = [corridor_frame(rng) for _ in range(FRAMES)]
+    commit = git_commit()
+
+    for sessions in args.sessions:
+        for max_batch in args.batches:
+            row = run(reader, frames, sessions, max_batch, args.fps, args.seconds)
+            row.update(commit=commit, real_ocr=args.real_ocr)
+            line = json.dumps(row)
+            print(line)
+            if args.out:
+                with open(args.out, "a") as f:
+                    f.write(line + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+import contextlib
+import cv2
+import numpy as np
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+import stubs
+from bench_text_regions import corridor_frame
+
+# ── Config ─────────────────────────────────────────────────────────────────
+ITERATIONS  = 200
+FRAMES      = 20
+SEED        = 7
+DESTINATION = "130"
+SPACING     = 120        # px between surveyed corridor nodes
+
+# Surveyed corridors written as throwaway nodemaps (same order as the
+# fixed routes in full_navigation.py)
+CORRIDORS = {
+    "lower":  ["entrance", "room_045", "room_040", "stairs", "room_025", "room_010"],
+    "floor1": ["stairs", "125", "130", "135", "140", "main_hall", "exit"],
+}
+SIGN_TEXT = {"room_045": "ROOM 045", "room_040": "ROOM 040", "stairs": "STAIRS",
+             "room_025": "ROOM 025", "room_010": "ROOM 010", "125": "125",
+             "130": "130", "135": "135", "140": "140", "main_hall": "MAIN HALL",
+             "exit": "EXIT"}
+
+# ── Fixtures ───────────────────────────────────────────────────────────────
+def write_nodemaps(workdir):
+    paths = {"lower": "nodemap_final.json", "floor1": "floor1_nodemap.json"}
+    for floor, ids in CORRIDORS.items():
+        nodes = [{"id": n, "x": 100 + i * SPACING, "y": 200} for i, n in enumerate(ids)]
+        edges = [{"from": a, "to": b, "dist": SPACING} for a, b in zip(ids, ids[1:])]
+        with open(os.path.join(workdir, paths[floor]), "w") as f:
+            json.dump({"nodes": nodes, "edges": edges}, f)
+
+def ocr_script(route, gap):
+    # `gap` empty reads between consecutive signs of the route
+    script = []
+    for node in route[1:]:
+        script += [None] * gap + [SIGN_TEXT.get(node, node)]
+    return script
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+# ── Timing ─────────────────────────────────────────────────────────────────
+def summarize(stage, samples, **extra):
+    ms = np.asarray(samples) * 1000
+    return {"stage": stage, "n": len(ms),
+            "mean_ms": round(float(ms.mean()), 4),
+            "p50_ms":  round(float(np.percentile(ms, 50)), 4),
+            "p95_ms":  round(float(np.percentile(ms, 95)), 4),
+            "p99_ms":  round(float(np.percentile(ms, 99)), 4),
+            "max_ms":  round(float(ms.max()), 4), **extra}
+
+def time_calls(fn, args, iterations):
+    samples = []
+    for i in range(iterations):
+        a     = args(i)
+        start = time.perf_counter()
+        fn(*a)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+# ── Stages ─────────────────────────────────────────────────────────────────
+def run_stages(nav_pipeline, frames, jpegs, iterations):
+    route, floor_type, floors = nav_pipeline.build_route(DESTINATION)
+    records = []
+    n       = len(frames)
+
+    # Capture: decoding a camera-sized JPEG stands in for cap.read()
+    records.append(summarize("capture", time_calls(
+        lambda buf: cv2.imdecode(buf, cv2.IMREAD_COLOR), lambda i: (jpegs[i % n],),
+        iterations)))
+
+    ocr_results = [nav_pipeline.reader.get().readtext(f) for f in frames]
+    records.append(summarize("ocr", time_calls(
+        nav_pipeline.reader.get().readtext, lambda i: (frames[i % n],), iterations),
+        regions=nav_pipeline.OCR_REGIONS))
+
+    texts = [[(r[1], r[2]) for r in res] + [("FIRE DOOR", 0.8), ("KEEP CLEAR", 0.7)]
+             for res in ocr_results]
+    records.append(summarize("match", time_calls(
+        nav_pipeline.match_text, lambda i: (texts[i % n],), iterations)))
+
+    # Navigation: walk the route over and over, one detected node per call
+    nav_pipeline.USE_LLAMA = False
+    state = {"nav": None}
+    def next_update(i):
+        nav = state["nav"]
+        if nav is None or nav.completed:
+            nav = state["nav"] = nav_pipeline.Navigator(route, floor_type, floors)
+        return nav, route[nav.current_step + 1]
+    records.append(summarize("navigate", time_calls(
+        lambda nav, node: nav.update(node), next_update, iterations)))
+
+    nav_pipeline.USE_LLAMA = True
+    legs = nav_pipeline.route_legs(route, floors)
+    records.append(summarize("instruction_generate", time_calls(
+        nav_pipeline.generate_llama_instruction, lambda i: legs[i % len(legs)], iterations)))
+    for leg in legs:
+        nav_pipeline.get_llama_instruction(*leg)
+    records.append(summarize("instruction_cached", time_calls(
+        nav_pipeline.get_llama_instruction, lambda i: legs[i % len(legs)], iterations)))
+
+    nav = nav_pipeline.Navigator(route, floor_type, floors)
+    nav.update(route[1])
+    records.append(summarize("overlay", time_calls(
+        nav_pipeline.draw_overlay,
+        lambda i: (frames[i % n].copy(), ocr_results[i % n], nav, route[1]), iterations)))
+    records.append(summarize("minimap", time_calls(
+        nav_pipeline.draw_minimap, lambda i: (frames[i % n].copy(), nav), iterations)))
+    records.append(summarize("hud_cached", time_calls(
+        nav_pipeline.draw_hud,
+        lambda i: (frames[i % n].copy(), ocr_results[i % n], nav, route[1]), iterations)))
+
+    records.append(end_to_end(nav_pipeline, route, floor_type, floors, jpegs, iterations))
+    return records
+
+# The main() loop minus the window: decode → gate/schedule → inline OCR →
+# match → navigate → cached HUD
+def end_to_end(nav_pipeline, route, floor_type, floors, jpegs, iterations):
+    nav     = nav_pipeline.Navigator(route, floor_type, floors)
+    gate    = nav_pipeline.FrameGate(nav_pipeline.FRAME_GATE) if nav_pipeline.FRAME_GATE else None
+    sched   = nav_pipeline.OCRScheduler(nav_pipeline.route_leg_pixels(route, floors),
+                                        cpu_budget=nav_pipeline.OCR_CPU_BUDGET,
+                                        latency_slo=nav_pipeline.OCR_LATENCY_SLO)
+    samples, ocr_calls = [], 0
+    ocr_results, last_matched = [], None
+    for i in range(iterations):
+        start = time.perf_counter()
+        frame = cv2.imdecode(jpegs[i % len(jpegs)], cv2.IMREAD_COLOR)
+        if sched.due(frame, nav.current_step) and (gate is None or gate.changed(frame)):
+            t0          = time.perf_counter()
+            ocr_results = nav_pipeline.reader.get().readtext(frame)
+            sched.record_latency(time.perf_counter() - t0)
+            ocr_calls  += 1
+            node        = nav_pipeline.handle_ocr_results(ocr_results, nav)
+            if node:
+                last_matched = node
+        frame = nav_pipeline.draw_hud(frame, ocr_results, nav, last_matched)
+        samples.append(time.perf_counter() - start)
+    return summarize("end_to_end", samples, ocr_calls=ocr_calls,
+                     fps=round(len(samples) / sum(samples), 2))
+
+# ── Main ───────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage NaviGrid pipeline benchmark")
+    parser.add_argument("--iterations",  type=int,   default=ITERATIONS)
+    parser.add_argument("--ocr-latency", type=float, default=0.0, help="fake readtext seconds")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="fake chat seconds")
+    parser.add_argument("--real-ocr", action="store_true", help="use the installed easyocr")
+    parser.add_argument("--real-llm", action="store_true", help="use the local ollama server")
+    parser.add_argument("--out", default=None, help="append JSONL records to this file")
+    args = parser.parse_args()
+
+    rng    = np.random.default_rng(SEED)
+    frames = [corridor_frame(rng) for _ in range(FRAMES)]
+    jpegs  = [cv2.imencode(".jpg", f)[1] for f in frames]
+    route  = CORRIDORS["lower"][:3] + CORRIDORS["floor1"][:3]
+    stubs.install(ocr=not args.real_ocr, llm=not args.real_llm,
+                  ocr_script=ocr_script(route, gap=3),
+                  ocr_latency=args.ocr_latency, llm_latency=args.llm_latency)
+
+    # full_navigation reads and writes its stores in the working directory
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        write_nodemaps(workdir)
+        os.chdir(workdir)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                import full_navigation as nav_pipeline
+                records = run_stages(nav_pipeline, frames, jpegs, args.iterations)
+                nav_pipeline.PREFETCHER.close()
+                nav_pipeline.SIGN_MAP.close()
+                nav_pipeline.memory.close()
+        finally:
+            os.chdir(cwd)
+
+    run = {"bench": "pipeline", "commit": git_commit(), "time": round(time.time(), 3),
+           "python": platform.python_version(), "iterations": args.iterations,
+           "real_ocr": args.real_ocr, "real_llm": args.real_llm}
+    lines = [json.dumps({**run, **record}) for record in records]
+    print("\n".join(lines))
+    if args.out:
+        with open(args.out, "a") as f:
+            f.write("\n".join(lines) + "\n")
+
+if __name__ == "__main__":
+    main()
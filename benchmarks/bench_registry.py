@@ -0,0 +1,94 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import bench_routing
+from bench_routing import synthetic_floor
+from bench_pipeline import git_commit
+from nodemap_binary import compile_nodemap_file
+from registry import Registry, load_manifest
+
+# ── Config ─────────────────────────────────────────────────────────────────
+BUILDINGS = 12
+FLOORS    = 6
+GRID      = 30        # GRID × GRID rooms per floor
+QUERIES   = 400
+ZIPF_S    = 1.2       # popularity skew across buildings
+CAP_MB    = [2, 4, 8]
+SEED      = 23
+
+# ── Synthetic campus ───────────────────────────────────────────────────────
+def write_campus(root, rng):
+    bench_routing.GRID = GRID
+    buildings = {}
+    for b in range(BUILDINGS):
+        name, floors = f"bldg{b:02d}", []
+        for f in range(FLOORS):
+            path = os.path.join(root, f"{name}_f{f}.json")
+            with open(path, "w") as fh:
+                json.dump(synthetic_floor(f"f{f}", rng), fh)
+            compile_nodemap_file(path)
+            floors.append({"id": f"f{f}", "nodemap": os.path.basename(path)})
+        buildings[name] = {"start": ["f0", "stairs"], "floors": floors}
+    with open(os.path.join(root, "campus.json"), "w") as fh:
+        json.dump({"buildings": buildings}, fh)
+    return os.path.join(root, "campus.json")
+
+def queries(manifest, rng):
+    names   = sorted(manifest["buildings"])
+    weights = [1 / (i + 1) ** ZIPF_S for i in range(len(names))]
+    out     = []
+    for _ in range(QUERIES):
+        b     = rng.choices(names, weights)[0]
+        floor = rng.choice(manifest["buildings"][b]["floors"])["id"]
+        # Row 1+ / column < GRID-1 skips the renamed stairs and elevator rooms
+        room  = f"{floor}_{rng.randrange(1, GRID)}_{rng.randrange(GRID - 1)}"
+        out.append((b, ("f0", "stairs"), (floor, room)))
+    return out
+
+# ── Main ───────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Building registry LRU / memory-cap benchmark")
+    parser.add_argument("--caps", type=float, nargs="+", default=CAP_MB, help="memory caps in MB")
+    args   = parser.parse_args()
+    rng    = random.Random(SEED)
+    commit = git_commit()
+
+    with tempfile.TemporaryDirectory() as root:
+        path     = write_campus(root, rng)
+        manifest = load_manifest(path)
+        work     = queries(manifest, rng)
+
+        full = Registry(manifest, memory_cap=float("inf"))
+        for b in full.buildings():
+            full.graph(b)
+        everything = full.resident_bytes()
+
+        for cap in args.caps:
+            registry = Registry(load_manifest(path), memory_cap=int(cap * 1024 * 1024))
+            samples, peak = [], 0
+            for building, source, target in work:
+                start = time.perf_counter()
+                registry.route(building, source, target)
+                samples.append(time.perf_counter() - start)
+                peak = max(peak, registry.resident_bytes())
+            ms    = np.array(samples) * 1000
+            stats = registry.stats()
+            print(json.dumps({"bench": "registry", "buildings": BUILDINGS, "floors": FLOORS,
+                              "nodes_per_floor": GRID * GRID, "cap_mb": cap,
+                              "all_floors_mb": round(everything / 2**20, 2),
+                              "peak_mb":       round(peak / 2**20, 2),
+                              "hit_rate":      round(stats["hits"] / (stats["hits"] + stats["misses"]), 3),
+                              "misses":        stats["misses"], "evictions": stats["evictions"],
+                              "route_p50_ms":  round(float(np.percentile(ms, 50)), 2),
+                              "route_p99_ms":  round(float(np.percentile(ms, 99)), 2),
+                              "commit": commit}))
+
+if __name__ == "__main__":
+    main()
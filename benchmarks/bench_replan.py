@@ -0,0 +1,88 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from routing import FloorGraph, BuildingGraph
+from dstar_lite import DStarLite
+from bench_routing import synthetic_floor
+from bench_pipeline import git_commit
+
+# ── Config ─────────────────────────────────────────────────────────────────
+FLOORS   = 3
+WALKS    = 20
+DETOUR   = 0.15       # chance per step of a wrong turn
+WANDER   = 4          # steps walked off the route on a wrong turn
+SEED     = 24
+
+# ── Off-route walk ─────────────────────────────────────────────────────────
+# The user follows the current plan but now and then takes a wrong turn and
+# wanders a few random steps; the navigator re-plans from wherever they end
+# up. Yields every position a re-plan is needed from.
+def wrong_turns(graph, start, goal, rng):
+    node, path = start, graph.shortest_path(start, goal)[0]
+    for _ in range(4 * len(path)):
+        if node == goal or path is None:
+            return
+        if rng.random() < DETOUR:
+            for _ in range(WANDER):
+                node = rng.choice([n for n, _ in graph.neighbors(node)])
+            yield node
+            path = graph.shortest_path(node, goal)[0]
+        elif len(path) > 1:
+            path = path[1:]
+            node = path[0]
+
+# ── Main ───────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="D* Lite re-planning vs fresh A* / Dijkstra")
+    parser.add_argument("--walks", type=int, default=WALKS)
+    args   = parser.parse_args()
+    rng    = random.Random(SEED)
+    names  = [f"floor{i}" for i in range(FLOORS)]
+    graph  = BuildingGraph({n: FloorGraph.from_nodemap(n, synthetic_floor(n, rng)) for n in names},
+                           names)
+
+    times  = {"dstar": [], "astar": [], "dijkstra": []}
+    nodes  = {"dstar": [], "astar": [], "dijkstra": []}
+    first  = []
+    for _ in range(args.walks):
+        src, dst = rng.choice(names), rng.choice(names)
+        start    = (src, rng.randrange(len(graph.floors[src])))
+        goal     = (dst, rng.randrange(len(graph.floors[dst])))
+        planner  = DStarLite(graph, goal)
+        t0       = time.perf_counter()
+        planner.path(start)
+        first.append((time.perf_counter() - t0) * 1000)
+
+        for node in wrong_turns(graph, start, goal, rng):
+            t0   = time.perf_counter()
+            path = planner.path(node)
+            times["dstar"].append((time.perf_counter() - t0) * 1000)
+            nodes["dstar"].append(planner.expanded)
+            cost = sum(graph.edge_length(a, b) for a, b in zip(path, path[1:]))
+
+            for name, astar in (("astar", True), ("dijkstra", False)):
+                t0       = time.perf_counter()
+                _, fresh = graph.shortest_path(node, goal, astar=astar)
+                times[name].append((time.perf_counter() - t0) * 1000)
+                nodes[name].append(graph.expanded)
+                assert math.isclose(cost, fresh), f"D* Lite {cost} vs {name} {fresh}"
+
+    commit = git_commit()
+    for name in times:
+        print(json.dumps({"bench": "replan", "planner": name, "replans": len(times[name]),
+                          "ms_mean": round(float(np.mean(times[name])), 3),
+                          "ms_p99": round(float(np.percentile(times[name], 99)), 3),
+                          "expanded_mean": round(float(np.mean(nodes[name])), 1),
+                          **({"first_plan_ms": round(float(np.mean(first)), 2)}
+                             if name == "dstar" else {}),
+                          "commit": commit}))
+
+if __name__ == "__main__":
+    main()
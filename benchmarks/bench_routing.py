@@ -0,0 +1,106 @@
+import os
+import sys
+import math
+import random
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from routing import FloorGraph, BuildingGraph
+
+# ── Config ─────────────────────────────────────────────────────────────────
+FLOORS   = 4
+GRID     = 55        # GRID × GRID rooms per floor → ~12k nodes in total
+SPACING  = 40        # pixels between neighbouring rooms
+DROPOUT  = 0.15      # fraction of corridor edges removed (walls)
+QUERIES  = 50
+SEED     = 11
+
+# ── Synthetic building ─────────────────────────────────────────────────────
+def synthetic_floor(name, rng):
+    nodes, edges = [], []
+    for r in range(GRID):
+        for c in range(GRID):
+            nodes.append({"id": f"{name}_{r}_{c}",
+                          "x": c * SPACING + rng.uniform(-5, 5),
+                          "y": r * SPACING + rng.uniform(-5, 5)})
+
+    def connect(a, b):
+        na, nb = nodes[a], nodes[b]
+        dist   = math.hypot(na["x"] - nb["x"], na["y"] - nb["y"])
+        edges.append({"from": na["id"], "to": nb["id"], "dist": round(dist, 1)})
+
+    for r in range(GRID):
+        for c in range(GRID):
+            i = r * GRID + c
+            # Keep row 0 and column 0 intact so every floor stays connected
+            if c + 1 < GRID and (r == 0 or rng.random() > DROPOUT):
+                connect(i, i + 1)
+            if r + 1 < GRID and (c == 0 or rng.random() > DROPOUT):
+                connect(i, i + GRID)
+
+    # Stairs in one corner, elevator in the opposite one
+    nodes[0]["id"]  = "stairs"
+    nodes[-1]["id"] = "elevator"
+    for e in edges:
+        for key in ("from", "to"):
+            if e[key] == f"{name}_0_0":
+                e[key] = "stairs"
+            elif e[key] == f"{name}_{GRID-1}_{GRID-1}":
+                e[key] = "elevator"
+    return {"nodes": nodes, "edges": edges}
+
+# ── Pixel frames ───────────────────────────────────────────────────────────
+# Each floor has its own pixel frame. Here the straight corridor to the goal
+# costs 1000 px, but the detour via floor "b", whose frame is far smaller,
+# costs 31: A* must not let the straight line hide it.
+def frames_check():
+    a = {"nodes": [{"id": "start",  "x": 0,   "y": 0}, {"id": "stairs",   "x": -5,  "y": 0},
+                   {"id": "goal",   "x": 1000, "y": 0}, {"id": "elevator", "x": 999, "y": 0}],
+         "edges": [{"from": "start", "to": "goal",     "dist": 1000.0},
+                   {"from": "start", "to": "stairs",   "dist": 5.0},
+                   {"from": "goal",  "to": "elevator", "dist": 1.0}]}
+    b = {"nodes": [{"id": "stairs", "x": 0, "y": 0}, {"id": "elevator", "x": 5, "y": 0}],
+         "edges": [{"from": "stairs", "to": "elevator", "dist": 5.0}]}
+    graph = BuildingGraph({"a": FloorGraph.from_nodemap("a", a), "b": FloorGraph.from_nodemap("b", b)},
+                          ["a", "b"], {"stairs": 10.0, "elevator": 10.0})
+    costs = [graph.route(("a", "start"), ("a", "goal"), astar)[2] for astar in (False, True)]
+    assert math.isclose(costs[0], 31.0) and math.isclose(costs[1], 31.0), \
+        f"cross-floor detour: Dijkstra {costs[0]}, A* {costs[1]}"
+
+# ── Main ───────────────────────────────────────────────────────────────────
+def main():
+    frames_check()
+    rng   = random.Random(SEED)
+    names = [f"floor{i}" for i in range(FLOORS)]
+    data  = {name: synthetic_floor(name, rng) for name in names}
+
+    start  = time.perf_counter()
+    graph  = BuildingGraph({name: FloorGraph.from_nodemap(name, data[name]) for name in names},
+                           names)
+    build  = time.perf_counter() - start
+    total  = sum(len(f) for f in graph.floors.values())
+    print(f"🏢 {FLOORS} floors, {total} nodes, built in {build * 1000:.1f} ms")
+
+    pairs = []
+    for _ in range(QUERIES):
+        src, dst = rng.choice(names), rng.choice(names)
+        pairs.append(((src, rng.choice(graph.floors[src].ids)),
+                      (dst, rng.choice(graph.floors[dst].ids))))
+
+    for label, astar in (("Dijkstra", False), ("A*", True)):
+        expanded = 0
+        start    = time.perf_counter()
+        costs    = []
+        for src, dst in pairs:
+            _, _, cost = graph.route(src, dst, astar=astar)
+            costs.append(cost)
+            expanded += graph.expanded
+        elapsed = (time.perf_counter() - start) / QUERIES
+        print(f"  {label:<9} {elapsed * 1000:8.2f} ms/query  {expanded / QUERIES:9.0f} nodes expanded")
+        if astar:
+            assert all(math.isclose(a, b) for a, b in zip(costs, reference)), "A* disagrees with Dijkstra"
+        else:
+            reference = costs
+
+if __name__ == "__main__":
+    main()
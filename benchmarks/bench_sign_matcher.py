@@ -0,0 +1,85 @@
+import os
+import sys
+import random
+import string
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sign_matcher import SignMatcher
+
+# ── Config ─────────────────────────────────────────────────────────────────
+SIZES   = [13, 100, 1000, 5000, 20000]
+REPEATS = 200
+SEED    = 7
+
+# OCR strings as EasyOCR returns them in the corridor, plus some misses
+OCR_TEXTS = [
+    "Room 045 Active Learning",
+    "ROOM 040",
+    "Stairs",
+    "Exit",
+    "fire extinguisher",
+    "Main Hall",
+    "no entry authorised personnel only",
+    "140",
+]
+
+BASE_SIGN_MAP = {
+    "045":             "room_045",
+    "040":             "room_040",
+    "025":             "room_025",
+    "010":             "room_010",
+    "active learning": "room_045",
+    "stair":           "stairs",
+    "stairs":          "stairs",
+    "125":             "125",
+    "130":             "130",
+    "135":             "135",
+    "140":             "140",
+    "main hall":       "main_hall",
+    "exit":            "exit",
+}
+
+# ── Sign map growth ────────────────────────────────────────────────────────
+def grow_sign_map(size, rng):
+    # Learned aliases are whole OCR lines, appended after the defaults
+    sign_map = dict(BASE_SIGN_MAP)
+    alphabet = string.ascii_lowercase + string.digits + " "
+    while len(sign_map) < size:
+        key = "".join(rng.choice(alphabet) for _ in range(rng.randint(6, 24)))
+        sign_map[key.strip() or "x"] = rng.choice(list(BASE_SIGN_MAP.values()))
+    return sign_map
+
+# ── Matchers ───────────────────────────────────────────────────────────────
+def naive_match(sign_map, text):
+    for key, node_id in sign_map.items():
+        if key in text:
+            return node_id
+    return None
+
+def time_per_text(fn, texts):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / (REPEATS * len(texts)) * 1e6
+
+# ── Main ───────────────────────────────────────────────────────────────────
+def main():
+    rng   = random.Random(SEED)
+    texts = [t.lower().strip() for t in OCR_TEXTS]
+
+    print(f"{'keys':>7} {'scan µs/text':>14} {'automaton µs/text':>18} {'speedup':>8}")
+    for size in SIZES:
+        sign_map = grow_sign_map(size, rng)
+        matcher  = SignMatcher(sign_map)
+
+        for text in texts:
+            assert matcher.match(text) == naive_match(sign_map, text), text
+
+        scan      = time_per_text(lambda t: naive_match(sign_map, t), texts)
+        automaton = time_per_text(matcher.match, texts)
+        print(f"{size:>7} {scan:>14.2f} {automaton:>18.2f} {scan / automaton:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from spatial_index import FloorIndex
+from bench_pipeline import git_commit
+
+# ── Config ─────────────────────────────────────────────────────────────────
+NODES    = 100_000
+QUERIES  = 10_000
+EXTENT   = 20_000     # floorplan pixels per side
+ROOM     = (5, 60)    # annotation box side range in pixels
+RADIUS   = 100
+SCAN_N   = 200        # queries timed against the linear scan baseline
+SEED     = 19
+
+# ── Synthetic floor ────────────────────────────────────────────────────────
+# Random room boxes plus a handful of hall-sized ones that span many cells.
+def synthetic_floor(count, rng):
+    centres = rng.uniform(0, EXTENT, (count, 2))
+    sides   = rng.uniform(*ROOM, (count, 2))
+    bbox    = np.concatenate([centres - sides / 2, centres + sides / 2], axis=1)
+    bbox[:8, :2] -= EXTENT / 20
+    bbox[:8, 2:] += EXTENT / 20
+    return centres, bbox
+
+def linear_scan(bbox, coords, points):
+    # What every caller had before: one pass over all nodes per point
+    out = []
+    for x, y in points:
+        inside = (x >= bbox[:, 0]) & (x <= bbox[:, 2]) & (y >= bbox[:, 1]) & (y <= bbox[:, 3])
+        out.append(np.flatnonzero(inside))
+        np.argmin(np.hypot(coords[:, 0] - x, coords[:, 1] - y))
+    return out
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out   = fn(*args)
+    return out, time.perf_counter() - start
+
+# ── Main ───────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Spatial index build / query benchmark")
+    parser.add_argument("--nodes",   type=int, default=NODES)
+    parser.add_argument("--queries", type=int, default=QUERIES)
+    args   = parser.parse_args()
+    rng    = np.random.default_rng(SEED)
+
+    coords, bbox = synthetic_floor(args.nodes, rng)
+    points       = rng.uniform(0, EXTENT, (args.queries, 2))
+    index, build = timed(FloorIndex, coords, bbox)
+
+    rows = [("build", build, 1)]
+    for name, fn, extra in [("containing", index.containing, ()),
+                            ("nearest",    index.nearest,    ()),
+                            ("nearest_k8", index.nearest,    (8,)),
+                            ("within",     index.within,     (RADIUS,)),
+                            ("locate",     index.locate,     ())]:
+        _, took = timed(fn, points, *extra)
+        rows.append((name, took, len(points)))
+    _, took = timed(linear_scan, bbox, coords, points[:SCAN_N])
+    rows.append(("linear_scan", took, SCAN_N))
+
+    commit = git_commit()
+    for name, took, count in rows:
+        print(json.dumps({"bench": "spatial_index", "op": name, "nodes": args.nodes,
+                          "queries": count, "total_ms": round(took * 1000, 2),
+                          "us_per_query": round(took / count * 1e6, 3), "commit": commit}))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import contextlib
+import numpy as np
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+import stubs
+from bench_pipeline import write_nodemaps, corridor_frame
+
+# ── Config ─────────────────────────────────────────────────────────────────
+THINK_S     = 2.0     # time the user spends at the destination prompt
+OCR_LOAD_S  = 3.0     # stand-in model load time (easyocr on CPU is ~2-5 s)
+DESTINATION = "130"
+MODES       = ["eager", "lazy"]
+
+# ── One startup, in a fresh interpreter ────────────────────────────────────
+#   eager  load everything before the prompt (what importing used to do)
+#   lazy   main()'s order: warm in the background, prompt, then wait for
+#          whatever is still loading
+def child(mode, workdir, think, ocr_load, real_ocr):
+    launched = time.perf_counter()
+    stubs.install(ocr=not real_ocr, ocr_load=ocr_load)
+    os.chdir(workdir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import full_navigation as nav_pipeline
+        imported   = time.perf_counter()
+        components = (nav_pipeline.REGISTRY, nav_pipeline.SIGN_MATCHER, nav_pipeline.SIGN_FUZZY,
+                      nav_pipeline.memory, nav_pipeline.PREFETCHER, nav_pipeline.reader)
+        for component in components:
+            component.get() if mode == "eager" else component.warm()
+        prompt = time.perf_counter()
+
+        time.sleep(think)
+        chosen = time.perf_counter()
+        route, floor_type, floors = nav_pipeline.build_route(DESTINATION)
+        nav     = nav_pipeline.Navigator(route, floor_type, floors)
+        frame   = corridor_frame(np.random.default_rng(0))
+        results = nav_pipeline.reader.get().readtext(frame)
+        nav_pipeline.handle_ocr_results(results, nav)
+        nav_pipeline.draw_hud(frame, results, nav, None)
+        first = time.perf_counter()
+        for component in components:
+            component.close()
+
+    print(json.dumps({"bench": "startup", "mode": mode, "think_s": think,
+                      "ocr_load_s": None if real_ocr else ocr_load,
+                      "import_s":      round(imported - launched, 4),
+                      "to_prompt_s":   round(prompt - launched, 4),
+                      "first_frame_s": round(first - chosen, 4),
+                      "total_s":       round(first - launched, 4)}))
+
+# ── Main ───────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="NaviGrid time-to-first-frame benchmark")
+    parser.add_argument("--think",    type=float, default=THINK_S)
+    parser.add_argument("--ocr-load", type=float, default=OCR_LOAD_S)
+    parser.add_argument("--real-ocr", action="store_true", help="load the installed easyocr")
+    parser.add_argument("--child",    choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir",  help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.workdir, args.think, args.ocr_load, args.real_ocr)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        write_nodemaps(workdir)
+        for mode in MODES:
+            cmd = [sys.executable, os.path.abspath(__file__), "--child", mode,
+                   "--workdir", workdir, "--think", str(args.think),
+                   "--ocr-load", str(args.ocr_load)]
+            if args.real_ocr:
+                cmd.append("--real-ocr")
+            out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+            print(out.strip().splitlines()[-1])
+
+if __name__ == "__main__":
+    main()
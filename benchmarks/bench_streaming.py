@@ -0,0 +1,112 @@
+import os
+import io
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import contextlib
+import subprocess
+import numpy as np
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH))
+import stubs
+from bench_pipeline import git_commit
+
+# ── Config ─────────────────────────────────────────────────────────────────
+LEGS        = 10
+FIRST_TOKEN = 0.4         # fake server s to first token
+TOKEN_DELAY = 0.05        # ... and per later token
+FRAME       = 1 / 30      # display loop period while waiting for the text
+
+# ── Fake Ollama ────────────────────────────────────────────────────────────
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def spawn_fake_ollama(first_token, token_delay):
+    port = free_port()
+    proc = subprocess.Popen([sys.executable, os.path.join(BENCH, "fake_ollama.py"),
+                             "--port", str(port), "--first-token", str(first_token),
+                             "--token-delay", str(token_delay)],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        with contextlib.suppress(OSError), socket.create_connection(("127.0.0.1", port), 0.2):
+            return proc, f"http://127.0.0.1:{port}"
+        time.sleep(0.1)
+    proc.kill()
+    raise TimeoutError("fake Ollama did not come up")
+
+# ── One leg ────────────────────────────────────────────────────────────────
+# A fresh two-leg route whose instruction is not cached: the user reaches
+# the middle node, then the display loop runs until the whole instruction
+# is on screen. Returns (longest update() stall, s until the model's first
+# words are shown, s until all of them are).
+def run_leg(nav_pipeline, leg):
+    route = [f"leg{leg}_a", f"leg{leg}_b", f"leg{leg}_c"]
+    nav   = nav_pipeline.Navigator(route, "lower")
+    key   = nav_pipeline.PREFETCHER.get().cache.key(
+        nav_pipeline.BUILDING_ID, route[1], route[2], nav.floors[1])
+
+    stall = 0.0
+    start = time.perf_counter()
+    while nav.current_step == 0:
+        t0    = time.perf_counter()
+        nav.update(route[1])
+        stall = max(stall, time.perf_counter() - t0)
+    placeholder = f"Continue from {route[1]} to {route[2]}."
+
+    first = None
+    while True:
+        now = time.perf_counter() - start
+        if first is None and nav.last_instruction != placeholder:
+            first = now
+        if key in nav_pipeline.PREFETCHER.get().cache:
+            return stall, first if first is not None else now, now
+        time.sleep(FRAME)
+
+# ── Main ───────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Blocking vs streaming LLaMA instructions")
+    parser.add_argument("--legs",        type=int,   default=LEGS)
+    parser.add_argument("--first-token", type=float, default=FIRST_TOKEN)
+    parser.add_argument("--token-delay", type=float, default=TOKEN_DELAY)
+    args   = parser.parse_args()
+
+    proc, url = spawn_fake_ollama(args.first_token, args.token_delay)
+    stubs.install(llm_host=url)
+    cwd       = os.getcwd()
+    results   = {}
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            os.chdir(workdir)
+            with contextlib.redirect_stdout(io.StringIO()):
+                import full_navigation as nav_pipeline
+                nav_pipeline.USE_LLAMA = True
+                for mode, stream in (("blocking", False), ("streaming", True)):
+                    nav_pipeline.STREAM_LLAMA = stream
+                    results[mode] = [run_leg(nav_pipeline, f"{mode}{i}") for i in range(args.legs)]
+                # Closed here so the fake history and sign map stay in workdir
+                for component in (nav_pipeline.PREFETCHER, nav_pipeline.SIGN_MAP,
+                                  nav_pipeline.memory):
+                    component.close()
+    finally:
+        os.chdir(cwd)
+        proc.kill()
+
+    commit = git_commit()
+    for mode, legs in results.items():
+        stall, first, total = (np.array(col) * 1000 for col in zip(*legs))
+        print(json.dumps({"bench": "streaming", "mode": mode, "legs": len(legs),
+                          "first_token_s": args.first_token, "token_delay_s": args.token_delay,
+                          "update_stall_ms_max": round(float(stall.max()), 1),
+                          "first_words_ms_mean": round(float(first.mean()), 1),
+                          "complete_ms_mean": round(float(total.mean()), 1),
+                          "commit": commit}))
+
+if __name__ == "__main__":
+    main()
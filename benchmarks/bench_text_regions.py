@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from text_regions import propose_text_regions, RegionReader
+
+# ── Config ─────────────────────────────────────────────────────────────────
+FRAME_SIZE = (720, 1280)
+FRAMES     = 30
+SEED       = 5
+SIGNS      = ["ROOM 045", "EXIT", "STAIRS", "ROOM 040", "MAIN HALL", "130"]
+
+# ── Synthetic corridor frames ──────────────────────────────────────────────
+def corridor_frame(rng):
+    h, w  = FRAME_SIZE
+    noise = rng.integers(90, 200, (h, w, 3), dtype=np.uint8)
+    frame = cv2.GaussianBlur(noise, (31, 31), 0)
+    # Door frames and skirting: strong edges that are not text
+    for _ in range(4):
+        x = int(rng.integers(0, w - 60))
+        cv2.rectangle(frame, (x, 150), (x + 60, h - 40), (60, 50, 40), 4)
+    cv2.line(frame, (0, h - 60), (w, h - 30), (40, 40, 40), 6)
+    # One or two signs
+    for text in rng.choice(SIGNS, size=int(rng.integers(1, 3)), replace=False):
+        x, y = int(rng.integers(20, w - 320)), int(rng.integers(60, h - 200))
+        cv2.rectangle(frame, (x, y), (x + 300, y + 80), (245, 245, 245), -1)
+        cv2.putText(frame, str(text), (x + 15, y + 55),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.3, (20, 20, 20), 3)
+    return frame
+
+def per_frame_ms(fn, frames):
+    start = time.perf_counter()
+    for frame in frames:
+        fn(frame)
+    return (time.perf_counter() - start) / len(frames) * 1000
+
+# ── Main ───────────────────────────────────────────────────────────────────
+def main():
+    rng    = np.random.default_rng(SEED)
+    frames = [corridor_frame(rng) for _ in range(FRAMES)]
+
+    proposal_ms = per_frame_ms(propose_text_regions, frames)
+    coverage    = []
+    for frame in frames:
+        boxes = propose_text_regions(frame)
+        area  = sum((x2 - x1) * (y2 - y1) for x1, x2, y1, y2 in boxes)
+        coverage.append(area / (frame.shape[0] * frame.shape[1]))
+    print(f"🔎 Proposals: {proposal_ms:.2f} ms/frame, "
+          f"{np.mean(coverage) * 100:.1f}% of the frame sent to recognition")
+
+    try:
+        import easyocr
+    except ImportError:
+        print("ℹ️  easyocr not installed, skipping the readtext comparison")
+        return
+
+    reader  = easyocr.Reader(["en"], gpu=False, verbose=False)
+    regions = RegionReader(reader)
+    full_ms = per_frame_ms(reader.readtext, frames)
+    crop_ms = per_frame_ms(regions.readtext, frames)
+    print(f"🔤 readtext full frame: {full_ms:.1f} ms/frame")
+    print(f"🔤 region crops only:   {crop_ms:.1f} ms/frame ({full_ms / crop_ms:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import os
+import io
+import sys
+import json
+import time
+import random
+import tempfile
+import argparse
+import contextlib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import stubs
+from routing import FloorGraph, BuildingGraph
+from bench_routing import synthetic_floor
+from bench_pipeline import git_commit
+
+# ── Config ─────────────────────────────────────────────────────────────────
+TRIALS      = 200
+FRAMES_AT   = 3        # OCR frames while the user passes each route node
+TAIL        = 10       # extra frames standing at the destination
+P_SEE       = 0.45     # the node's own sign is read
+P_NEIGHBOUR = 0.15     # a neighbouring room's sign is read instead
+P_FALSE     = 0.05     # some other sign in the building is "read"
+SEED        = 23
+
+# ── The old rule ───────────────────────────────────────────────────────────
+# Advance only when a detection is exactly the next route node.
+class ExactNavigator:
+    def __init__(self, route):
+        self.route        = route
+        self.current_step = 0
+        self.completed    = False
+
+    def update(self, detected_node, conf=1.0):
+        if not self.completed and detected_node == self.route[self.current_step + 1]:
+            self.current_step += 1
+            self.completed     = self.current_step == len(self.route) - 1
+
+# ── Simulated walk ─────────────────────────────────────────────────────────
+# The user walks the route at a steady pace; each OCR frame reads their own
+# sign, a neighbour's, a random one, or nothing.
+def detections(graph, route, floors, rng):
+    ids = [i for g in graph.floors.values() for i in g.ids]
+    for k, node_id in enumerate(route):
+        node = graph.node(floors[k], node_id)
+        nbrs = [graph.node_id(n) for n, _ in graph.neighbors(node)]
+        for _ in range(FRAMES_AT + (TAIL if k == len(route) - 1 else 0)):
+            r, conf = rng.random(), rng.uniform(0.5, 1.0)
+            if r < P_SEE:
+                yield k, node_id, conf
+            elif r < P_SEE + P_NEIGHBOUR and nbrs:
+                yield k, rng.choice(nbrs), conf
+            elif r < P_SEE + P_NEIGHBOUR + P_FALSE:
+                yield k, rng.choice(ids), conf
+            else:
+                yield k, None, 0.0
+
+def walk(nav, frames):
+    # (arrived, frames spent ahead of the user, route steps behind summed
+    # over frames, frames from reaching the destination to being told so,
+    # update times, re-routes; the simulated user never leaves the route)
+    arrival           = next(i for i, f in enumerate(frames) if f[0] == len(nav.route) - 1)
+    ahead, behind, us = 0, 0, []
+    for frame, (k, node_id, conf) in enumerate(frames):
+        if node_id is not None:
+            start = time.perf_counter()
+            nav.update(node_id, conf)
+            us.append((time.perf_counter() - start) * 1e6)
+        ahead  += nav.current_step > k
+        behind += max(k - nav.current_step, 0)
+        if nav.completed:
+            return True, ahead, behind / (frame + 1), frame - arrival, us, \
+                   getattr(nav, "revision", 0)
+    return False, ahead, behind / len(frames), None, us, getattr(nav, "revision", 0)
+
+# ── Main ───────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Position tracker vs exact next-node rule")
+    parser.add_argument("--trials", type=int, default=TRIALS)
+    args   = parser.parse_args()
+    rng    = random.Random(SEED)
+
+    stubs.install()
+    names  = ["floor0", "floor1"]
+    graph  = BuildingGraph({n: FloorGraph.from_nodemap(n, synthetic_floor(n, rng)) for n in names},
+                           names)
+    ids    = {n: list(g.ids) for n, g in graph.floors.items()}
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                import full_navigation as nav_pipeline
+                nav_pipeline.USE_LLAMA = False
+                results = {"exact": [], "tracker": []}
+                for _ in range(args.trials):
+                    src = ("floor0", rng.choice(ids["floor0"]))
+                    floor = rng.choice(names)
+                    dst   = (floor, rng.choice(ids[floor]))
+                    route, floors, _ = graph.route(src, dst)
+                    if route is None or len(route) < 3:
+                        continue
+                    frames = list(detections(graph, route, floors, rng))
+                    results["exact"].append(walk(ExactNavigator(route), frames))
+                    results["tracker"].append(walk(nav_pipeline.Navigator(
+                        route, "multi", floors, graph), frames))
+        finally:
+            os.chdir(cwd)
+
+    commit = git_commit()
+    for name, runs in results.items():
+        lag = [run[3] for run in runs if run[0]]
+        us  = [u for run in runs for u in run[4]]
+        print(json.dumps({"bench": "tracker", "navigator": name, "routes": len(runs),
+                          "arrived": round(sum(r[0] for r in runs) / len(runs), 3),
+                          "ahead_frames": sum(r[1] for r in runs),
+                          "steps_behind": round(float(np.mean([r[2] for r in runs])), 2),
+                          "arrival_lag_frames": round(float(np.mean(lag)), 2) if lag else None,
+                          "reroutes": sum(r[5] for r in runs),
+                          "update_us_mean": round(float(np.mean(us)), 1),
+                          "update_us_p99": round(float(np.percentile(us, 99)), 1),
+                          "commit": commit}))
+
+if __name__ == "__main__":
+    main()
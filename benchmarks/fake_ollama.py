@@ -0,0 +1,68 @@
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import argparse
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from stubs import fake_reply
+
+# ── Config ─────────────────────────────────────────────────────────────────
+PORT        = 11435       # next to the real server's 11434
+FIRST_TOKEN = 0.4         # s of "prompt processing" before the first token
+TOKEN_DELAY = 0.05        # s between tokens after that
+
+# ── Fake Ollama ────────────────────────────────────────────────────────────
+# Speaks enough of Ollama's POST /api/chat for the ollama client (point
+# OLLAMA_HOST at it) or stubs.install(llm_host=...): a streamed reply is one
+# NDJSON line per word, then a final line with done and the durations. The
+# reply names the prompt's locations, like stubs.fake_chat.
+def chunk(model, content, done=False, **extra):
+    return {"model": model, "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "message": {"role": "assistant", "content": content}, "done": done, **extra}
+
+def create_app(first_token=FIRST_TOKEN, token_delay=TOKEN_DELAY):
+    async def chat(request):
+        body   = await request.json()
+        model  = body.get("model", "llama3.2")
+        words  = re.findall(r"\S+\s*", fake_reply(body["messages"]))
+        start  = time.perf_counter_ns()
+        if not body.get("stream", True):
+            await asyncio.sleep(first_token + token_delay * (len(words) - 1))
+            return web.json_response(chunk(model, "".join(words), True,
+                                           total_duration=time.perf_counter_ns() - start,
+                                           eval_count=len(words)))
+
+        await asyncio.sleep(first_token)
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        for i, word in enumerate(words):
+            if i:
+                await asyncio.sleep(token_delay)
+            await response.write((json.dumps(chunk(model, word)) + "\n").encode())
+        await response.write((json.dumps(chunk(model, "", True,
+                                               total_duration=time.perf_counter_ns() - start,
+                                               eval_count=len(words))) + "\n").encode())
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_post("/api/chat", chat)
+    return app
+
+# ── Main ───────────────────────────────────────────────────────────────────
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake streaming Ollama /api/chat server")
+    parser.add_argument("--host",        default="127.0.0.1")
+    parser.add_argument("--port",        type=int,   default=PORT)
+    parser.add_argument("--first-token", type=float, default=FIRST_TOKEN, help="s to first token")
+    parser.add_argument("--token-delay", type=float, default=TOKEN_DELAY, help="s per later token")
+    args   = parser.parse_args(argv)
+    web.run_app(create_app(args.first_token, args.token_delay), host=args.host, port=args.port,
+                print=lambda *_: print(f"🦙 Fake Ollama on http://{args.host}:{args.port}"))
+
+if __name__ == "__main__":
+    main()
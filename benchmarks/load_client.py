@@ -0,0 +1,171 @@
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+import cv2
+import numpy as np
+import aiohttp
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+from replay import iter_frames
+from bench_pipeline import write_nodemaps, corridor_frame, ocr_script, CORRIDORS
+
+# ── Config ─────────────────────────────────────────────────────────────────
+SESSIONS    = 8
+FPS         = 10.0
+SECONDS     = 10.0
+DESTINATION = "130"
+FRAMES      = 30          # synthetic frames when no --source is given
+OCR_LATENCY = 0.03        # s per model call of the spawned stub server
+OCR_ITEM    = 0.004       # s per crop on top of that
+
+# ── Local stub server ──────────────────────────────────────────────────────
+# Runs server.py in a throwaway directory with the deterministic OCR/LLM
+# stand-ins, so the load test needs neither a GPU nor a model download.
+SERVER_BOOT = """
+import sys
+sys.path[:0] = [{repo!r}, {bench!r}]
+import stubs
+stubs.install(ocr_script={script!r}, ocr_latency={latency!r}, ocr_item_latency={item!r})
+import server
+server.main({argv!r})
+"""
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def spawn_server(workdir, latency, item_latency, batch, wait):
+    port   = free_port()
+    route  = CORRIDORS["lower"][:3] + CORRIDORS["floor1"][:3]
+    argv   = ["--port", str(port), "--host", "127.0.0.1",
+              "--ocr-batch", str(batch), "--ocr-wait", str(wait)]
+    code   = SERVER_BOOT.format(repo=REPO, bench=os.path.dirname(os.path.abspath(__file__)),
+                                script=ocr_script(route, gap=3), latency=latency,
+                                item=item_latency, argv=argv)
+    proc   = subprocess.Popen([sys.executable, "-c", code], cwd=workdir,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return proc, f"http://127.0.0.1:{port}"
+
+async def wait_ready(http, url, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with http.get(f"{url}/destinations") as resp:
+                if resp.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.2)
+    raise TimeoutError(f"server at {url} did not come up")
+
+# ── One simulated phone ────────────────────────────────────────────────────
+# Streams frames over the session websocket at `fps` and matches every state
+# pushed back to the frame it answers, giving frame → result latency.
+async def run_session(http, url, destination, jpegs, fps, seconds):
+    async with http.post(f"{url}/sessions", json={"destination": destination}) as resp:
+        session = (await resp.json())["session"]
+
+    sent, latencies, state = {}, [], {}
+    async with http.ws_connect(f"{url}/sessions/{session}/ws") as ws:
+        async def receive():
+            nonlocal state
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    break
+                state = json.loads(msg.data)
+                if state["seq"] in sent:
+                    latencies.append(time.perf_counter() - sent.pop(state["seq"]))
+
+        receiver = asyncio.create_task(receive())
+        start    = time.perf_counter()
+        seq      = 0
+        while time.perf_counter() - start < seconds:
+            seq      += 1
+            sent[seq] = time.perf_counter()
+            await ws.send_bytes(jpegs[seq % len(jpegs)])
+            await asyncio.sleep(max(0.0, start + seq / fps - time.perf_counter()))
+        await asyncio.sleep(0.5)      # let the last results arrive
+        await ws.close()
+        receiver.cancel()
+
+    async with http.delete(f"{url}/sessions/{session}"):
+        pass
+    return {"sent": seq, "processed": state.get("processed", 0),
+            "dropped": state.get("dropped", 0), "step": state.get("step", 0),
+            "latencies": latencies}
+
+# ── Main ───────────────────────────────────────────────────────────────────
+async def load_test(args, jpegs):
+    async with aiohttp.ClientSession() as http:
+        await wait_ready(http, args.url)
+        start   = time.perf_counter()
+        results = await asyncio.gather(*[
+            run_session(http, args.url, args.destination, jpegs, args.fps, args.seconds)
+            for _ in range(args.sessions)])
+        elapsed = time.perf_counter() - start
+
+    ms = np.array([l for r in results for l in r["latencies"]] or [np.nan]) * 1000
+    sent      = sum(r["sent"] for r in results)
+    processed = sum(r["processed"] for r in results)
+    print(json.dumps({
+        "bench":          "server_load",
+        "sessions":       args.sessions,
+        "url":            args.url,
+        "fps_offered":    args.fps,
+        "seconds":        round(elapsed, 2),
+        "frames_sent":    sent,
+        "processed":      processed,
+        "dropped":        sum(r["dropped"] for r in results),
+        "processed_fps":  round(processed / elapsed, 2),
+        "result_p50_ms":  round(float(np.nanpercentile(ms, 50)), 2),
+        "result_p99_ms":  round(float(np.nanpercentile(ms, 99)), 2),
+        "mean_step":      round(float(np.mean([r["step"] for r in results])), 2),
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic multi-phone load client")
+    parser.add_argument("--url",      default=None, help="server URL; default spawns a stub server")
+    parser.add_argument("--source",   default=None, help="recorded session, image folder or video")
+    parser.add_argument("--sessions", type=int,   default=SESSIONS)
+    parser.add_argument("--fps",      type=float, default=FPS)
+    parser.add_argument("--seconds",  type=float, default=SECONDS)
+    parser.add_argument("--destination", default=DESTINATION)
+    parser.add_argument("--ocr-latency", type=float, default=OCR_LATENCY,
+                        help="stub seconds per model call for the spawned server")
+    parser.add_argument("--ocr-item",    type=float, default=OCR_ITEM,
+                        help="stub seconds per crop for the spawned server")
+    parser.add_argument("--ocr-batch",   type=int,   default=8, help="spawned server batch size")
+    parser.add_argument("--ocr-wait",    type=float, default=0.01, help="spawned server max wait")
+    args = parser.parse_args()
+
+    if args.source:
+        frames = [f for _, _, f in iter_frames(args.source) if f is not None]
+    else:
+        rng    = np.random.default_rng(3)
+        frames = [corridor_frame(rng) for _ in range(FRAMES)]
+    jpegs = [cv2.imencode(".jpg", f)[1].tobytes() for f in frames]
+
+    if args.url:
+        asyncio.run(load_test(args, jpegs))
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        write_nodemaps(workdir)
+        proc, args.url = spawn_server(workdir, args.ocr_latency, args.ocr_item,
+                                      args.ocr_batch, args.ocr_wait)
+        try:
+            asyncio.run(load_test(args, jpegs))
+        finally:
+            proc.terminate()
+            proc.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import re
+import sys
+import json
+import time
+import types
+import urllib.request
+
+# ── Deterministic OCR ──────────────────────────────────────────────────────
+# Stands in for easyocr.Reader. Each readtext call, and each box of a
+# recognize call, returns the next entry of `script` (a sign text, or None
+# for "nothing read") as one detection. A model call sleeps `latency`
+# seconds plus `item_latency` per image or box, so batching pays off the way
+# it does on a real model.
+class FakeReader:
+    def __init__(self, script=None, latency=0.0, confidence=0.9, item_latency=0.0):
+        self.script       = list(script or [])
+        self.latency      = latency
+        self.item_latency = item_latency
+        self.confidence   = confidence
+        self.calls        = 0
+
+    def _next(self):
+        text        = self.script[self.calls % len(self.script)] if self.script else None
+        self.calls += 1
+        return text
+
+    def _sleep(self, items):
+        if self.latency or self.item_latency:
+            time.sleep(self.latency + self.item_latency * items)
+
+    def _read(self, frame):
+        text = self._next()
+        if text is None:
+            return []
+        h, w = frame.shape[:2]
+        x1, x2, y1, y2 = w // 4, 3 * w // 4, h // 3, h // 3 + 60
+        return [([[x1, y1], [x2, y1], [x2, y2], [x1, y2]], text, self.confidence)]
+
+    def readtext(self, frame, **kwargs):
+        self._sleep(1)
+        return self._read(frame)
+
+    def readtext_batched(self, images, **kwargs):
+        self._sleep(len(images))
+        return [self._read(image) for image in images]
+
+    def recognize(self, frame, horizontal_list=None, free_list=None, **kwargs):
+        boxes = horizontal_list or [[0, frame.shape[1], 0, frame.shape[0]]]
+        self._sleep(len(boxes))
+        results = []
+        for x1, x2, y1, y2 in boxes:
+            text = self._next()
+            if text is not None:
+                results.append(([[x1, y1], [x2, y1], [x2, y2], [x1, y2]], text, self.confidence))
+        return results
+
+# ── Deterministic LLM ──────────────────────────────────────────────────────
+# Stands in for ollama.chat: answers from the locations named in the prompt.
+# With stream=True the answer comes back as one chunk per word, like the
+# real client's iterator of partial messages.
+def fake_reply(messages):
+    prompt  = messages[-1]["content"]
+    current = re.search(r"Current location: (.*)", prompt)
+    target  = re.search(r"Next destination: (.*)", prompt)
+    return (f"From {current.group(1) if current else 'here'}, keep walking "
+            f"towards {target.group(1) if target else 'the next sign'}.")
+
+def fake_chat(model, messages, latency=0.0, stream=False, **kwargs):
+    if latency:
+        time.sleep(latency)
+    content = fake_reply(messages)
+    if stream:
+        return iter([{"model": model, "message": {"role": "assistant", "content": word}}
+                     for word in re.findall(r"\S+\s*", content)])
+    return {"model": model, "message": {"role": "assistant", "content": content}}
+
+# Minimal ollama.chat over HTTP for a server speaking Ollama's /api/chat,
+# such as fake_ollama.py, when the ollama package is not installed.
+def http_chat(host, model, messages, stream=False, **kwargs):
+    body    = json.dumps({"model": model, "messages": messages, "stream": stream}).encode()
+    request = urllib.request.Request(f"{host}/api/chat", data=body,
+                                     headers={"Content-Type": "application/json"})
+    if not stream:
+        with urllib.request.urlopen(request) as response:
+            return json.load(response)
+
+    def chunks():
+        with urllib.request.urlopen(request) as response:
+            for line in response:
+                if line.strip():
+                    yield json.loads(line)
+    return chunks()
+
+# ── Module injection ───────────────────────────────────────────────────────
+# Must run before full_navigation (or a floor script) is imported. Pass
+# ocr=False / llm=False to keep the real easyocr / ollama.
+# `ocr_load` seconds are spent constructing each Reader, like loading weights.
+# `llm_host` sends chat calls to that server instead of answering in-process.
+def install(ocr=True, llm=True, ocr_script=None, ocr_latency=0.0, llm_latency=0.0,
+            ocr_load=0.0, ocr_item_latency=0.0, llm_host=None):
+    if ocr:
+        def reader(languages, gpu=False, **kwargs):
+            if ocr_load:
+                time.sleep(ocr_load)
+            return FakeReader(ocr_script, ocr_latency, item_latency=ocr_item_latency)
+        easyocr        = types.ModuleType("easyocr")
+        easyocr.Reader = reader
+        sys.modules["easyocr"] = easyocr
+    if llm:
+        ollama      = types.ModuleType("ollama")
+        ollama.chat = lambda model, messages, **kwargs: fake_chat(model, messages,
+                                                                  llm_latency, **kwargs)
+        if llm_host:
+            ollama.chat = lambda model, messages, **kwargs: http_chat(llm_host, model,
+                                                                      messages, **kwargs)
+        sys.modules["ollama"] = ollama
@@ -0,0 +1,226 @@
+import json
+import time
+import argparse
+import cv2
+import numpy as np
+from scipy.spatial import cKDTree
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import dijkstra, connected_components
+
+from nodemap_binary import compile_nodemap_file
+
+# ── Config ─────────────────────────────────────────────────────────────────
+WORK_SIZE      = 1024     # longest side the plan is processed at
+BLOCK          = 31       # adaptive-threshold window (working pixels, odd)
+INK_C          = 12       # how much darker than its surroundings ink must be
+WALL_WIDTH     = 3        # px; thinner ink is text, grid and dimension lines
+WALL_GROW      = 1        # px walls are grown by, closing hairline gaps
+MIN_CLEARANCE  = 3.0      # px from the nearest wall for space to be walkable
+MIN_AREA       = 400      # px; smaller walkable islands are dropped
+SOURCE_BLOCK   = 64       # Dijkstra sources per batch (bounds memory)
+
+_OPEN_KERNEL = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+
+# ── Walkable space ─────────────────────────────────────────────────────────
+# Floorplans are dark ink on light paper: ink is found with a local
+# threshold, so glare and shadows on a photographed plan do not matter, and
+# an opening keeps only strokes at least WALL_WIDTH thick (walls, not text or
+# dimension lines). Everything at least MIN_CLEARANCE from a wall is walkable.
+# The plan is first downscaled so the longest side is WORK_SIZE; `scale`
+# maps original pixels to working pixels.
+def walkable_mask(image, work_size=WORK_SIZE):
+    gray  = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    scale = min(1.0, work_size / max(gray.shape))
+    if scale < 1.0:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    ink = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
+                                cv2.THRESH_BINARY_INV, BLOCK, INK_C)
+    if WALL_WIDTH > 1:
+        ink = cv2.morphologyEx(ink, cv2.MORPH_OPEN, np.ones((WALL_WIDTH, WALL_WIDTH), np.uint8))
+    if WALL_GROW:
+        ink = cv2.dilate(ink, np.ones((2 * WALL_GROW + 1,) * 2, np.uint8))
+    clearance = cv2.distanceTransform((ink == 0).astype(np.uint8), cv2.DIST_L2, 5)
+    walk      = (clearance >= MIN_CLEARANCE).astype(np.uint8)
+    walk      = cv2.morphologyEx(walk, cv2.MORPH_OPEN, _OPEN_KERNEL)
+
+    count, labels, stats, _ = cv2.connectedComponentsWithStats(walk, connectivity=8)
+    keep = np.zeros(count, dtype=bool)
+    keep[1:] = stats[1:, cv2.CC_STAT_AREA] >= MIN_AREA
+    return keep[labels], scale
+
+# ── Skeleton ───────────────────────────────────────────────────────────────
+# cv2.ximgproc.thinning when opencv-contrib is installed, otherwise the same
+# Zhang–Suen thinning with each sub-iteration vectorized over the image.
+def skeletonize(mask):
+    mask = mask.astype(np.uint8)
+    if hasattr(cv2, "ximgproc"):
+        return cv2.ximgproc.thinning(mask * 255) > 0
+
+    img  = np.pad(mask, 1)
+    rows = np.flatnonzero(img.any(axis=1))
+    cols = np.flatnonzero(img.any(axis=0))
+    if not len(rows):
+        return mask > 0
+    y0, y1 = max(rows[0] - 1, 0), rows[-1] + 2
+    x0, x1 = max(cols[0] - 1, 0), cols[-1] + 2
+    P      = img[y0:y1, x0:x1]
+
+    while True:
+        changed = False
+        for step in (0, 1):
+            p2, p3, p4 = P[:-2, 1:-1], P[:-2, 2:],  P[1:-1, 2:]
+            p5, p6, p7 = P[2:, 2:],    P[2:, 1:-1], P[2:, :-2]
+            p8, p9     = P[1:-1, :-2], P[:-2, :-2]
+            ring = (p2, p3, p4, p5, p6, p7, p8, p9, p2)
+            B    = p2 + p3 + p4 + p5 + p6 + p7 + p8 + p9
+            A    = sum((ring[i] == 0) & (ring[i + 1] == 1) for i in range(8))
+            if step == 0:
+                c = ((p2 & p4 & p6) == 0) & ((p4 & p6 & p8) == 0)
+            else:
+                c = ((p2 & p4 & p8) == 0) & ((p2 & p6 & p8) == 0)
+            drop = (P[1:-1, 1:-1] == 1) & (B >= 2) & (B <= 6) & (A == 1) & c
+            if drop.any():
+                P[1:-1, 1:-1][drop] = 0
+                changed = True
+        if not changed:
+            break
+    return img[1:-1, 1:-1] > 0
+
+# ── Corridor graph ─────────────────────────────────────────────────────────
+# Skeleton pixels joined to their 8-neighbours; weights are in original
+# floorplan pixels, so geodesic distances compare with the stored `dist`.
+# Nodes snap onto the largest connected piece of skeleton (the corridor
+# network), never onto an island enclosed by furniture or text.
+class CorridorSkeleton:
+    def __init__(self, image, work_size=WORK_SIZE):
+        if isinstance(image, str):
+            path  = image
+            image = cv2.imread(path)
+            if image is None:
+                raise FileNotFoundError(f"Cannot read floorplan: {path}")
+        self.mask, self.scale = walkable_mask(image, work_size)
+        self.skeleton         = skeletonize(self.mask)
+
+        h, w       = self.skeleton.shape
+        ys, xs     = np.nonzero(self.skeleton)
+        index      = np.full((h, w), -1, dtype=np.int64)
+        index[ys, xs] = np.arange(len(ys))
+        self.points = np.stack([xs, ys], axis=1).astype(np.float64)
+        self.coords = (self.points + 0.5) / self.scale
+
+        src, dst, wt = [], [], []
+        for dy, dx in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            ny, nx = ys + dy, xs + dx
+            ok     = (ny < h) & (nx >= 0) & (nx < w)
+            j      = index[ny[ok], nx[ok]]
+            hit    = j >= 0
+            src.append(np.flatnonzero(ok)[hit])
+            dst.append(j[hit])
+            wt.append(np.full(hit.sum(), np.hypot(dy, dx) / self.scale))
+        src, dst, wt = np.concatenate(src), np.concatenate(dst), np.concatenate(wt)
+        n            = len(ys)
+        self.graph   = coo_matrix((np.concatenate([wt, wt]),
+                                   (np.concatenate([src, dst]), np.concatenate([dst, src]))),
+                                  shape=(n, n)).tocsr()
+
+        self.main = np.empty(0, dtype=np.int64)
+        self.tree = None
+        if n:
+            _, labels = connected_components(self.graph, directed=False)
+            self.main = np.flatnonzero(labels == np.bincount(labels).argmax())
+            self.tree = cKDTree(self.coords[self.main])
+
+    def __len__(self):
+        return len(self.coords)
+
+    def snap(self, coords):
+        # Nearest corridor pixel of each floorplan point: (pixel, distance)
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        if self.tree is None:
+            return np.full(len(coords), -1), np.full(len(coords), np.inf)
+        d, i = self.tree.query(coords)
+        return self.main[i], d
+
+    def geodesic(self, a, b):
+        # Walking distance between point pairs a[k] → b[k]: onto the
+        # skeleton, along it, and off again. inf where the skeleton does not
+        # connect them.
+        a, b   = (np.asarray(p, dtype=np.float64).reshape(-1, 2) for p in (a, b))
+        ia, da = self.snap(a)
+        ib, db = self.snap(b)
+        out    = np.full(len(a), np.inf)
+        if self.tree is None:
+            return out
+
+        sources = np.unique(ia)
+        rows    = np.searchsorted(sources, ia)
+        for start in range(0, len(sources), SOURCE_BLOCK):
+            block    = sources[start:start + SOURCE_BLOCK]
+            dist     = dijkstra(self.graph, indices=block)
+            sel      = np.flatnonzero((rows >= start) & (rows < start + len(block)))
+            out[sel] = dist[rows[sel] - start, ib[sel]]
+        return out + da + db
+
+# ── Geodesic edge weights ──────────────────────────────────────────────────
+# Replaces each edge's straight-line `dist` with the walking distance along
+# the corridor skeleton. Edges the skeleton cannot connect keep their
+# straight-line length; a walk is never shorter than the straight line.
+def geodesic_edges(image, nodes, edges, work_size=WORK_SIZE):
+    skel = image if isinstance(image, CorridorSkeleton) else CorridorSkeleton(image, work_size)
+    xy   = {n["id"]: (n["x"], n["y"]) for n in nodes}
+    a    = np.array([xy[e["from"]] for e in edges], dtype=np.float64).reshape(-1, 2)
+    b    = np.array([xy[e["to"]]   for e in edges], dtype=np.float64).reshape(-1, 2)
+    line = np.hypot(*(a - b).T)
+    walk = skel.geodesic(a, b)
+    ok   = np.isfinite(walk)
+    dist = np.round(np.where(ok, np.maximum(walk, line), line), 1).tolist()
+    return [dict(e, dist=d) for e, d in zip(edges, dist)], int((~ok).sum())
+
+def reweight_nodemap(image_path, nodemap_path, out_path=None, compile=True,
+                     work_size=WORK_SIZE):
+    with open(nodemap_path, "r") as f:
+        data = json.load(f)
+    start            = time.perf_counter()
+    skel             = CorridorSkeleton(image_path, work_size)
+    built            = time.perf_counter()
+    edges, unreached = geodesic_edges(skel, data["nodes"], data["edges"])
+    done             = time.perf_counter()
+
+    out_path = out_path or nodemap_path
+    with open(out_path, "w") as f:
+        json.dump({**data, "edges": edges}, f, indent=4)
+    if compile:
+        compile_nodemap_file(out_path)
+    return skel, edges, unreached, (built - start, done - built)
+
+def draw_debug(image_path, skel, output_path):
+    img  = cv2.imread(image_path)
+    h, w = img.shape[:2]
+    walk = cv2.resize(skel.mask.astype(np.uint8), (w, h), interpolation=cv2.INTER_NEAREST)
+    img[walk > 0] = (img[walk > 0] * 0.6 + np.array([113, 204, 46]) * 0.4).astype(np.uint8)
+    for x, y in skel.coords.astype(int):
+        cv2.circle(img, (x, y), 1, (60, 76, 231), -1)
+    cv2.imwrite(output_path, img)
+
+# ── Main ───────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="Corridor skeleton → geodesic edge weights")
+    parser.add_argument("image",       help="floorplan image")
+    parser.add_argument("nodemap",     help="nodemap JSON whose edges are re-weighted")
+    parser.add_argument("--out",       default=None, help="output nodemap (default: in place)")
+    parser.add_argument("--work-size", type=int, default=WORK_SIZE)
+    parser.add_argument("--debug",     default=None, help="write a walkable/skeleton overlay")
+    args = parser.parse_args()
+
+    skel, edges, unreached, (t_skel, t_geo) = reweight_nodemap(
+        args.image, args.nodemap, args.out, work_size=args.work_size)
+    print(f"🦴 Skeleton: {len(skel)} px at scale {skel.scale:.3f} ({t_skel * 1000:.0f} ms)")
+    print(f"✅ Re-weighted {len(edges)} edges ({t_geo * 1000:.0f} ms)"
+          + (f"  ⚠️  {unreached} not connected, kept straight-line" if unreached else ""))
+    if args.debug:
+        draw_debug(args.image, skel, args.debug)
+        print(f"✅ Saved {args.debug}")
+
+if __name__ == "__main__":
+    main()
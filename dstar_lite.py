@@ -0,0 +1,113 @@
+import math
+import heapq
+
+# ── D* Lite ────────────────────────────────────────────────────────────────
+# Shortest paths to one fixed goal from a start that keeps moving (Koenig &
+# Likhachev). The search runs backwards from the goal and keeps g / rhs and
+# the open list between calls, so re-planning from a new position only
+# expands what the previous searches did not already settle; a start the
+# earlier searches passed through costs no expansions at all. `km` absorbs
+# the start moving, so queued keys never need to be recomputed.
+# Nodemap edge weights do not change while navigating, so only the start
+# moves: every vertex is over-consistent or consistent, and the
+# under-consistent branch of the algorithm is never needed.
+#
+# The key trick needs a consistent heuristic, which BuildingGraph.heuristic
+# is not across a floor change, so h() is a weaker one: on the start's
+# floor the straight line or the way off the floor, whichever is less, and
+# 0 elsewhere. A start on another floor than the last one starts afresh.
+class DStarLite:
+    def __init__(self, graph, goal):
+        self.graph    = graph
+        self.goal     = goal
+        self.expanded = 0           # nodes settled by the last path() call
+        self.reset()
+
+    def reset(self):
+        self.start    = None
+        self.start_xy = None
+        self.km       = 0.0
+        self.g        = {}
+        self.rhs      = {self.goal: 0.0}
+        self.open     = {}          # node → key, the live entries of the heap
+        self.heap     = []
+
+    def h(self, node):
+        if node[0] != self.start[0]:
+            return 0.0
+        return min(math.dist(self.graph.coords(node), self.start_xy), self.graph.exit_cost(node))
+
+    def key(self, node):
+        best = min(self.g.get(node, math.inf), self.rhs.get(node, math.inf))
+        return (best + self.h(node) + self.km, best)
+
+    def push(self, node):
+        key             = self.key(node)
+        self.open[node] = key
+        heapq.heappush(self.heap, (key, node))
+
+    def top(self):
+        # Stale heap entries are skipped, like shortest_path's
+        while self.heap:
+            key, node = self.heap[0]
+            if self.open.get(node) == key:
+                return key, node
+            heapq.heappop(self.heap)
+        return (math.inf, math.inf), None
+
+    def update(self, node):
+        consistent = self.g.get(node, math.inf) == self.rhs.get(node, math.inf)
+        if consistent:
+            self.open.pop(node, None)
+        else:
+            self.push(node)
+
+    def compute(self):
+        g, rhs = self.g, self.rhs
+        self.expanded = 0
+        while True:
+            k_old, u = self.top()
+            if u is None:
+                return
+            if k_old >= self.key(self.start) and \
+               rhs.get(self.start, math.inf) <= g.get(self.start, math.inf):
+                return
+            k_new = self.key(u)
+            if k_old < k_new:
+                self.push(u)
+                continue
+
+            heapq.heappop(self.heap)
+            del self.open[u]
+            g[u]           = rhs[u]
+            self.expanded += 1
+            for s, w in self.graph.neighbors(u):
+                if g[u] + w < rhs.get(s, math.inf):
+                    rhs[s] = g[u] + w
+                    self.update(s)
+
+    def path(self, start):
+        # Node path start → goal, or None when the goal cannot be reached
+        if self.start is not None and start[0] != self.start[0]:
+            self.reset()
+        xy = self.graph.coords(start)
+        if self.start is None:
+            self.start, self.start_xy = start, xy
+            self.push(self.goal)
+        elif start != self.start:
+            self.km += math.dist(xy, self.start_xy)
+            self.start, self.start_xy = start, xy
+        self.compute()
+        if self.rhs.get(start, math.inf) == math.inf:
+            return None
+
+        # Walk downhill: each step to the neighbour with the least w + g
+        path, node = [start], start
+        while node != self.goal and len(path) <= len(self.g) + 1:
+            node = min(self.graph.neighbors(node),
+                       key=lambda item: item[1] + self.g.get(item[0], math.inf))[0]
+            path.append(node)
+        return path if node == self.goal else None
+
+    def cost(self, start):
+        return self.rhs.get(start, math.inf)
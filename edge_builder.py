@@ -0,0 +1,160 @@
+import os
+import json
+import time
+import argparse
+import numpy as np
+from scipy.spatial import Delaunay, QhullError, cKDTree
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import minimum_spanning_tree
+
+from nodemap_binary import compile_nodemap_file
+
+# ── Config ─────────────────────────────────────────────────────────────────
+METHOD       = "delaunay"   # or "knn"
+K            = 6            # neighbours per node for the k-NN candidates
+PRUNE_RATIO  = 2.0          # drop edges longer than this × the local spacing
+MAX_DIST     = None         # hard cap in pixels (None = no cap)
+NODES_SUFFIX = "_nodes.json"
+MAP_SUFFIX   = "_nodemap.json"
+
+# ── Candidate edges ────────────────────────────────────────────────────────
+# Both return an (E, 2) int array of unique pairs with i < j.
+def _unique_pairs(pairs, count):
+    pairs = np.sort(pairs, axis=1).astype(np.int64)
+    keys  = np.unique(pairs[:, 0] * count + pairs[:, 1])
+    return np.stack([keys // count, keys % count], axis=1)
+
+def delaunay_pairs(coords):
+    tri  = Delaunay(coords)
+    s    = tri.simplices
+    return _unique_pairs(np.concatenate([s[:, [0, 1]], s[:, [1, 2]], s[:, [0, 2]]]), len(coords))
+
+def knn_pairs(coords, k=K, tree=None):
+    tree   = tree if tree is not None else cKDTree(coords)
+    k      = min(k + 1, len(coords))
+    _, idx = tree.query(coords, k=k)
+    src    = np.repeat(np.arange(len(coords)), k - 1)
+    pairs  = np.stack([src, idx[:, 1:].ravel()], axis=1)
+    return _unique_pairs(pairs[pairs[:, 1] < len(coords)], len(coords))
+
+# ── Edge builder ───────────────────────────────────────────────────────────
+# Candidates come from a Delaunay triangulation (or k nearest neighbours when
+# the points are too few / collinear to triangulate). An edge survives if it
+# is shorter than PRUNE_RATIO × the larger nearest-neighbour distance of
+# its two ends, which removes the long hull and cross-building chords while
+# keeping corridor chains. The Euclidean minimum spanning tree is always
+# kept, so pruning never splits the floor. `max_dist` is a hard cap that
+# overrides everything. Returns (pairs, distances).
+def build_pairs(coords, method=METHOD, k=K, ratio=PRUNE_RATIO, max_dist=MAX_DIST):
+    coords = np.asarray(coords, dtype=np.float64)
+    n      = len(coords)
+    if n < 2:
+        return np.empty((0, 2), dtype=np.int64), np.empty(0)
+
+    tree = cKDTree(coords)
+    if method == "delaunay" and n >= 3:
+        try:
+            pairs = delaunay_pairs(coords)
+        except QhullError:
+            pairs = knn_pairs(coords, k, tree)
+    else:
+        pairs = knn_pairs(coords, k, tree)
+
+    diff = coords[pairs[:, 0]] - coords[pairs[:, 1]]
+    dist = np.hypot(diff[:, 0], diff[:, 1])
+
+    nn    = tree.query(coords, k=2)[0][:, 1]
+    keep  = dist < ratio * np.maximum(nn[pairs[:, 0]], nn[pairs[:, 1]])
+    mst   = minimum_spanning_tree(coo_matrix((dist + 1e-9, (pairs[:, 0], pairs[:, 1])),
+                                             shape=(n, n))).tocoo()
+    order = pairs[:, 0] * n + pairs[:, 1]
+    lo    = np.minimum(mst.row, mst.col).astype(np.int64)
+    hi    = np.maximum(mst.row, mst.col).astype(np.int64)
+    keep |= np.isin(order, lo * n + hi)
+    if max_dist is not None:
+        keep &= dist <= max_dist
+    return pairs[keep], dist[keep]
+
+def build_edges(nodes, method=METHOD, k=K, ratio=PRUNE_RATIO, max_dist=MAX_DIST, extra=None):
+    ids    = [n["id"] for n in nodes]
+    coords = np.array([(n["x"], n["y"]) for n in nodes], dtype=np.float64).reshape(-1, 2)
+    pairs, dist = build_pairs(coords, method, k, ratio, max_dist)
+
+    # Hand-specified edges on top (doors the geometry cannot see)
+    if extra:
+        index   = {node_id: i for i, node_id in enumerate(ids)}
+        missing = sorted({a for e in extra for a in e if a not in index})
+        if missing:
+            raise KeyError(f"Unknown node id(s) in extra edges: {missing}")
+        more  = np.array([(index[a], index[b]) for a, b in extra], dtype=np.int64)
+        pairs = np.unique(np.concatenate([pairs, np.sort(more, axis=1)]), axis=0)
+        diff  = coords[pairs[:, 0]] - coords[pairs[:, 1]]
+        dist  = np.hypot(diff[:, 0], diff[:, 1])
+
+    dist = np.round(dist, 1).tolist()
+    return [{"from": ids[a], "to": ids[b], "dist": d}
+            for (a, b), d in zip(pairs.tolist(), dist)]
+
+# ── Visualize ──────────────────────────────────────────────────────────────
+def visualize(image_path, nodes, edges, output_path, show=False):
+    from PIL import Image, ImageDraw
+    from ingest import draw_nodes
+
+    node_map = {n["id"]: n for n in nodes}
+    img      = Image.open(image_path).convert("RGB")
+    draw     = ImageDraw.Draw(img, "RGBA")
+    for edge in edges:
+        n1 = node_map[edge["from"]]
+        n2 = node_map[edge["to"]]
+        draw.line([(n1["x"], n1["y"]), (n2["x"], n2["y"])],
+                  fill=(46, 204, 113, 220), width=3)
+    draw_nodes(draw, nodes)
+    img.save(output_path)
+    if show:
+        img.show()
+
+# ── nodes.json → nodemap.json (+ compiled .ngm) ────────────────────────────
+def build_nodemap(nodes_path, out_path, compile=True, **options):
+    with open(nodes_path, "r") as f:
+        nodes = json.load(f)["nodes"]
+    start = time.perf_counter()
+    edges = build_edges(nodes, **options)
+    took  = time.perf_counter() - start
+
+    with open(out_path, "w") as f:
+        json.dump({"nodes": nodes, "edges": edges}, f, indent=4)
+    if compile:
+        compile_nodemap_file(out_path)
+    return nodes, edges, took
+
+# ── Main ───────────────────────────────────────────────────────────────────
+# `python edge_builder.py floor1_nodes.json` writes floor1_nodemap.json; a
+# directory (e.g. ingest.py's output) builds every *_nodes.json in it.
+def main():
+    parser = argparse.ArgumentParser(description="NaviGrid automatic edge builder")
+    parser.add_argument("nodes",        help="nodes JSON file or a directory of *" + NODES_SUFFIX)
+    parser.add_argument("--out",        default=None, help="output nodemap (single file only)")
+    parser.add_argument("--method",     choices=["delaunay", "knn"], default=METHOD)
+    parser.add_argument("--k",          type=int,   default=K)
+    parser.add_argument("--ratio",      type=float, default=PRUNE_RATIO)
+    parser.add_argument("--max-dist",   type=float, default=MAX_DIST)
+    parser.add_argument("--no-compile", action="store_true", help="skip the .ngm twin")
+    args = parser.parse_args()
+
+    if os.path.isdir(args.nodes):
+        names = sorted(n for n in os.listdir(args.nodes) if n.endswith(NODES_SUFFIX))
+        jobs  = [(os.path.join(args.nodes, n),
+                  os.path.join(args.nodes, n[:-len(NODES_SUFFIX)] + MAP_SUFFIX)) for n in names]
+    else:
+        base = args.nodes[:-len(NODES_SUFFIX)] if args.nodes.endswith(NODES_SUFFIX) \
+               else os.path.splitext(args.nodes)[0]
+        jobs = [(args.nodes, args.out or base + MAP_SUFFIX)]
+
+    for nodes_path, out_path in jobs:
+        nodes, edges, took = build_nodemap(nodes_path, out_path, not args.no_compile,
+                                           method=args.method, k=args.k,
+                                           ratio=args.ratio, max_dist=args.max_dist)
+        print(f"  ✅ {out_path}: {len(nodes)} nodes, {len(edges)} edges ({took * 1000:.1f} ms)")
+
+if __name__ == "__main__":
+    main()
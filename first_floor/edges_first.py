@@ -1,77 +1,51 @@
 import json
-from PIL import Image, ImageDraw
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from nodemap_binary import compile_nodemap_file
+from edge_builder import build_edges, visualize
+from corridor_skeleton import geodesic_edges
 
 # ── Config ─────────────────────────────────────────────────────────────────
 IMAGE_PATH  = r"C:\Users\adity\Downloads\navigrid\navigrid\first_level.jpg"
 NODES_JSON  = "floor1_nodes.json"
 OUTPUT_IMG  = "floor1_edges_output.png"
 OUTPUT_JSON = "floor1_nodemap.json"
-
-# ── Define edges from stairs (entry point of floor 1) ─────────────────────
-EDGES = [
-    ["stairs", "125"],
-    ["stairs", "130"],
-    ["stairs", "135"],
-    ["stairs", "140"],
-    ["stairs", "main_hall"],
-    ["stairs", "elevator"],
-    ["stairs", "exit"],
-]
+EXTRA       = []         # hand edges the geometry cannot see, e.g. ["stairs", "exit"]
+VISUALIZE   = False      # render (and show) OUTPUT_IMG
+GEODESIC    = True       # walking distance along the corridors, not straight lines
 
 # ── Load nodes ─────────────────────────────────────────────────────────────
 with open(NODES_JSON, "r") as f:
     data = json.load(f)
 
-nodes    = data["nodes"]
-node_map = {n["id"]: n for n in nodes}
+nodes = data["nodes"]
 print(f"✅ Loaded {len(nodes)} nodes")
 
 # ── Build edges ────────────────────────────────────────────────────────────
-built_edges = []
-for edge in EDGES:
-    n1 = node_map.get(edge[0])
-    n2 = node_map.get(edge[1])
-    if n1 and n2:
-        dx   = n1["x"] - n2["x"]
-        dy   = n1["y"] - n2["y"]
-        dist = round((dx**2 + dy**2) ** 0.5, 1)
-        built_edges.append({"from": edge[0], "to": edge[1], "dist": dist})
-        print(f"  ✅ {edge[0]} ──► {edge[1]} ({dist}px)")
-    else:
-        print(f"  ⚠️  Could not find: {edge[0]} or {edge[1]}")
-
-# ── Visualize ──────────────────────────────────────────────────────────────
-img  = Image.open(IMAGE_PATH).convert("RGB")
-draw = ImageDraw.Draw(img, "RGBA")
-
-# Draw edges
+# Corridor graph derived from the node layout (see edge_builder.py)
+built_edges = build_edges(nodes, extra=EXTRA)
+if GEODESIC:
+    built_edges, unreached = geodesic_edges(IMAGE_PATH, nodes, built_edges)
+    if unreached:
+        print(f"  ⚠️  {unreached} edge(s) off the corridor skeleton keep straight-line dist")
 for edge in built_edges:
-    n1 = node_map[edge["from"]]
-    n2 = node_map[edge["to"]]
-    draw.line([(n1["x"], n1["y"]), (n2["x"], n2["y"])],
-              fill=(46, 204, 113, 220), width=3)
-
-# Draw nodes
-for node in nodes:
-    cx, cy          = node["x"], node["y"]
-    x1, y1, x2, y2 = node["x1"], node["y1"], node["x2"], node["y2"]
-    draw.rectangle([x1, y1, x2, y2],
-                   fill=(52, 152, 219, 60),
-                   outline=(52, 152, 219, 255), width=3)
-    draw.ellipse([cx-10, cy-10, cx+10, cy+10], fill=(231, 76, 60, 255))
-    draw.rectangle([x1, y1-22, x1+len(node["id"])*8, y1],
-                   fill=(52, 152, 219, 200))
-    draw.text((x1+4, y1-20), node["id"], fill="white")
+    print(f"  ✅ {edge['from']} ──► {edge['to']} ({edge['dist']}px)")
 
-img.save(OUTPUT_IMG)
-img.show()
-print(f"✅ Saved {OUTPUT_IMG}")
+# ── Visualize ──────────────────────────────────────────────────────────────
+if VISUALIZE:
+    visualize(IMAGE_PATH, nodes, built_edges, OUTPUT_IMG, show=True)
+    print(f"✅ Saved {OUTPUT_IMG}")
 
 # ── Save final nodemap ─────────────────────────────────────────────────────
 with open(OUTPUT_JSON, "w") as f:
     json.dump({"nodes": nodes, "edges": built_edges}, f, indent=4)
 print(f"✅ Saved {OUTPUT_JSON}")
 
+# Memory-mapped twin for fast cold start (JSON stays the fallback)
+print(f"✅ Compiled {compile_nodemap_file(OUTPUT_JSON)}")
+
 print(f"\n📋 SUMMARY:")
 print(f"  Nodes: {len(nodes)}")
 print(f"  Edges: {len(built_edges)}")
\ No newline at end of file
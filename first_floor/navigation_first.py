@@ -1,14 +1,38 @@
 import cv2
-import easyocr
 import json
 import ollama
 import numpy as np
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ocr_worker import create_ocr_worker, detect_gpu
+from sign_matcher import SignMatcher
+from fuzzy_match import FuzzyMatcher
+from persistence import JournaledStore
+from frame_gate import FrameGate
+from ocr_scheduler import OCRScheduler, leg_distances
+from metrics import create_metrics
+from hud_cache import HUDCache
+from lazy import Lazy
 
 # ── Config ─────────────────────────────────────────────────────────────────
 NODEMAP_PATH      = "floor1_nodemap.json"
 SIGN_MAP_PATH     = "floor1_sign_map.json"
+FUZZY_SIGNS       = True       # also accept OCR misreads of sign keys ("O45", "stalrs")
 LLAMA_MEMORY_PATH = "llama_memory.json"
 CAMERA_INDEX      = 0
+OCR_EXECUTION     = "thread"   # "inline", "thread" or "process"
+OCR_WORKERS       = 1          # process mode defaults to one per core
+OCR_GPU           = None       # None: use CUDA when torch can see a GPU
+FRAME_GATE        = "mad"      # skip OCR on unchanged frames: "mad", "dhash" or None
+OCR_CPU_BUDGET    = 0.5        # cores' worth of OCR time on average
+OCR_LATENCY_SLO   = None       # or seconds from sign in view to OCR result
+METRICS_PROM      = None       # Prometheus text file, e.g. "navigrid_floor1.prom"
+METRICS_TRACE     = None       # per-frame JSONL latency trace
+
+METRICS = create_metrics(METRICS_PROM, METRICS_TRACE)
 
 # ── Full route (always starts from stairs) ─────────────────────────────────
 FULL_ROUTE = [
@@ -22,66 +46,62 @@ FULL_ROUTE = [
 ]
 
 # ── Load nodemap ───────────────────────────────────────────────────────────
-with open(NODEMAP_PATH, "r") as f:
-    data  = json.load(f)
-nodes = {n["id"]: n for n in data["nodes"]}
-print(f"✅ Loaded {len(nodes)} nodes")
+def load_nodes():
+    with open(NODEMAP_PATH, "r") as f:
+        data  = json.load(f)
+    nodes = {n["id"]: n for n in data["nodes"]}
+    print(f"✅ Loaded {len(nodes)} nodes")
+    return nodes
+
+nodes = Lazy(load_nodes)
 
 # ── Sign map ───────────────────────────────────────────────────────────────
+DEFAULT_SIGN_MAP = {
+    "125":       "125",
+    "130":       "130",
+    "135":       "135",
+    "140":       "140",
+    "main hall": "main_hall",
+    "main_hall": "main_hall",
+    "exit":      "exit",
+    "stairs":    "stairs",
+    "stair":     "stairs",
+}
+
 def load_sign_map():
-    try:
-        with open(SIGN_MAP_PATH, "r") as f:
-            return json.load(f)
-    except:
-        default = {
-            "125":       "125",
-            "130":       "130",
-            "135":       "135",
-            "140":       "140",
-            "main hall": "main_hall",
-            "main_hall": "main_hall",
-            "exit":      "exit",
-            "stairs":    "stairs",
-            "stair":     "stairs",
-        }
-        with open(SIGN_MAP_PATH, "w") as f:
-            json.dump(default, f, indent=4)
-        return default
-
-def save_sign_map(sign_map):
-    with open(SIGN_MAP_PATH, "w") as f:
-        json.dump(sign_map, f, indent=4)
-
-def update_sign_map(text, node_id, sign_map):
+    sign_map = JournaledStore(SIGN_MAP_PATH, default=DEFAULT_SIGN_MAP)
+    print(f"✅ Sign map loaded ({len(sign_map)} entries)")
+    return sign_map
+
+def update_sign_map(text, node_id, sign_map, *matchers):
     text_lower = text.lower().strip()
     if text_lower not in sign_map:
-        sign_map[text_lower] = node_id
-        save_sign_map(sign_map)
+        sign_map.set(text_lower, node_id)
+        METRICS.count("sign_learned")
+        for matcher in matchers:
+            matcher.add(text_lower, node_id)
         print(f"✅ New sign learned: '{text_lower}' → {node_id}")
     return sign_map
 
-SIGN_MAP = load_sign_map()
-print(f"✅ Sign map loaded ({len(SIGN_MAP)} entries)")
+SIGN_MAP     = Lazy(load_sign_map)
+SIGN_MATCHER = Lazy(lambda: SignMatcher(SIGN_MAP.get()), "sign_matcher")
+SIGN_FUZZY   = Lazy(lambda: FuzzyMatcher(SIGN_MAP.get()), "sign_fuzzy")
+
+def sign_matchers():
+    return (SIGN_MATCHER.get(), SIGN_FUZZY.get()) if FUZZY_SIGNS else (SIGN_MATCHER.get(),)
 
 # ── LLaMA memory ───────────────────────────────────────────────────────────
 def load_memory():
-    try:
-        with open(LLAMA_MEMORY_PATH, "r") as f:
-            return json.load(f)
-    except:
-        return {"history": [], "feedback": {}}
+    return JournaledStore(LLAMA_MEMORY_PATH, default={"history": [], "feedback": {}})
 
-def save_memory(memory):
-    with open(LLAMA_MEMORY_PATH, "w") as f:
-        json.dump(memory, f, indent=4)
-
-memory = load_memory()
+memory = Lazy(load_memory)
 
 # ── LLaMA instruction ──────────────────────────────────────────────────────
 def get_llama_instruction(current, next_node, route_progress):
-    past = ""
-    if memory["history"]:
-        recent = memory["history"][-5:]
+    store = memory.get()
+    past  = ""
+    if store["history"]:
+        recent = store["history"][-5:]
         past   = "Previous instructions:\n"
         past  += "\n".join([f"- {h['current']} → {h['next']}: {h['instruction']}"
                             for h in recent])
@@ -95,36 +115,54 @@ Progress: {route_progress}
 Give a short friendly natural navigation instruction in 1-2 sentences.
 No markdown, plain text only."""
 
+    start = METRICS.start()
     try:
         response    = ollama.chat(
             model="llama3.2",
             messages=[{"role": "user", "content": prompt}]
         )
         instruction = response["message"]["content"].strip()
-        memory["history"].append({
+        history = store["history"] + [{
             "current":     current,
             "next":        next_node,
             "instruction": instruction,
             "progress":    route_progress
-        })
-        if len(memory["history"]) > 20:
-            memory["history"] = memory["history"][-20:]
-        save_memory(memory)
-        return instruction
+        }]
+        store.set("history", history[-20:])
     except:
-        return f"You are at {current}. Continue to {next_node}."
+        METRICS.count("llm_fallback")
+        instruction = f"You are at {current}. Continue to {next_node}."
+    METRICS.stop("instruction", start)
+    return instruction
 
 # ── OCR ────────────────────────────────────────────────────────────────────
-print("🔤 Loading OCR...")
-reader = easyocr.Reader(["en"], gpu=True)
-print("✅ OCR ready")
+def ocr_gpu():
+    return detect_gpu() if OCR_GPU is None else OCR_GPU
+
+def load_reader():
+    import easyocr
+    gpu    = ocr_gpu()
+    reader = easyocr.Reader(["en"], gpu=gpu, verbose=False)
+    print(f"✅ OCR ready ({'GPU' if gpu else 'CPU'})")
+    return reader
+
+reader = Lazy(load_reader, "reader")
 
 def match_text(texts):
-    for text, conf in texts:
-        text_lower = text.lower().strip()
-        for key, node_id in SIGN_MAP.items():
-            if key in text_lower and conf > 0.4:
-                update_sign_map(text_lower, node_id, SIGN_MAP)
+    texts = [(text, text.lower().strip(), conf) for text, conf in texts if conf > 0.4]
+    for text, text_lower, conf in texts:
+        node_id = SIGN_MATCHER.get().match(text_lower)
+        if node_id is not None:
+            update_sign_map(text_lower, node_id, SIGN_MAP.get(), *sign_matchers())
+            return node_id, text, conf
+
+    # Misreads only when no line matched exactly. They are not learned, so a
+    # wrong guess never turns into a sign map key.
+    if FUZZY_SIGNS:
+        for text, text_lower, conf in texts:
+            node_id = SIGN_FUZZY.get().match(text_lower)
+            if node_id is not None:
+                METRICS.count("sign_fuzzy")
                 return node_id, text, conf
     return None, None, 0
 
@@ -252,9 +290,7 @@ def draw_minimap(frame, navigator):
     return frame
 
 # ── Draw overlay ───────────────────────────────────────────────────────────
-def draw_overlay(frame, ocr_results, navigator, detected):
-    h, w = frame.shape[:2]
-
+def draw_ocr_boxes(frame, ocr_results):
     for (bbox, text, prob) in ocr_results:
         if prob > 0.4:
             pts = np.array(bbox, dtype=np.int32)
@@ -262,6 +298,12 @@ def draw_overlay(frame, ocr_results, navigator, detected):
             cv2.putText(frame, f"{text}({prob:.2f})",
                         (pts[0][0], pts[0][1]-10),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+    return frame
+
+def draw_overlay(frame, ocr_results, navigator, detected):
+    h, w = frame.shape[:2]
+
+    draw_ocr_boxes(frame, ocr_results)
 
     status, color = navigator.get_status()
     cv2.rectangle(frame, (0, 0), (w, 90), (0, 0, 0), -1)
@@ -288,9 +330,29 @@ def draw_overlay(frame, ocr_results, navigator, detected):
 
     return frame
 
+# ── Cached HUD ─────────────────────────────────────────────────────────────
+# Same picture as draw_overlay + draw_minimap, re-rasterized only when the
+# navigator state changes.
+HUD = HUDCache()
+
+def draw_hud(frame, ocr_results, navigator, detected):
+    draw_ocr_boxes(frame, ocr_results)
+    key = (id(navigator), navigator.current_step, navigator.completed,
+           navigator.last_instruction, detected)
+    return HUD.composite(frame, key, lambda canvas: draw_minimap(
+        draw_overlay(canvas, [], navigator, detected), navigator))
+
 # ── Main ───────────────────────────────────────────────────────────────────
 def main():
+    # Load in the background while the user picks
+    for component in (nodes, SIGN_MATCHER, SIGN_FUZZY, memory):
+        component.warm()
+    if OCR_EXECUTION != "process":
+        print("🔤 Loading OCR in the background...")
+        reader.warm()
+
     destination = select_destination()
+    chosen      = time.perf_counter()
     dest_idx    = FULL_ROUTE.index(destination)
     route       = FULL_ROUTE[:dest_idx + 1]
     print(f"\n📍 Route: {' → '.join(route)}")
@@ -302,28 +364,64 @@ def main():
 
     print("✅ Camera opened!")
     nav          = Navigator(route)
-    frame_count  = 0
+    ocr_reader   = reader.get() if OCR_EXECUTION != "process" else None
+    ocr          = create_ocr_worker(OCR_EXECUTION, ocr_reader, OCR_WORKERS, gpu=ocr_gpu())
+    gate         = FrameGate(FRAME_GATE) if FRAME_GATE else None
+    node_map     = nodes.get()
+    points       = [(node_map[n]["x"], node_map[n]["y"]) if n in node_map else None
+                    for n in route]
+    sched        = OCRScheduler(leg_distances(points),
+                                cpu_budget=OCR_CPU_BUDGET, latency_slo=OCR_LATENCY_SLO)
     ocr_results  = []
     last_matched = None
+    first_frame  = True
 
     while True:
-        ret, frame = cap.read()
+        frame_start = METRICS.start()
+        ret, frame  = cap.read()
         if not ret:
             break
-        frame_count += 1
 
-        if frame_count % 5 == 0:
-            results     = reader.readtext(frame)
+        ocr_due = sched.due(frame, nav.current_step) and (gate is None or gate.changed(frame))
+        results = None
+        if not ocr_due:
+            METRICS.count("ocr_skipped")
+        if ocr is None:
+            if ocr_due:
+                start   = time.perf_counter()
+                results = ocr_reader.readtext(frame)
+                elapsed = time.perf_counter() - start
+                sched.record_latency(elapsed)
+                METRICS.observe("readtext", elapsed)
+        else:
+            if ocr_due:
+                ocr.submit(frame)
+            results = ocr.poll()
+            if results is not None:
+                sched.record_latency(ocr.latency)
+                METRICS.observe("readtext", ocr.latency)
+
+        if results is not None:
             ocr_results = results
+            start       = METRICS.start()
             texts       = [(r[1], r[2]) for r in results]
             node, text, conf = match_text(texts)
+            METRICS.stop("match_text", start)
             if node:
+                METRICS.count("sign_match")
                 last_matched = node
                 nav.update(node)
 
-        frame = draw_overlay(frame, ocr_results, nav, last_matched)
-        frame = draw_minimap(frame, nav)
+        start = METRICS.start()
+        frame = draw_hud(frame, ocr_results, nav, last_matched)
+        METRICS.stop("draw_hud", start)
         cv2.imshow("NaviGrid - Floor 1", frame)
+        METRICS.end_frame(frame_start)
+        if first_frame:
+            first_frame = False
+            ttff        = time.perf_counter() - chosen
+            METRICS.observe("first_frame", ttff)
+            print(f"⏱️  First frame {ttff:.2f}s after choosing the destination")
 
         if cv2.waitKey(1) & 0xFF == ord("q"):
             break
@@ -331,8 +429,15 @@ def main():
             cv2.waitKey(3000)
             break
 
+    if ocr is not None:
+        ocr.close()
+    if gate is not None:
+        print(f"📊 OCR: {gate.executed} run, {gate.skipped} skipped on unchanged frames")
     cap.release()
     cv2.destroyAllWindows()
+    SIGN_MAP.close()
+    memory.close()
+    METRICS.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,57 @@
+import cv2
+import numpy as np
+
+# ── Config ─────────────────────────────────────────────────────────────────
+SIGNATURE_SIZE = 32      # frames are compared as 32×32 grayscale thumbnails
+MAD_THRESHOLD  = 6.0     # mean absolute difference (0-255) that counts as change
+HASH_THRESHOLD = 6       # differing dHash bits that count as change
+MAX_SKIPS      = 30      # re-OCR at least this often even if nothing moved
+
+# ── Change-detection gate ──────────────────────────────────────────────────
+# Compares each candidate frame against the last frame that was actually
+# OCR'd. "mad" uses the mean absolute difference of the thumbnails, "dhash"
+# the Hamming distance of their difference hashes.
+class FrameGate:
+    def __init__(self, method="mad", threshold=None, max_skips=MAX_SKIPS):
+        if method not in ("mad", "dhash"):
+            raise ValueError(f"Unknown frame gate method: {method}")
+        self.method    = method
+        self.threshold = threshold if threshold is not None else (
+            MAD_THRESHOLD if method == "mad" else HASH_THRESHOLD)
+        self.max_skips = max_skips
+        self.executed  = 0
+        self.skipped   = 0
+        self._last     = None
+        self._streak   = 0
+
+    @staticmethod
+    def thumbnail(frame, size=SIGNATURE_SIZE):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        return cv2.resize(gray, (size, size), interpolation=cv2.INTER_AREA)
+
+    def signature(self, frame):
+        if self.method == "mad":
+            return self.thumbnail(frame).astype(np.int16)
+        # dHash: is each pixel brighter than its right-hand neighbour?
+        thumb = self.thumbnail(frame, SIGNATURE_SIZE // 4)
+        return thumb[:, 1:] > thumb[:, :-1]
+
+    def distance(self, a, b):
+        if self.method == "mad":
+            return float(np.abs(a - b).mean())
+        return int(np.count_nonzero(a != b))
+
+    def changed(self, frame):
+        sig = self.signature(frame)
+        if (self._last is None or self._streak >= self.max_skips
+                or self.distance(sig, self._last) > self.threshold):
+            self._last   = sig
+            self._streak = 0
+            self.executed += 1
+            return True
+        self._streak += 1
+        self.skipped += 1
+        return False
+
+    def stats(self):
+        return {"executed": self.executed, "skipped": self.skipped}
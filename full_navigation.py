@@ -1,15 +1,46 @@
 import cv2
-import easyocr
-import json
+import time
 import ollama
 import numpy as np
+from ocr_worker import create_ocr_worker, detect_gpu
+from sign_matcher import SignMatcher
+from fuzzy_match import FuzzyMatcher
+from persistence import JournaledStore
+from instruction_cache import InstructionCache, InstructionPrefetcher
+from registry import Registry, load_manifest
+from position_tracker import PositionTracker, RouteGraph, place_route
+from dstar_lite import DStarLite
+from text_regions import RegionReader
+from frame_gate import FrameGate
+from ocr_scheduler import OCRScheduler
+from metrics import create_metrics
+from hud_cache import HUDCache
+from lazy import Lazy
 
 # ── Config ─────────────────────────────────────────────────────────────────
 LOWER_NODEMAP     = "nodemap_final.json"
 FLOOR1_NODEMAP    = "floor1_nodemap.json"
+BUILDING_MANIFEST = None       # campus manifest (see registry.py); None: the two maps above
+REGISTRY_MEMORY   = 512        # MB of floor data kept resident before LRU eviction
 SIGN_MAP_PATH     = "sign_map.json"
+FUZZY_SIGNS       = True       # also accept OCR misreads of sign keys ("O45", "stalrs")
+TRACK_CONFIDENCE  = 0.5        # belief a route step needs before the navigator moves on
 LLAMA_MEMORY_PATH = "llama_memory.json"
+INSTRUCTION_CACHE = "instruction_cache.json"
+INSTRUCTION_LIMIT = 512        # cached instructions kept across runs
+BUILDING_ID       = "main_building"
+USE_LLAMA         = True       # False: plain "Continue from ..." instructions
+STREAM_LLAMA      = True       # show instructions as they are written; False: wait for them
 CAMERA_INDEX      = 0
+OCR_EXECUTION     = "thread"   # "inline", "thread" or "process"
+OCR_WORKERS       = 1          # process mode defaults to one per core
+OCR_REGIONS       = True       # recognize only proposed sign crops, not the full frame
+OCR_GPU           = None       # None: use CUDA when torch can see a GPU
+FRAME_GATE        = "mad"      # skip OCR on unchanged frames: "mad", "dhash" or None
+OCR_CPU_BUDGET    = 0.5        # cores' worth of OCR time on average
+OCR_LATENCY_SLO   = None       # or seconds from sign in view to OCR result
+METRICS_PROM      = None       # Prometheus text file, e.g. "navigrid.prom"
+METRICS_TRACE     = None       # per-frame JSONL latency trace, e.g. "trace.jsonl"
 
 # ── Lower level route ──────────────────────────────────────────────────────
 LOWER_ROUTE = [
@@ -49,74 +80,107 @@ ALL_DESTINATIONS = {
     "exit":     {"floor": "floor1", "label": "Floor 1 - Exit"},
 }
 
-# ── Load nodemaps ──────────────────────────────────────────────────────────
-with open(LOWER_NODEMAP, "r") as f:
-    lower_data  = json.load(f)
-with open(FLOOR1_NODEMAP, "r") as f:
-    floor1_data = json.load(f)
-
-lower_nodes  = {n["id"]: n for n in lower_data["nodes"]}
-floor1_nodes = {n["id"]: n for n in floor1_data["nodes"]}
-print(f"✅ Loaded {len(lower_nodes)} lower level nodes")
-print(f"✅ Loaded {len(floor1_nodes)} floor 1 nodes")
+# ── Metrics ────────────────────────────────────────────────────────────────
+METRICS = create_metrics(METRICS_PROM, METRICS_TRACE)
+
+# ── Building registry ──────────────────────────────────────────────────────
+# Floors load when a route first touches them (see registry.py). Without a
+# manifest the registry holds this building's two nodemaps.
+START_NODE = ("lower", "entrance")
+
+def default_manifest():
+    return {"buildings": {BUILDING_ID: {
+        "label":        "Main Building",
+        "start":        list(START_NODE),
+        "floors":       [{"id": "lower",  "label": "Lower Level", "nodemap": LOWER_NODEMAP},
+                         {"id": "floor1", "label": "Floor 1",     "nodemap": FLOOR1_NODEMAP}],
+        "destinations": ALL_DESTINATIONS,
+    }}}
+
+def load_registry():
+    manifest = load_manifest(BUILDING_MANIFEST) if BUILDING_MANIFEST else default_manifest()
+    registry = Registry(manifest, memory_cap=REGISTRY_MEMORY * 1024 * 1024)
+    # Every route starts on the start floor, so that one is worth warming
+    floor, _ = registry.start(BUILDING_ID)
+    print(f"✅ Loaded {len(registry.floor(BUILDING_ID, floor))} {floor} nodes")
+    return registry
+
+REGISTRY = Lazy(load_registry)
+
+def destinations(building=None):
+    building = building or BUILDING_ID
+    found    = REGISTRY.get().destinations(building)
+    return found or (ALL_DESTINATIONS if building == BUILDING_ID else {})
 
 # ── Sign map ───────────────────────────────────────────────────────────────
+DEFAULT_SIGN_MAP = {
+    "045":             "room_045",
+    "040":             "room_040",
+    "025":             "room_025",
+    "010":             "room_010",
+    "active learning": "room_045",
+    "stair":           "stairs",
+    "stairs":          "stairs",
+    "125":             "125",
+    "130":             "130",
+    "135":             "135",
+    "140":             "140",
+    "main hall":       "main_hall",
+    "exit":            "exit",
+}
+
 def load_sign_map():
-    try:
-        with open(SIGN_MAP_PATH, "r") as f:
-            return json.load(f)
-    except:
-        default = {
-            "045":             "room_045",
-            "040":             "room_040",
-            "025":             "room_025",
-            "010":             "room_010",
-            "active learning": "room_045",
-            "stair":           "stairs",
-            "stairs":          "stairs",
-            "125":             "125",
-            "130":             "130",
-            "135":             "135",
-            "140":             "140",
-            "main hall":       "main_hall",
-            "exit":            "exit",
-        }
-        with open(SIGN_MAP_PATH, "w") as f:
-            json.dump(default, f, indent=4)
-        return default
-
-def save_sign_map(sign_map):
-    with open(SIGN_MAP_PATH, "w") as f:
-        json.dump(sign_map, f, indent=4)
-
-def update_sign_map(text, node_id, sign_map):
+    return JournaledStore(SIGN_MAP_PATH, default=DEFAULT_SIGN_MAP)
+
+def update_sign_map(text, node_id, sign_map, *matchers):
     text_lower = text.lower().strip()
     if text_lower not in sign_map:
-        sign_map[text_lower] = node_id
-        save_sign_map(sign_map)
+        sign_map.set(text_lower, node_id)
+        METRICS.count("sign_learned")
+        for matcher in matchers:
+            matcher.add(text_lower, node_id)
         print(f"✅ New sign learned: '{text_lower}' → {node_id}")
     return sign_map
 
-SIGN_MAP = load_sign_map()
+SIGN_MAP     = Lazy(load_sign_map)
+SIGN_MATCHER = Lazy(lambda: SignMatcher(SIGN_MAP.get()), "sign_matcher")
+SIGN_FUZZY   = Lazy(lambda: FuzzyMatcher(SIGN_MAP.get()), "sign_fuzzy")
+
+def sign_matchers():
+    return (SIGN_MATCHER.get(), SIGN_FUZZY.get()) if FUZZY_SIGNS else (SIGN_MATCHER.get(),)
+
+# A floor's manifest sign map joins the matchers the first time a route
+# reaches that floor. Keys already in sign_map.json keep their node.
+floors_signed = set()        # (building, floor) already added
+
+def add_floor_signs(building, floors):
+    learned = SIGN_MAP.get()
+    known   = REGISTRY.get().floor_order(building)
+    for floor in dict.fromkeys(floors):
+        if (building, floor) in floors_signed:
+            continue
+        if floor not in known:
+            print(f"⚠️  {floor} is not a floor of {building} in the manifest; no floor signs")
+            floors_signed.add((building, floor))
+            continue
+        floors_signed.add((building, floor))
+        for key, node_id in REGISTRY.get().sign_map(building, floor).items():
+            key = key.lower().strip()
+            if key not in learned:
+                for matcher in sign_matchers():
+                    matcher.add(key, node_id)
 
 # ── LLaMA ──────────────────────────────────────────────────────────────────
 def load_memory():
-    try:
-        with open(LLAMA_MEMORY_PATH, "r") as f:
-            return json.load(f)
-    except:
-        return {"history": [], "feedback": {}}
-
-def save_memory(memory):
-    with open(LLAMA_MEMORY_PATH, "w") as f:
-        json.dump(memory, f, indent=4)
+    return JournaledStore(LLAMA_MEMORY_PATH, default={"history": [], "feedback": {}})
 
-memory = load_memory()
+memory = Lazy(load_memory)
 
-def get_llama_instruction(current, next_node, floor, progress):
-    past = ""
-    if memory["history"]:
-        recent = memory["history"][-5:]
+def generate_llama_instruction(current, next_node, floor, progress, on_text=None):
+    store = memory.get()
+    past  = ""
+    if store["history"]:
+        recent = store["history"][-5:]
         past   = "Previous instructions:\n"
         past  += "\n".join([f"- {h['current']} → {h['next']}: {h['instruction']}"
                             for h in recent])
@@ -137,76 +201,190 @@ Progress: {progress}
 Give a short friendly natural navigation instruction in 1-2 sentences.
 No markdown, plain text only."""
 
+    # Always streamed, so time to first token is known even for prefetches
+    start       = time.perf_counter()
+    instruction = ""
+    for chunk in ollama.chat(
+        model="llama3.2",
+        messages=[{"role": "user", "content": prompt}],
+        stream=True
+    ):
+        piece = chunk["message"]["content"]
+        if piece and not instruction:
+            METRICS.observe("llm_first_token", time.perf_counter() - start)
+        instruction += piece
+        if on_text is not None and instruction.strip():
+            on_text(instruction.strip())
+    METRICS.observe("llm_generate", time.perf_counter() - start)
+    instruction = instruction.strip()
+    # The prefetch and streaming workers both get here, so append atomically
+    entry = {
+        "current": current, "next": next_node,
+        "instruction": instruction, "progress": progress
+    }
+    store.update("history", lambda history: (history + [entry])[-20:], [])
+    return instruction
+
+# ── Instruction cache ──────────────────────────────────────────────────────
+PREFETCHER = Lazy(lambda: InstructionPrefetcher(
+    InstructionCache(INSTRUCTION_CACHE, max_entries=INSTRUCTION_LIMIT),
+    generate_llama_instruction,
+    BUILDING_ID,
+), "prefetcher")
+
+def route_legs(route, floors):
+    # Same (current, next, floor, progress) the Navigator asks for per node
+    return [(route[step], route[step + 1], floors[step], f"{step}/{len(route)-1}")
+            for step in range(1, len(route) - 1)]
+
+def route_graph(floors, building=None):
+    return REGISTRY.get().graph(building or BUILDING_ID, floors)
+
+def route_leg_pixels(route, floors, building=None):
+    # Both ends are looked up on the leg's starting floor, where the
+    # connector the user is heading for also lives.
+    graph = route_graph(floors, building)
+    legs  = []
+    for step in range(len(route) - 1):
+        try:
+            a = graph.node(floors[step], route[step])
+            b = graph.node(floors[step], route[step + 1])
+            legs.append(graph.edge_length(a, b))
+        except KeyError:
+            legs.append(0.0)
+    return legs
+
+def get_llama_instruction(current, next_node, floor, progress):
+    if not USE_LLAMA:
+        return f"Continue from {current} to {next_node}."
+    start = METRICS.start()
     try:
-        response    = ollama.chat(
-            model="llama3.2",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        instruction = response["message"]["content"].strip()
-        memory["history"].append({
-            "current": current, "next": next_node,
-            "instruction": instruction, "progress": progress
-        })
-        if len(memory["history"]) > 20:
-            memory["history"] = memory["history"][-20:]
-        save_memory(memory)
-        return instruction
+        instruction = PREFETCHER.get().instruction(current, next_node, floor, progress)
     except:
-        return f"Continue from {current} to {next_node}."
+        METRICS.count("llm_fallback")
+        instruction = f"Continue from {current} to {next_node}."
+    METRICS.stop("instruction", start)
+    return instruction
 
 # ── OCR ────────────────────────────────────────────────────────────────────
-print("🔤 Loading OCR...")
-reader = easyocr.Reader(["en"], gpu=True)
-print("✅ OCR ready")
+def ocr_gpu():
+    return detect_gpu() if OCR_GPU is None else OCR_GPU
+
+def load_reader():
+    # easyocr pulls in torch, so even the import waits until it is needed
+    import easyocr
+    gpu    = ocr_gpu()
+    reader = easyocr.Reader(["en"], gpu=gpu, verbose=False)
+    if OCR_REGIONS:
+        reader = RegionReader(reader)
+    print(f"✅ OCR ready ({'GPU' if gpu else 'CPU'})")
+    return reader
+
+reader = Lazy(load_reader, "reader")
 
 def match_text(texts):
-    for text, conf in texts:
-        text_lower = text.lower().strip()
-        for key, node_id in SIGN_MAP.items():
-            if key in text_lower and conf > 0.4:
-                update_sign_map(text_lower, node_id, SIGN_MAP)
+    texts = [(text, text.lower().strip(), conf) for text, conf in texts if conf > 0.4]
+    for text, text_lower, conf in texts:
+        node_id = SIGN_MATCHER.get().match(text_lower)
+        if node_id is not None:
+            update_sign_map(text_lower, node_id, SIGN_MAP.get(), *sign_matchers())
+            return node_id, text, conf
+
+    # Misreads only when no line matched exactly. They are not learned, so a
+    # wrong guess never turns into a sign map key.
+    if FUZZY_SIGNS:
+        for text, text_lower, conf in texts:
+            node_id = SIGN_FUZZY.get().match(text_lower)
+            if node_id is not None:
+                METRICS.count("sign_fuzzy")
                 return node_id, text, conf
     return None, None, 0
 
-# ── Build full route ───────────────────────────────────────────────────────
-def build_route(destination):
-    dest_info = ALL_DESTINATIONS[destination]
+def handle_ocr_results(results, navigator):
+    start = METRICS.start()
+    texts = [(r[1], r[2]) for r in results]
+    node, text, conf = match_text(texts)
+    METRICS.stop("match_text", start)
+    if node:
+        METRICS.count("sign_match")
+        navigator.update(node, conf)
+    return node
 
-    if dest_info["floor"] == "lower":
+# ── Build full route ───────────────────────────────────────────────────────
+# The surveyed corridor order only covers the default building's nodes
+def build_fixed_route(destination):
+    if destination in LOWER_ROUTE:
         # Destination on lower level
         dest_idx = LOWER_ROUTE.index(destination)
-        return LOWER_ROUTE[:dest_idx + 1], "lower"
-    else:
+        route    = LOWER_ROUTE[:dest_idx + 1]
+        return route, ["lower"] * len(route)
+    elif destination in FLOOR1_ROUTE:
         # Destination on floor 1
         # Go from entrance to stairs on lower level
         stairs_idx  = LOWER_ROUTE.index("stairs")
-        lower_part  = LOWER_ROUTE[:stairs_idx + 1]
+        lower_part  = LOWER_ROUTE[:stairs_idx]
         # Then from stairs to destination on floor 1
         dest_idx    = FLOOR1_ROUTE.index(destination)
         floor1_part = FLOOR1_ROUTE[:dest_idx + 1]
-        # Combine (stairs appears in both, remove duplicate)
-        full_route  = lower_part + floor1_part[1:]
-        return full_route, "multi"
+        # Combine (stairs counts as floor 1 once reached)
+        full_route  = lower_part + floor1_part
+        return full_route, ["lower"] * len(lower_part) + ["floor1"] * len(floor1_part)
+    raise ValueError(f"No route to {destination}")
+
+def build_route(destination, building=None):
+    building  = building or BUILDING_ID
+    registry  = REGISTRY.get()
+    dest_info = destinations(building)[destination]
+    try:
+        route, floors, _ = registry.route(building, registry.start(building),
+                                          (dest_info["floor"], destination))
+    except KeyError:
+        route = None
+
+    if route is None:
+        if building != BUILDING_ID or destination not in LOWER_ROUTE + FLOOR1_ROUTE:
+            raise ValueError(f"No route to {destination} in {building}")
+        # Node missing from the nodemaps or not connected yet
+        print(f"⚠️  No graph route to {destination}, using the surveyed corridor order")
+        route, floors = build_fixed_route(destination)
+
+    add_floor_signs(building, floors)
+    floor_type = "multi" if len(set(floors)) > 1 else floors[0]
+    return route, floor_type, floors
 
 # ── Destination selector ───────────────────────────────────────────────────
-def select_destination():
+# Lists the building's destinations from the registry; floors are labelled
+# from the manifest, the start floor marked ⬇️  and the others 🏢.
+def select_destination(building=None):
+    building    = building or BUILDING_ID
+    registry    = REGISTRY.get()
+    found       = destinations(building)
+    start_floor, start_node = registry.start(building)
+
+    def floor_label(floor):
+        try:
+            return registry.floor_spec(building, floor).get("label", floor)
+        except KeyError:
+            return floor
+
     print("\n🗺️  NaviGrid - Full Building Navigation")
     print("=" * 40)
-    print("📍 Starting from: Entrance (Lower Level)")
+    print(f"📍 Starting from: {start_node.replace('_', ' ').title()} ({floor_label(start_floor)})")
     print("\n🎯 Select your destination:")
 
-    dest_list = list(ALL_DESTINATIONS.keys())
+    dest_list = list(found.keys())
     for i, node in enumerate(dest_list):
-        info  = ALL_DESTINATIONS[node]
-        floor = "🏢 Floor 1" if info["floor"] == "floor1" else "⬇️  Lower Level"
-        print(f"  {i+1}. {info['label']} [{floor}]")
+        info  = found[node]
+        floor = f"⬇️  {floor_label(info['floor'])}" if info["floor"] == start_floor \
+                else f"🏢 {floor_label(info['floor'])}"
+        print(f"  {i+1}. {info.get('label', node)} [{floor}]")
 
     while True:
         try:
             choice = int(input("\nEnter number: ")) - 1
             if 0 <= choice < len(dest_list):
                 dest = dest_list[choice]
-                print(f"\n✅ Destination: {ALL_DESTINATIONS[dest]['label']}")
+                print(f"\n✅ Destination: {found[dest].get('label', dest)}")
                 return dest
             else:
                 print("❌ Invalid choice")
@@ -214,50 +392,166 @@ def select_destination():
             print("❌ Invalid input")
 
 # ── Navigator ──────────────────────────────────────────────────────────────
+# Detections feed a PositionTracker over the building graph (or over the
+# route alone when no graph is given or it cannot place the route). The
+# navigator moves on to the route step ahead that holds the most belief once
+# that reaches TRACK_CONFIDENCE, so one stray sign does not advance the user
+# and a missed one does not strand them.
+# As soon as the most likely node is off the route instead, the route is
+# re-planned from there to the same destination with D* Lite, which keeps
+# its search between re-plans (see dstar_lite.py). `revision` counts route
+# changes for whoever caches anything derived from the route.
 class Navigator:
-    def __init__(self, route, floor_type):
-        self.route            = route
+    def __init__(self, route, floor_type, floors=None, graph=None):
         self.floor_type       = floor_type
         self.current_step     = 0
         self.current_position = route[0]
-        self.current_floor    = "lower"
         self.completed        = False
+        self.walked           = 0          # steps taken on earlier routes
+        self.revision         = 0
+        self.graph            = graph
+        self._set_route(route, floors or ["lower"] * len(route))
+        self.current_floor    = self.floors[0]
+        self.tracker          = PositionTracker(self.graph, self.step_nodes[0], self.follow)
+        self.planner          = None if isinstance(self.graph, RouteGraph) \
+                                else DStarLite(self.graph, self.step_nodes[-1][0])
         self.last_instruction = f"🚶 Walk straight down the corridor to {route[1]}."
         print(f"\n🗺️  Navigation Started!")
         print(f"📍 Start: {self.current_position}")
         print(f"🎯 Destination: {route[-1]}")
         print(f"➡️  {self.last_instruction}\n")
 
-    def update(self, detected_node):
+    def _set_route(self, route, floors):
+        self.route                   = route
+        self.floors                  = floors
+        self.graph, self.step_nodes  = place_route(self.graph, route, floors)
+        self.node_step               = {n: k for k, nodes in enumerate(self.step_nodes)
+                                        for n in nodes}
+        self.follow                  = {n: nxt[0] for nodes, nxt in zip(self.step_nodes,
+                                                                        self.step_nodes[1:])
+                                        for n in nodes}
+
+    def progress(self):
+        # Share of the walk done, counting steps taken before any re-route
+        done = self.walked + self.current_step
+        return done / max(self.walked + len(self.route) - 1, 1)
+
+    def step_ahead(self):
+        # (route step past the current one with the most belief, its belief)
+        mass = {}
+        for node, p in self.tracker.belief.items():
+            step = self.node_step.get(node)
+            if step is not None and step > self.current_step:
+                mass[step] = mass.get(step, 0.0) + p
+        return max(mass.items(), key=lambda item: item[1], default=(None, 0.0))
+
+    def update(self, detected_node, conf=1.0):
         if self.completed:
             return
+        self.tracker.observe(detected_node, conf)
+        node, belief = self.tracker.estimate()
+        if self.planner is not None and node is not None and node not in self.node_step:
+            self.reroute(node, detected_node, belief)
+            return
+
+        # A sign that is not on the route never moves the user along it, even
+        # when its neighbourhood lends belief to the next route step
+        if not any(n in self.node_step for n in self.tracker.graph.nodes_with_id(detected_node)):
+            return
+        step, belief = self.step_ahead()
+        if step is None or belief < TRACK_CONFIDENCE:
+            return
+
+        self.current_step     = step
+        self.current_position = self.route[step]
+        self._announce(detected_node, belief)
+
+    def reroute(self, node, detected_node, belief):
+        start = METRICS.start()
+        path  = self.planner.path(node)
+        METRICS.stop("replan", start)
+        if path is None:
+            return
+        METRICS.count("reroute")
+        route, floors = self.graph.path_ids(path)
+        print(f"\n↪️  Off route at {route[0]}: {len(route) - 1} steps to {route[-1]} "
+              f"({self.planner.expanded} nodes searched)")
+
+        self.walked          += self.current_step
+        self.revision        += 1
+        self.floor_type       = "multi" if len(set(floors)) > 1 else floors[0]
+        self._set_route(route, floors)
+        self.tracker.follow   = self.follow
+        self.current_step     = 0
+        self.current_position = route[0]
+        if USE_LLAMA:
+            PREFETCHER.get().prefetch(route_legs(route, floors))
+        self._announce(detected_node, belief)
+
+    def _announce(self, detected_node, belief):
+        reached = self.current_position
+
+        # Update floor
+        self.current_floor = self.floors[self.current_step]
+
         if self.current_step + 1 < len(self.route):
-            next_node = self.route[self.current_step + 1]
-            if detected_node == next_node:
-                self.current_step    += 1
-                self.current_position = detected_node
-
-                # Update floor
-                if detected_node in FLOOR1_ROUTE:
-                    self.current_floor = "floor1"
-
-                if self.current_step + 1 < len(self.route):
-                    upcoming    = self.route[self.current_step + 1]
-                    progress    = f"{self.current_step}/{len(self.route)-1}"
-                    print(f"\n{'='*50}")
-                    print(f"📍 Detected: {detected_node}")
-                    print("🤖 Generating instruction...")
-                    instruction = get_llama_instruction(
-                        detected_node, upcoming,
-                        self.current_floor, progress
-                    )
-                    self.last_instruction = instruction
-                    print(f"🧭 {instruction}")
-                    print(f"{'='*50}\n")
-                else:
-                    self.completed        = True
-                    self.last_instruction = f"🎉 You have arrived at {detected_node}!"
-                    print(self.last_instruction)
+            upcoming    = self.route[self.current_step + 1]
+            progress    = f"{self.current_step}/{len(self.route)-1}"
+            print(f"\n{'='*50}")
+            print(f"📍 Detected: {detected_node} → at {reached} ({belief:.0%})")
+            if USE_LLAMA and STREAM_LLAMA:
+                self.stream_instruction(reached, upcoming, progress)
+                return
+            print("🤖 Generating instruction...")
+            instruction = get_llama_instruction(
+                reached, upcoming,
+                self.current_floor, progress
+            )
+            self.last_instruction = instruction
+            print(f"🧭 {instruction}")
+            print(f"{'='*50}\n")
+        else:
+            self.completed        = True
+            self.last_instruction = f"🎉 You have arrived at {reached}!"
+            print(self.last_instruction)
+
+    # The banner shows the plain instruction until the model's first words
+    # arrive, then the instruction so far; the frame loop never waits. Text
+    # for a leg the user has already left is dropped.
+    def stream_instruction(self, current, next_node, progress):
+        leg                   = (self.revision, self.current_step)
+        start                 = time.perf_counter()
+        shown                 = []
+        fallback              = f"Continue from {current} to {next_node}."
+        self.last_instruction = fallback
+
+        def on_text(text):
+            if not shown:
+                shown.append(time.perf_counter() - start)
+                METRICS.observe("instruction_first_text", shown[0])
+            if (self.revision, self.current_step) == leg and not self.completed:
+                self.last_instruction = text
+
+        def done(future):
+            METRICS.observe("instruction", time.perf_counter() - start)
+            if future.cancelled() or future.exception() is not None:
+                # Don't leave a half-streamed sentence on the banner
+                if (self.revision, self.current_step) == leg and not self.completed:
+                    self.last_instruction = fallback
+                METRICS.count("llm_fallback")
+                return
+            first = f"{shown[0]:.2f}s to first words, " if shown else ""
+            print(f"🧭 {future.result()} ({first}{time.perf_counter() - start:.2f}s total)")
+
+        print("🤖 Streaming instruction...")
+        try:
+            future = PREFETCHER.get().stream(current, next_node, self.current_floor,
+                                             progress, on_text)
+        except:
+            METRICS.count("llm_fallback")
+            return
+        future.add_done_callback(done)
+        print(f"{'='*50}\n")
 
     def get_status(self):
         floor_label = "Floor 1" if self.current_floor == "floor1" else "Lower Level"
@@ -338,9 +632,7 @@ def draw_minimap(frame, navigator):
     return frame
 
 # ── Draw overlay ───────────────────────────────────────────────────────────
-def draw_overlay(frame, ocr_results, navigator, detected):
-    h, w = frame.shape[:2]
-
+def draw_ocr_boxes(frame, ocr_results):
     for (bbox, text, prob) in ocr_results:
         if prob > 0.4:
             pts = np.array(bbox, dtype=np.int32)
@@ -348,13 +640,19 @@ def draw_overlay(frame, ocr_results, navigator, detected):
             cv2.putText(frame, f"{text}({prob:.2f})",
                         (pts[0][0], pts[0][1]-10),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+    return frame
+
+def draw_overlay(frame, ocr_results, navigator, detected):
+    h, w = frame.shape[:2]
+
+    draw_ocr_boxes(frame, ocr_results)
 
     status, color = navigator.get_status()
     cv2.rectangle(frame, (0, 0), (w, 90), (0, 0, 0), -1)
     cv2.putText(frame, status, (10, 35),
                 cv2.FONT_HERSHEY_SIMPLEX, 0.65, color, 2)
 
-    progress = navigator.current_step / max(len(navigator.route)-1, 1)
+    progress = navigator.progress()
     bar_w    = int(w * progress)
     cv2.rectangle(frame, (0, 60), (w, 80),     (50, 50, 50), -1)
     cv2.rectangle(frame, (0, 60), (bar_w, 80), (0, 255, 0),  -1)
@@ -374,11 +672,33 @@ def draw_overlay(frame, ocr_results, navigator, detected):
 
     return frame
 
+# ── Cached HUD ─────────────────────────────────────────────────────────────
+# Same picture as draw_overlay + draw_minimap, but the navigator-dependent
+# parts are only re-rasterized when the navigator state changes.
+HUD = HUDCache()
+
+def draw_hud(frame, ocr_results, navigator, detected):
+    draw_ocr_boxes(frame, ocr_results)
+    key = (id(navigator), navigator.revision, navigator.current_step, navigator.completed,
+           navigator.current_floor, navigator.last_instruction, detected)
+    return HUD.composite(frame, key, lambda canvas: draw_minimap(
+        draw_overlay(canvas, [], navigator, detected), navigator))
+
 # ── Main ───────────────────────────────────────────────────────────────────
 def main():
+    # Everything heavy loads in the background while the user picks
+    for component in (REGISTRY, SIGN_MATCHER, SIGN_FUZZY, memory, PREFETCHER):
+        component.warm()
+    if OCR_EXECUTION != "process":
+        print("🔤 Loading OCR in the background...")
+        reader.warm()
+
     destination       = select_destination()
-    route, floor_type = build_route(destination)
+    chosen            = time.perf_counter()
+    route, floor_type, floors = build_route(destination)
     print(f"\n📍 Full Route: {' → '.join(route)}")
+    if USE_LLAMA:
+        PREFETCHER.get().prefetch(route_legs(route, floors))
 
     cap = cv2.VideoCapture(CAMERA_INDEX)
     if not cap.isOpened():
@@ -386,29 +706,64 @@ def main():
         return
 
     print("✅ Camera opened!")
-    nav          = Navigator(route, floor_type)
-    frame_count  = 0
+    nav          = Navigator(route, floor_type, floors, route_graph(floors))
+    ocr_reader   = reader.get() if OCR_EXECUTION != "process" else None
+    ocr          = create_ocr_worker(OCR_EXECUTION, ocr_reader, OCR_WORKERS,
+                                     gpu=ocr_gpu(), regions=OCR_REGIONS)
+    gate         = FrameGate(FRAME_GATE) if FRAME_GATE else None
+    sched        = OCRScheduler(route_leg_pixels(route, floors),
+                                cpu_budget=OCR_CPU_BUDGET, latency_slo=OCR_LATENCY_SLO)
     ocr_results  = []
     last_matched = None
+    first_frame  = True
+    revision     = nav.revision
 
     while True:
-        ret, frame = cap.read()
+        frame_start = METRICS.start()
+        ret, frame  = cap.read()
         if not ret:
             break
-        frame_count += 1
 
-        if frame_count % 5 == 0:
-            results     = reader.readtext(frame)
+        # Inline OCR blocks the loop; a worker hands back the newest result
+        # whenever one is ready and never stalls the display.
+        ocr_due = sched.due(frame, nav.current_step) and (gate is None or gate.changed(frame))
+        results = None
+        if not ocr_due:
+            METRICS.count("ocr_skipped")
+        if ocr is None:
+            if ocr_due:
+                start   = time.perf_counter()
+                results = ocr_reader.readtext(frame)
+                elapsed = time.perf_counter() - start
+                sched.record_latency(elapsed)
+                METRICS.observe("readtext", elapsed)
+        else:
+            if ocr_due:
+                ocr.submit(frame)
+            results = ocr.poll()
+            if results is not None:
+                sched.record_latency(ocr.latency)
+                METRICS.observe("readtext", ocr.latency)
+
+        if results is not None:
             ocr_results = results
-            texts       = [(r[1], r[2]) for r in results]
-            node, text, conf = match_text(texts)
+            node        = handle_ocr_results(results, nav)
             if node:
                 last_matched = node
-                nav.update(node)
+            if nav.revision != revision:
+                revision = nav.revision
+                sched.set_route(route_leg_pixels(nav.route, nav.floors))
 
-        frame = draw_overlay(frame, ocr_results, nav, last_matched)
-        frame = draw_minimap(frame, nav)
+        start = METRICS.start()
+        frame = draw_hud(frame, ocr_results, nav, last_matched)
+        METRICS.stop("draw_hud", start)
         cv2.imshow("NaviGrid - Full Navigation", frame)
+        METRICS.end_frame(frame_start)
+        if first_frame:
+            first_frame = False
+            ttff        = time.perf_counter() - chosen
+            METRICS.observe("first_frame", ttff)
+            print(f"⏱️  First frame {ttff:.2f}s after choosing the destination")
 
         if cv2.waitKey(1) & 0xFF == ord("q"):
             break
@@ -416,8 +771,16 @@ def main():
             cv2.waitKey(3000)
             break
 
+    if ocr is not None:
+        ocr.close()
+    if gate is not None:
+        print(f"📊 OCR: {gate.executed} run, {gate.skipped} skipped on unchanged frames")
     cap.release()
     cv2.destroyAllWindows()
+    PREFETCHER.close()
+    SIGN_MAP.close()
+    memory.close()
+    METRICS.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,140 @@
+import re
+import numpy as np
+from collections import Counter
+
+# ── Config ─────────────────────────────────────────────────────────────────
+# Characters EasyOCR mixes up, in groups. Swapping within a group is cheap;
+# every other edit costs EDIT_COST.
+CONFUSABLE     = ["o0", "il1|!", "s5$", "b8", "z2", "g69"]
+CONFUSION_COST = 0.3
+EDIT_COST      = 1.0
+COST_RATIO     = 0.2      # budget per key character ("045" → 0.6: confusions only)
+MAX_COST       = 2.0      # budget cap for long keys
+MIN_KEY        = 3        # shorter keys only ever match exactly
+GRAM           = 2
+
+_SPACE = re.compile(r"\s+")
+_FOLD  = str.maketrans({ch: group[0] for group in CONFUSABLE for ch in group})
+
+# ── Normalization ──────────────────────────────────────────────────────────
+# OCR splits and merges words freely, so whitespace is dropped. `folded`
+# replaces every confusable character with its group's first member; the
+# two strings stay aligned character for character.
+def normalize(text):
+    lowered = _SPACE.sub("", text.lower())
+    return lowered, lowered.translate(_FOLD)
+
+def grams(folded):
+    return {folded[i:i + GRAM] for i in range(len(folded) - GRAM + 1)}
+
+# ── Approximate substring distance ─────────────────────────────────────────
+# Cheapest way to turn `key` into some substring of `text` (free start and
+# end in the text, like `key in text`), with confusion-aware substitution
+# costs. Gives up with inf as soon as a whole row exceeds `budget`.
+def substring_cost(key, key_folded, text, text_folded, budget=float("inf")):
+    n    = len(text)
+    prev = [0.0] * (n + 1)
+    for i in range(len(key)):
+        a, af = key[i], key_folded[i]
+        cur   = [prev[0] + EDIT_COST]
+        best  = cur[0]
+        for j in range(n):
+            if a == text[j]:
+                sub = prev[j]
+            elif af == text_folded[j]:
+                sub = prev[j] + CONFUSION_COST
+            else:
+                sub = prev[j] + EDIT_COST
+            c = min(sub, prev[j + 1] + EDIT_COST, cur[j] + EDIT_COST)
+            cur.append(c)
+            if c < best:
+                best = c
+        if best > budget:
+            return float("inf")
+        prev = cur
+    return min(prev)
+
+# ── Fuzzy sign matcher ─────────────────────────────────────────────────────
+# Bigram index over the folded sign map keys. A key within k real edits of
+# part of the text shares all but at most k × GRAM of its distinct bigrams
+# with it (confusions fold away and cost none), so counting shared bigrams
+# over the posting lists leaves a few candidates; only those pay for the
+# full distance. Same add()/match() interface as SignMatcher.
+class FuzzyMatcher:
+    def __init__(self, sign_map=None, ratio=COST_RATIO, max_cost=MAX_COST):
+        self.ratio     = ratio
+        self.max_cost  = max_cost
+        self._ids      = {}        # lowered key → key id
+        self._keys     = []        # key id → (lowered, folded, budget, edits)
+        self._chars    = []        # key id → Counter of folded characters
+        self._need     = []        # key id → bigrams the text must share
+        self._values   = []        # key id → node id
+        self._postings = {}        # bigram → key ids
+        self._arrays   = None      # the same as numpy arrays, rebuilt after add()
+        for key, node_id in (sign_map or {}).items():
+            self.add(key, node_id)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, key, node_id):
+        lowered, folded = normalize(key)
+        if len(lowered) < MIN_KEY:
+            return
+        if lowered in self._ids:
+            self._values[self._ids[lowered]] = node_id
+            return
+
+        kid    = len(self._keys)
+        budget = min(self.max_cost, self.ratio * len(lowered))
+        edits  = int(budget / EDIT_COST + 1e-9)
+        keyset = grams(folded)
+        need   = len(keyset) - edits * GRAM
+        self._ids[lowered] = kid
+        self._keys.append((lowered, folded, budget, edits))
+        self._chars.append(Counter(folded))
+        self._need.append(need)
+        self._values.append(node_id)
+        for g in keyset:
+            self._postings.setdefault(g, []).append(kid)
+        self._arrays = None
+
+    def search(self, text):
+        # Every key within its budget: [(cost, key, node id)], cheapest first
+        lowered, folded = normalize(text)
+        if not lowered:
+            return []
+
+        if self._arrays is None:
+            self._arrays = ({g: np.array(ids) for g, ids in self._postings.items()},
+                            np.array(self._need))
+        postings, need = self._arrays
+        hits   = [postings[g] for g in grams(folded) if g in postings]
+        counts = np.bincount(np.concatenate(hits), minlength=len(need)) if hits \
+                 else np.zeros(len(need), dtype=np.int64)
+        cands  = np.flatnonzero(counts >= need).tolist()
+
+        # Each key character the text lacks costs a real edit: a cheap bound
+        # that rejects most bigram candidates before the full distance
+        chars = Counter(folded)
+        found = []
+        for kid in cands:
+            key, key_folded, budget, edits = self._keys[kid]
+            if len(key) - len(lowered) > edits or \
+               sum((self._chars[kid] - chars).values()) > edits:
+                continue
+            cost = substring_cost(key, key_folded, lowered, folded, budget)
+            if cost <= budget:
+                found.append((round(cost, 6), key, self._values[kid]))
+        found.sort()
+        return found
+
+    def match(self, text):
+        # Node id of the cheapest key, or None when nothing is close enough
+        # or the cheapest keys disagree about the node
+        found = self.search(text)
+        if not found:
+            return None
+        best  = found[0][0]
+        nodes = {node_id for cost, _, node_id in found if cost == best}
+        return found[0][2] if len(nodes) == 1 else None
@@ -0,0 +1,74 @@
+import cv2
+import numpy as np
+
+# ── Config ─────────────────────────────────────────────────────────────────
+MERGE_SLACK = 0.25    # share of a composite rectangle allowed to be untouched
+
+# ── Cached HUD layer ───────────────────────────────────────────────────────
+# The status bar, progress bar, instruction text and minimap only change
+# when the navigator does, so they are rendered once per state into a layer
+# and composited onto every frame.
+#
+# The layer is captured by running the normal draw functions on a black and
+# on a white canvas: where both agree the HUD is opaque, where they differ
+# by 255 it is untouched, and anything in between is the minimap's blend.
+# With B the black render and T = white − black,
+#
+#     out = frame · T / 255 + B
+#
+# reproduces every rectangle, text and addWeighted blend exactly, without
+# the draw functions knowing about layers at all.
+class HUDCache:
+    def __init__(self):
+        self.builds   = 0
+        self._key     = None
+        self._shape   = None
+        self._premult = None   # black render: alpha-premultiplied colour
+        self._trans   = None   # white − black: per-channel transmission
+        self._buf     = None
+        self._rects   = []     # (y1, y2, x1, x2, opaque) areas the HUD touches
+
+    def _build(self, shape, draw):
+        black = draw(np.zeros(shape, dtype=np.uint8))
+        white = draw(np.full(shape, 255, dtype=np.uint8))
+        self._premult = black
+        self._trans   = cv2.subtract(white, black)
+        self._buf     = np.empty(shape, dtype=np.uint8)
+        self._shape   = shape
+        self.builds  += 1
+
+        # Composite only the rectangles the HUD covers. Each row's touched
+        # column range starts its own band; neighbouring bands are merged
+        # while their union wastes less than MERGE_SLACK of its area, so a
+        # line of text becomes one rectangle instead of one per pixel row.
+        touched = (self._trans != 255).any(axis=2)
+        rects, used = [], []
+        for y in np.flatnonzero(touched.any(axis=1)).tolist():
+            xs     = np.flatnonzero(touched[y])
+            x1, x2 = int(xs[0]), int(xs[-1]) + 1
+            if rects and rects[-1][1] == y:
+                ry1, _, rx1, rx2 = rects[-1]
+                ux1, ux2 = min(rx1, x1), max(rx2, x2)
+                if used[-1] + x2 - x1 >= (1 - MERGE_SLACK) * (y + 1 - ry1) * (ux2 - ux1):
+                    rects[-1] = (ry1, y + 1, ux1, ux2)
+                    used[-1] += x2 - x1
+                    continue
+            rects.append((y, y + 1, x1, x2))
+            used.append(x2 - x1)
+        # Fully opaque rectangles (the bars) are a plain copy
+        self._rects = [(y1, y2, x1, x2, not self._trans[y1:y2, x1:x2].any())
+                       for y1, y2, x1, x2 in rects]
+
+    def composite(self, frame, key, draw):
+        if key != self._key or frame.shape != self._shape:
+            self._build(frame.shape, draw)
+            self._key = key
+        for y1, y2, x1, x2, opaque in self._rects:
+            roi = frame[y1:y2, x1:x2]
+            if opaque:
+                roi[:] = self._premult[y1:y2, x1:x2]
+                continue
+            buf = self._buf[y1:y2, x1:x2]
+            cv2.multiply(roi, self._trans[y1:y2, x1:x2], dst=buf, scale=1 / 255)
+            cv2.add(buf, self._premult[y1:y2, x1:x2], dst=roi)
+        return frame
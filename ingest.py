@@ -0,0 +1,188 @@
+import os
+import csv
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PIL import Image, ImageDraw
+
+# ── Config ─────────────────────────────────────────────────────────────────
+IMAGE_EXTS      = (".jpg", ".jpeg", ".png", ".webp", ".bmp", ".tif", ".tiff")
+CSV_SUFFIX      = "_annotations"
+NODES_SUFFIX    = "_nodes.json"
+VIS_SUFFIX      = "_nodes_output.png"
+MANIFEST_NAME   = "ingest_manifest.json"
+WORKERS         = os.cpu_count() or 1
+
+# ── Image size from the header ─────────────────────────────────────────────
+# Image.open only parses the header; the pixel data is never decoded unless
+# a visualization is asked for.
+def image_size(image_path):
+    with Image.open(image_path) as img:
+        return img.size
+
+# ── Annotations → nodes ────────────────────────────────────────────────────
+# Each CSV row is one annotated box, in the coordinates of the image it was
+# drawn on (image_width × image_height); boxes are scaled to the real image
+# and the box centre becomes the node position.
+def load_nodes(csv_path, image_path, floor=None, verbose=False, size=None):
+    nodes  = []
+    aw, ah = size or image_size(image_path)
+
+    with open(csv_path, "r", newline="") as f:
+        rows   = csv.reader(f)
+        header = next(rows, None)
+        if header is None:
+            return nodes
+        col = {name.strip(): i for i, name in enumerate(header)}
+        c_id, c_x, c_y, c_w, c_h, c_iw, c_ih = (col[k] for k in (
+            "label_name", "bbox_x", "bbox_y", "bbox_width", "bbox_height",
+            "image_width", "image_height"))
+
+        for row in rows:
+            if not row:
+                continue
+            sx = aw / int(row[c_iw])
+            sy = ah / int(row[c_ih])
+
+            x  = int(int(row[c_x]) * sx)
+            y  = int(int(row[c_y]) * sy)
+            w  = int(int(row[c_w]) * sx)
+            h  = int(int(row[c_h]) * sy)
+            cx = x + w // 2
+            cy = y + h // 2
+
+            node = {
+                "id":   row[c_id],
+                "x":    cx,
+                "y":    cy,
+                "x1":   x,
+                "y1":   y,
+                "x2":   x + w,
+                "y2":   y + h,
+            }
+            if floor is not None:
+                node["floor"] = floor
+            nodes.append(node)
+            if verbose:
+                print(f"  ✅ Node: {node['id']} → ({cx}, {cy})")
+
+    return nodes
+
+# ── Visualize nodes on image ───────────────────────────────────────────────
+def draw_nodes(draw, nodes):
+    for node in nodes:
+        cx, cy          = node["x"], node["y"]
+        x1, y1, x2, y2 = node["x1"], node["y1"], node["x2"], node["y2"]
+
+        # Draw box
+        draw.rectangle([x1, y1, x2, y2],
+                       fill=(52, 152, 219, 60),
+                       outline=(52, 152, 219, 255), width=3)
+        # Draw center dot
+        draw.ellipse([cx-10, cy-10, cx+10, cy+10],
+                     fill=(231, 76, 60, 255))
+        # Draw label
+        draw.rectangle([x1, y1-22, x1+len(node["id"])*8, y1],
+                       fill=(52, 152, 219, 200))
+        draw.text((x1+4, y1-20), node["id"], fill="white")
+
+def visualize(image_path, nodes, output_path, show=False):
+    img = Image.open(image_path).convert("RGB")
+    draw_nodes(ImageDraw.Draw(img, "RGBA"), nodes)
+    img.save(output_path)
+    if show:
+        img.show()
+
+# ── One floor ──────────────────────────────────────────────────────────────
+# Writes {"nodes": [...], "edges": []} for edges.py to fill in. Runs in a
+# worker process, so it returns a small summary instead of printing.
+def ingest_floor(csv_path, image_path, out_path, floor=None, vis_path=None,
+                 show=False, verbose=False):
+    start         = time.perf_counter()
+    width, height = image_size(image_path)
+    nodes         = load_nodes(csv_path, image_path, floor, verbose, (width, height))
+
+    with open(out_path, "w") as f:
+        json.dump({"nodes": nodes, "edges": []}, f, indent=4)
+    if vis_path:
+        visualize(image_path, nodes, vis_path, show)
+
+    return {"floor":   floor,
+            "csv":     csv_path,
+            "image":   image_path,
+            "nodes":   out_path,
+            "width":   width,
+            "height":  height,
+            "count":   len(nodes),
+            "seconds": round(time.perf_counter() - start, 4)}
+
+# ── Floor discovery ────────────────────────────────────────────────────────
+# Every `<floor>_annotations.csv` under the input directory is one floor.
+# Its plan is the image named `<floor>.*` next to it, or else the only image
+# in that directory.
+def find_floors(root):
+    floors = []
+    for dirpath, _, names in os.walk(root):
+        images = sorted(n for n in names if n.lower().endswith(IMAGE_EXTS))
+        stems  = {os.path.splitext(n)[0]: n for n in images}
+        for name in sorted(names):
+            stem, ext = os.path.splitext(name)
+            if ext.lower() != ".csv":
+                continue
+            floor = stem[:-len(CSV_SUFFIX)] if stem.endswith(CSV_SUFFIX) else stem
+            image = stems.get(floor) or (images[0] if len(images) == 1 else None)
+            if image is None:
+                print(f"⚠️  No floorplan image for {os.path.join(dirpath, name)}, skipping")
+                continue
+            floors.append((floor, os.path.join(dirpath, name), os.path.join(dirpath, image)))
+    return floors
+
+# ── Bulk ingestion ─────────────────────────────────────────────────────────
+def ingest(root, out_dir, workers=WORKERS, visualize_nodes=False):
+    floors = find_floors(root)
+    os.makedirs(out_dir, exist_ok=True)
+    ids = [floor for floor, _, _ in floors]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"Duplicate floor names under {root}: {sorted(ids)}")
+    print(f"📐 Ingesting {len(floors)} floor(s) with {workers} worker(s)...")
+
+    start, manifest, failed = time.perf_counter(), {}, 0
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {}
+        for floor, csv_path, image_path in floors:
+            out_path = os.path.join(out_dir, floor + NODES_SUFFIX)
+            vis_path = os.path.join(out_dir, floor + VIS_SUFFIX) if visualize_nodes else None
+            futures[pool.submit(ingest_floor, csv_path, image_path, out_path,
+                                floor, vis_path)] = floor
+        for future in as_completed(futures):
+            floor = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"  ❌ {floor}: {e}")
+                continue
+            manifest[floor] = summary
+            print(f"  ✅ {floor}: {summary['count']} nodes ({summary['seconds']:.3f}s)")
+
+    with open(os.path.join(out_dir, MANIFEST_NAME), "w") as f:
+        json.dump({"floors": dict(sorted(manifest.items()))}, f, indent=4)
+
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ {len(manifest)} floor(s), {sum(s['count'] for s in manifest.values())} nodes "
+          f"in {elapsed:.2f}s → {out_dir}" + (f"  ❌ {failed} failed" if failed else ""))
+    return manifest
+
+# ── Main ───────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="NaviGrid bulk floorplan ingestion")
+    parser.add_argument("root",        help="directory of floorplans + annotation CSVs")
+    parser.add_argument("--out",       default="nodes", help="output directory")
+    parser.add_argument("--workers",   type=int, default=WORKERS)
+    parser.add_argument("--visualize", action="store_true", help="also render <floor>" + VIS_SUFFIX)
+    args = parser.parse_args()
+    ingest(args.root, args.out, args.workers, args.visualize)
+
+if __name__ == "__main__":
+    main()
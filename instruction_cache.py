@@ -0,0 +1,140 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from persistence import JournaledStore
+
+# Bump whenever the LLaMA prompt changes so stale instructions are not reused
+PROMPT_VERSION = 1
+
+# ── Persistent LRU cache ───────────────────────────────────────────────────
+# Entries live in a JournaledStore as {"instruction": ..., "used": tick};
+# the tick restores LRU order on the next start.
+class InstructionCache:
+    def __init__(self, path, max_entries=512):
+        self.max_entries = max_entries
+        self.hits        = 0
+        self.misses      = 0
+        self._store      = JournaledStore(path)
+        self._lock       = threading.Lock()
+        entries          = sorted(self._store.items(), key=lambda kv: kv[1]["used"])
+        self._lru        = OrderedDict((k, v["instruction"]) for k, v in entries)
+        self._tick       = entries[-1][1]["used"] if entries else 0
+        self._evict()
+
+    @staticmethod
+    def key(building, current, next_node, floor):
+        return f"{building}|v{PROMPT_VERSION}|{floor}|{current}→{next_node}"
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._lru
+
+    def get(self, key):
+        with self._lock:
+            instruction = self._lru.get(key)
+            if instruction is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._lru.move_to_end(key)
+            self._touch(key, instruction)
+            return instruction
+
+    def put(self, key, instruction):
+        with self._lock:
+            self._lru[key] = instruction
+            self._lru.move_to_end(key)
+            self._touch(key, instruction)
+            self._evict()
+
+    def _touch(self, key, instruction):
+        self._tick += 1
+        self._store.set(key, {"instruction": instruction, "used": self._tick})
+
+    def _evict(self):
+        while len(self._lru) > self.max_entries:
+            key, _ = self._lru.popitem(last=False)
+            self._store.delete(key)
+
+    def close(self):
+        self._store.close()
+
+# ── Route prefetcher ───────────────────────────────────────────────────────
+# Generates every leg of a route in the background, nearest leg first, so
+# reaching a node is a cache lookup instead of a blocking model call.
+# `generate(current, next_node, floor, progress, on_text)` calls on_text, when
+# given, with the instruction so far as the model writes it.
+class InstructionPrefetcher:
+    def __init__(self, cache, generate, building):
+        self.cache     = cache
+        self.generate  = generate
+        self.building  = building
+        self._executor = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix="llama-prefetch")
+        self._streamer = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix="llama-stream")
+        self._inflight = {}
+        self._lock     = threading.Lock()
+
+    def prefetch(self, legs):
+        for current, next_node, floor, progress in legs:
+            key = self.cache.key(self.building, current, next_node, floor)
+            with self._lock:
+                if key in self.cache or key in self._inflight:
+                    continue
+                self._inflight[key] = self._executor.submit(
+                    self._fill, key, current, next_node, floor, progress)
+
+    def _fill(self, key, current, next_node, floor, progress, on_text=None):
+        try:
+            instruction = self.generate(current, next_node, floor, progress, on_text)
+            self.cache.put(key, instruction)
+            return instruction
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def instruction(self, current, next_node, floor, progress):
+        key    = self.cache.key(self.building, current, next_node, floor)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Already being generated: waiting is never slower than starting over
+        with self._lock:
+            future = self._inflight.get(key)
+        if future is not None:
+            return future.result()
+
+        instruction = self.generate(current, next_node, floor, progress)
+        self.cache.put(key, instruction)
+        return instruction
+
+    def stream(self, current, next_node, floor, progress, on_text):
+        # instruction() without blocking: returns a future of the instruction
+        # and hands on_text each longer prefix of it as it is generated
+        key    = self.cache.key(self.building, current, next_node, floor)
+        cached = self.cache.get(key)
+        if cached is not None:
+            on_text(cached)
+            future = Future()
+            future.set_result(cached)
+            return future
+
+        # A leg still queued behind other prefetches is taken over rather
+        # than waited for; one already running is shown when it finishes
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None or future.cancel():
+                future = self._inflight[key] = self._streamer.submit(
+                    self._fill, key, current, next_node, floor, progress, on_text)
+                return future
+        future.add_done_callback(
+            lambda f: f.cancelled() or f.exception() or on_text(f.result()))
+        return future
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._streamer.shutdown(wait=False, cancel_futures=True)
+        self.cache.close()
@@ -0,0 +1,59 @@
+import threading
+
+# ── Lazily built component ─────────────────────────────────────────────────
+# Wraps a zero-argument factory so nothing heavy (OCR model, nodemaps,
+# journaled stores) happens at import time. get() builds on first use;
+# warm() starts building on a daemon thread so the wait overlaps with
+# something else, e.g. the destination prompt, and a later get() only waits
+# for whatever is left. A failed build is re-raised from get().
+class Lazy:
+    def __init__(self, factory, name=None):
+        self.factory = factory
+        self.name    = name or getattr(factory, "__name__", "component")
+        self._lock   = threading.Lock()
+        self._value  = None
+        self._error  = None
+        self._done   = False
+        self._thread = None
+
+    def get(self):
+        if self._done:
+            return self._unwrap()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+            return self._unwrap()
+        self._build()
+        return self._unwrap()
+
+    def warm(self):
+        with self._lock:
+            if self._done or self._thread is not None:
+                return self
+            self._thread = threading.Thread(target=self._build, name=f"warm-{self.name}",
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def loaded(self):
+        return self._done and self._error is None
+
+    def close(self):
+        # Only closes what was actually built
+        if self.loaded() and hasattr(self._value, "close"):
+            self._value.close()
+
+    def _build(self):
+        with self._lock:
+            if self._done:
+                return
+            try:
+                self._value = self.factory()
+            except Exception as e:
+                self._error = e
+            self._done = True
+
+    def _unwrap(self):
+        if self._error is not None:
+            raise self._error
+        return self._value
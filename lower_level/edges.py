@@ -1,50 +1,44 @@
 import json
-from PIL import Image, ImageDraw
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from nodemap_binary import compile_nodemap_file
+from edge_builder import build_edges, visualize
+from corridor_skeleton import geodesic_edges
+
+# ── Config ─────────────────────────────────────────────────────────────────
+IMAGE_PATH = r"C:\Users\adity\Downloads\navigrid\navigrid\lower_level.jpg"
+EXTRA      = []          # hand edges the geometry cannot see, e.g. ["entrance", "stairs"]
+VISUALIZE  = False       # render (and show) edges_output.png
+GEODESIC   = True        # walking distance along the corridors, not straight lines
 
 # ── Load nodes from nodes.json ─────────────────────────────────────────────
 with open("nodes.json", "r") as f:
     data = json.load(f)
 
-nodes    = data["nodes"]
-node_map = {n["id"]: n for n in nodes}
-
-# ── Define edges from entrance to every node ───────────────────────────────
-EDGES = [
-    ["entrance", "room_045"],
-    ["entrance", "room_040"],
-    ["entrance", "elevator"],
-    ["entrance", "stairs"],
-    ["entrance", "room_025"],
-    ["entrance", "room_010"]
-]
+nodes = data["nodes"]
 
 # ── Build edges ────────────────────────────────────────────────────────────
-built_edges = []
-for edge in EDGES:
-    n1 = node_map.get(edge[0])
-    n2 = node_map.get(edge[1])
-    if n1 and n2:
-        dx   = n1["x"] - n2["x"]
-        dy   = n1["y"] - n2["y"]
-        dist = round((dx**2 + dy**2) ** 0.5, 1)
-        built_edges.append({"from": edge[0], "to": edge[1], "dist": dist})
-        print(f"  ✅ {edge[0]} ──► {edge[1]} ({dist}px)")
-
-# ── Visualize ──────────────────────────────────────────────────────────────
-img  = Image.open("nodes_output.png").convert("RGB")
-draw = ImageDraw.Draw(img, "RGBA")
-
+# Corridor graph derived from the node layout (see edge_builder.py)
+built_edges = build_edges(nodes, extra=EXTRA)
+if GEODESIC:
+    built_edges, unreached = geodesic_edges(IMAGE_PATH, nodes, built_edges)
+    if unreached:
+        print(f"  ⚠️  {unreached} edge(s) off the corridor skeleton keep straight-line dist")
 for edge in built_edges:
-    n1 = node_map[edge["from"]]
-    n2 = node_map[edge["to"]]
-    draw.line([(n1["x"], n1["y"]), (n2["x"], n2["y"])],
-              fill=(46, 204, 113, 220), width=3)
+    print(f"  ✅ {edge['from']} ──► {edge['to']} ({edge['dist']}px)")
 
-img.save("edges_output.png")
-img.show()
-print("✅ Saved edges_output.png")
+# ── Visualize ──────────────────────────────────────────────────────────────
+if VISUALIZE:
+    visualize(IMAGE_PATH, nodes, built_edges, "edges_output.png", show=True)
+    print("✅ Saved edges_output.png")
 
 # ── Save final map ─────────────────────────────────────────────────────────
 with open("nodemap.json", "w") as f:
     json.dump({"nodes": nodes, "edges": built_edges}, f, indent=4)
-print("✅ Saved nodemap.json")
\ No newline at end of file
+print("✅ Saved nodemap.json")
+
+# Memory-mapped twin for fast cold start (JSON stays the fallback)
+compile_nodemap_file("nodemap.json")
+print("✅ Compiled nodemap.ngm")
\ No newline at end of file
@@ -1,11 +1,29 @@
 import cv2
-import easyocr
 import json
 import time
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ocr_worker import create_ocr_worker, detect_gpu
+from frame_gate import FrameGate
+from ocr_scheduler import OCRScheduler, leg_distances
+from metrics import create_metrics
+from lazy import Lazy
 
 # ── Config ─────────────────────────────────────────────────────────────────
-NODEMAP_PATH = "nodemap_final.json"
-CAMERA_INDEX = 0
+NODEMAP_PATH  = "nodemap_final.json"
+CAMERA_INDEX  = 0
+OCR_EXECUTION = "thread"   # "inline", "thread" or "process"
+OCR_WORKERS   = 1          # process mode defaults to one per core
+OCR_GPU       = None       # None: use CUDA when torch can see a GPU
+FRAME_GATE    = "mad"      # skip OCR on unchanged frames: "mad", "dhash" or None
+OCR_BUDGET    = 0.5        # cores' worth of OCR time on average
+OCR_SLO       = None       # or seconds from sign in view to OCR result
+METRICS_PROM  = None       # Prometheus text file, e.g. "navigrid_lower.prom"
+METRICS_TRACE = None       # per-frame JSONL latency trace
+
+METRICS = create_metrics(METRICS_PROM, METRICS_TRACE)
 
 # ── Route from entrance ────────────────────────────────────────────────────
 ROUTE = [
@@ -39,15 +57,27 @@ SIGN_MAP = {
 }
 
 # ── Load nodemap ───────────────────────────────────────────────────────────
-with open("nodemap_final.json", "r") as f:
-    data = json.load(f)
-nodes = {n["id"]: n for n in data["nodes"]}
-print(f"✅ Loaded {len(nodes)} nodes")
+def load_nodes():
+    with open(NODEMAP_PATH, "r") as f:
+        data = json.load(f)
+    nodes = {n["id"]: n for n in data["nodes"]}
+    print(f"✅ Loaded {len(nodes)} nodes")
+    return nodes
+
+nodes = Lazy(load_nodes)
 
 # ── Initialize OCR ─────────────────────────────────────────────────────────
-print("🔤 Loading OCR...")
-reader = easyocr.Reader(["en"], gpu=True)
-print("✅ OCR ready")
+def ocr_gpu():
+    return detect_gpu() if OCR_GPU is None else OCR_GPU
+
+def load_reader():
+    import easyocr
+    gpu    = ocr_gpu()
+    reader = easyocr.Reader(["en"], gpu=gpu, verbose=False)
+    print(f"✅ OCR ready ({'GPU' if gpu else 'CPU'})")
+    return reader
+
+reader = Lazy(load_reader, "reader")
 
 # ── Match OCR text to node ─────────────────────────────────────────────────
 def match_text(texts):
@@ -205,6 +235,13 @@ def draw_overlay(frame, ocr_results, navigator, detected_node):
 
 # ── Main ───────────────────────────────────────────────────────────────────
 def main():
+    # The model loads while the camera opens
+    launched = time.perf_counter()
+    nodes.warm()
+    if OCR_EXECUTION != "process":
+        print("🔤 Loading OCR in the background...")
+        reader.warm()
+
     cap = cv2.VideoCapture(CAMERA_INDEX)
     if not cap.isOpened():
         print("❌ Cannot open camera!")
@@ -212,37 +249,78 @@ def main():
 
     print("✅ Camera opened!")
     nav         = Navigator()
-    frame_count = 0
+    ocr_reader  = reader.get() if OCR_EXECUTION != "process" else None
+    ocr         = create_ocr_worker(OCR_EXECUTION, ocr_reader, OCR_WORKERS, gpu=ocr_gpu())
+    gate        = FrameGate(FRAME_GATE) if FRAME_GATE else None
+    node_map    = nodes.get()
+    points      = [(node_map[n]["x"], node_map[n]["y"]) if n in node_map else None
+                   for n in ROUTE]
+    sched       = OCRScheduler(leg_distances(points),
+                               cpu_budget=OCR_BUDGET, latency_slo=OCR_SLO)
     ocr_results = []
     detected    = None
+    first_frame = True
 
     while True:
-        ret, frame = cap.read()
+        frame_start = METRICS.start()
+        ret, frame  = cap.read()
         if not ret:
             break
 
-        frame_count += 1
-
-        # Run OCR every 5 frames
-        if frame_count % 5 == 0:
-            results  = reader.readtext(frame)
+        # Run OCR when the scheduler says so, off the display loop unless inline
+        ocr_due = sched.due(frame, nav.current_step) and (gate is None or gate.changed(frame))
+        results = None
+        if not ocr_due:
+            METRICS.count("ocr_skipped")
+        if ocr is None:
+            if ocr_due:
+                start   = time.perf_counter()
+                results = ocr_reader.readtext(frame)
+                elapsed = time.perf_counter() - start
+                sched.record_latency(elapsed)
+                METRICS.observe("readtext", elapsed)
+        else:
+            if ocr_due:
+                ocr.submit(frame)
+            results = ocr.poll()
+            if results is not None:
+                sched.record_latency(ocr.latency)
+                METRICS.observe("readtext", ocr.latency)
+
+        if results is not None:
             ocr_results = results
+            start    = METRICS.start()
             texts    = [(r[1], r[2]) for r in results]
             node, text, conf = match_text(texts)
+            METRICS.stop("match_text", start)
 
             if node:
+                METRICS.count("sign_match")
                 detected = node
                 nav.update(node)
 
         # Draw overlay
+        start = METRICS.start()
         frame = draw_overlay(frame, ocr_results, nav, detected)
+        METRICS.stop("draw_overlay", start)
         cv2.imshow("NaviGrid Navigation", frame)
+        METRICS.end_frame(frame_start)
+        if first_frame:
+            first_frame = False
+            ttff        = time.perf_counter() - launched
+            METRICS.observe("first_frame", ttff)
+            print(f"⏱️  First frame {ttff:.2f}s after start")
 
         if cv2.waitKey(1) & 0xFF == ord("q"):
             break
 
+    if ocr is not None:
+        ocr.close()
+    if gate is not None:
+        print(f"📊 OCR: {gate.executed} run, {gate.skipped} skipped on unchanged frames")
     cap.release()
     cv2.destroyAllWindows()
+    METRICS.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import atexit
+import bisect
+
+# ── Config ─────────────────────────────────────────────────────────────────
+PREFIX          = "navigrid"
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)   # seconds
+EXPORT_EVERY    = 30      # frames between Prometheus file rewrites
+
+# ── Latency histogram ──────────────────────────────────────────────────────
+# Cumulative buckets the way Prometheus wants them: counts[i] holds the
+# observations <= buckets[i] not already in an earlier bucket; the last slot
+# is +Inf.
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts  = [0] * (len(buckets) + 1)
+        self.sum     = 0.0
+        self.count   = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum   += value
+        self.count += 1
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation
+        rank, seen = q * self.count, 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+# ── Metrics registry ───────────────────────────────────────────────────────
+# Hot-path use:
+#   start = METRICS.start(); ...; METRICS.stop("readtext", start)
+#   METRICS.count("ocr_skipped")
+#   METRICS.end_frame(frame_start)
+# Histograms export as <prefix>_<name>_seconds, counters as <prefix>_<name>_total.
+# The per-frame JSONL trace has one line per end_frame with every latency
+# (ms) and counter increment recorded during that frame.
+class Metrics:
+    enabled = True
+
+    def __init__(self, prometheus_path=None, trace_path=None, export_every=EXPORT_EVERY,
+                 prefix=PREFIX):
+        self.prometheus_path = prometheus_path
+        self.export_every    = export_every
+        self.prefix          = prefix
+        self.histograms      = {}
+        self.counters        = {}
+        self.frames          = 0
+        self._frame          = {}
+        self._trace          = open(trace_path, "a") if trace_path else None
+        self._closed         = False
+        atexit.register(self.close)
+
+    def start(self):
+        return time.perf_counter()
+
+    def stop(self, name, start):
+        self.observe(name, time.perf_counter() - start)
+
+    def observe(self, name, seconds):
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms[name] = Histogram()
+        hist.observe(seconds)
+        self._frame[f"{name}_ms"] = round(seconds * 1000, 3)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+        self._frame[name]   = self._frame.get(name, 0) + n
+
+    def end_frame(self, start):
+        self.stop("frame", start)
+        self.frames += 1
+        if self._trace is not None:
+            self._trace.write(json.dumps({"frame": self.frames,
+                                          "t":     round(time.time(), 3),
+                                          **self._frame}) + "\n")
+        self._frame = {}
+        if self.prometheus_path and self.frames % self.export_every == 0:
+            self.export()
+
+    def snapshot(self):
+        return {
+            "frames":     self.frames,
+            "counters":   dict(self.counters),
+            "histograms": {name: {"count": h.count,
+                                  "mean_ms": round(h.sum / h.count * 1000, 3) if h.count else None,
+                                  "p50_ms": h.quantile(0.5) * 1000,
+                                  "p99_ms": h.quantile(0.99) * 1000}
+                           for name, h in self.histograms.items()},
+        }
+
+    def prometheus(self):
+        lines = []
+        for name, total in sorted(self.counters.items()):
+            metric = f"{self.prefix}_{name}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {total}"]
+        for name, hist in sorted(self.histograms.items()):
+            metric = f"{self.prefix}_{name}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            seen = 0
+            for bound, n in zip(hist.buckets, hist.counts):
+                seen += n
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {seen}')
+            lines += [f'{metric}_bucket{{le="+Inf"}} {hist.count}',
+                      f"{metric}_sum {hist.sum:.6f}",
+                      f"{metric}_count {hist.count}"]
+        return "\n".join(lines) + "\n"
+
+    def export(self):
+        # Write-then-rename so a node_exporter textfile scrape never sees half a file
+        tmp = f"{self.prometheus_path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.prometheus())
+        os.replace(tmp, self.prometheus_path)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self.prometheus_path:
+            self.export()
+        if self._trace is not None:
+            self._trace.close()
+
+# ── Disabled metrics ───────────────────────────────────────────────────────
+# Same interface, every call a no-op: no clock reads, no dict updates.
+class NullMetrics:
+    enabled = False
+
+    def start(self):
+        return 0.0
+
+    def stop(self, name, start):
+        pass
+
+    def observe(self, name, seconds):
+        pass
+
+    def count(self, name, n=1):
+        pass
+
+    def end_frame(self, start):
+        pass
+
+    def snapshot(self):
+        return {}
+
+    def close(self):
+        pass
+
+# ── Factory ────────────────────────────────────────────────────────────────
+def create_metrics(prometheus_path=None, trace_path=None, export_every=EXPORT_EVERY):
+    if not prometheus_path and not trace_path:
+        return NullMetrics()
+    return Metrics(prometheus_path, trace_path, export_every)
@@ -0,0 +1,163 @@
+import os
+import json
+import sys
+import shutil
+import numpy as np
+
+# ── Compiled nodemap format ────────────────────────────────────────────────
+# `<nodemap>.ngm/` next to `<nodemap>.json`, one .npy file per array so every
+# array can be memory-mapped read-only (and shared between processes):
+#
+#   ids.bin       UTF-8 node ids, back to back (the interned id table)
+#   id_offs.npy   int64[N+1]  id i is ids.bin[id_offs[i]:id_offs[i+1]]
+#   id_order.npy  int32[N]    node indices sorted by id
+#   coords.npy    float32[N,2]  node centre (x, y)
+#   bbox.npy      float32[N,4]  annotation box (x1, y1, x2, y2)
+#   indptr.npy    int64[N+1]  CSR row pointers (edges stored both ways)
+#   indices.npy   int32[2E]   neighbour of each CSR entry
+#   weights.npy   float32[2E] edge length in pixels
+#   meta.json     format version and counts, written last
+COMPILED_SUFFIX = ".ngm"
+FORMAT_VERSION  = 1
+
+ARRAYS = ["id_offs", "id_order", "coords", "bbox", "indptr", "indices", "weights"]
+
+# ── JSON → arrays ──────────────────────────────────────────────────────────
+def nodemap_arrays(data):
+    nodes = data["nodes"]
+    ids   = [n["id"] for n in nodes]
+    index = {node_id: i for i, node_id in enumerate(ids)}
+    count = len(ids)
+
+    coords = np.array([(node["x"], node["y"]) for node in nodes],
+                      dtype=np.float32).reshape(count, 2)
+    bbox   = np.array([(node.get("x1", node["x"]), node.get("y1", node["y"]),
+                        node.get("x2", node["x"]), node.get("y2", node["y"]))
+                       for node in nodes], dtype=np.float32).reshape(count, 4)
+
+    edges = [(index[e["from"]], index[e["to"]], e.get("dist", np.nan))
+             for e in data.get("edges", [])
+             if e["from"] in index and e["to"] in index]
+    edges = np.array(edges, dtype=np.float64).reshape(-1, 3)
+    src   = edges[:, 0].astype(np.int64)
+    dst   = edges[:, 1].astype(np.int64)
+    dist  = edges[:, 2]
+
+    missing = np.isnan(dist)
+    if missing.any():
+        delta         = coords[src[missing]] - coords[dst[missing]]
+        dist[missing] = np.hypot(delta[:, 0], delta[:, 1])
+
+    rows  = np.concatenate([src, dst])
+    cols  = np.concatenate([dst, src])
+    w     = np.concatenate([dist, dist])
+    order = np.argsort(rows, kind="stable")
+
+    indptr      = np.zeros(count + 1, dtype=np.int64)
+    indptr[1:]  = np.cumsum(np.bincount(rows, minlength=count))
+    return {
+        "ids":     ids,
+        "coords":  coords,
+        "bbox":    bbox,
+        "indptr":  indptr,
+        "indices": cols[order].astype(np.int32),
+        "weights": w[order].astype(np.float32),
+    }
+
+# ── Interned id table ──────────────────────────────────────────────────────
+class IdTable:
+    def __init__(self, blob, offsets, order):
+        self.blob    = blob
+        self.offsets = offsets
+        self.order   = order
+        self._index  = None         # id → index, built on the first lookup
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def lookup(self, node_id):
+        # Loading stays a memmap; the dict costs one pass over ids.bin the
+        # first time an id is looked up, and every lookup after is O(1)
+        if self._index is None:
+            blob        = bytes(self.blob)
+            offs        = self.offsets.tolist()
+            self._index = {blob[a:b].decode("utf-8"): i
+                           for i, (a, b) in enumerate(zip(offs, offs[1:]))}
+        return self._index.get(node_id)
+
+    def nbytes(self):
+        size = len(self.blob)
+        if self._index is not None:
+            size += sys.getsizeof(self._index) + sum(len(k) + 49 for k in self._index)
+        return size
+
+# ── Writing ────────────────────────────────────────────────────────────────
+def compiled_path(json_path):
+    return os.path.splitext(json_path)[0] + COMPILED_SUFFIX
+
+def compile_nodemap(data, out_dir):
+    arrays  = nodemap_arrays(data)
+    encoded = [node_id.encode("utf-8") for node_id in arrays.pop("ids")]
+
+    arrays["id_offs"]     = np.zeros(len(encoded) + 1, dtype=np.int64)
+    arrays["id_offs"][1:] = np.cumsum([len(b) for b in encoded])
+    arrays["id_order"]    = np.array(sorted(range(len(encoded)), key=encoded.__getitem__),
+                                     dtype=np.int32)
+
+    tmp_dir = out_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    with open(os.path.join(tmp_dir, "ids.bin"), "wb") as f:
+        f.write(b"".join(encoded))
+    for name in ARRAYS:
+        np.save(os.path.join(tmp_dir, name + ".npy"), arrays[name])
+    with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+        json.dump({"version": FORMAT_VERSION,
+                   "nodes":   len(encoded),
+                   "edges":   int(len(arrays["indices"]) // 2)}, f, indent=4)
+
+    # Swap the finished directory in so readers never see a partial one
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+    return out_dir
+
+def compile_nodemap_file(json_path):
+    with open(json_path, "r") as f:
+        data = json.load(f)
+    return compile_nodemap(data, compiled_path(json_path))
+
+# ── Reading ────────────────────────────────────────────────────────────────
+def is_fresh(json_path):
+    meta = os.path.join(compiled_path(json_path), "meta.json")
+    if not os.path.exists(meta):
+        return False
+    if not os.path.exists(json_path):
+        return True
+    return os.path.getmtime(meta) >= os.path.getmtime(json_path)
+
+def load_compiled(path):
+    with open(os.path.join(path, "meta.json"), "r") as f:
+        meta = json.load(f)
+    if meta["version"] != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported nodemap format {meta['version']}")
+
+    arrays = {name: np.load(os.path.join(path, name + ".npy"), mmap_mode="r")
+              for name in ARRAYS}
+    blob   = np.zeros(0, dtype=np.uint8)
+    if arrays["id_offs"][-1]:
+        # np.memmap refuses empty files, so only map a non-empty id table
+        blob = np.memmap(os.path.join(path, "ids.bin"), dtype=np.uint8, mode="r")
+    return {
+        "ids":     IdTable(blob, arrays["id_offs"], arrays["id_order"]),
+        "coords":  arrays["coords"],
+        "bbox":    arrays["bbox"],
+        "indptr":  arrays["indptr"],
+        "indices": arrays["indices"],
+        "weights": arrays["weights"],
+    }
@@ -0,0 +1,153 @@
+import cv2
+import time
+import bisect
+import threading
+import numpy as np
+from concurrent.futures import Future
+
+from text_regions import RegionReader, propose_text_regions
+
+# ── Config ─────────────────────────────────────────────────────────────────
+MAX_BATCH = 8        # frames per model call
+MAX_WAIT  = 0.010    # s the first frame of a batch may wait for company
+TILE_GAP  = 4        # blank rows between crops in a mosaic
+
+# ── Crop mosaic ────────────────────────────────────────────────────────────
+# Stacks every proposed crop of every frame into one tall grayscale image, so
+# a single reader.recognize call reads the whole batch. Returns the mosaic,
+# its horizontal_list and, per crop, (mosaic y, frame index, source box).
+def crop_mosaic(items):
+    crops, tiles = [], []
+    for i, (frame, boxes) in enumerate(items):
+        for box in boxes:
+            x1, x2, y1, y2 = box
+            if x2 > x1 and y2 > y1:
+                crop = frame[y1:y2, x1:x2]
+                crops.append(crop if crop.ndim == 2 else cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY))
+                tiles.append((i, box))
+    if not crops:
+        return None, [], []
+
+    width  = max(c.shape[1] for c in crops)
+    height = sum(c.shape[0] for c in crops) + TILE_GAP * (len(crops) - 1)
+    mosaic = np.zeros((height, width), dtype=np.uint8)
+    boxes, layout, y = [], [], 0
+    for crop, (i, box) in zip(crops, tiles):
+        h, w = crop.shape
+        mosaic[y:y + h, :w] = crop
+        boxes.append([0, w, y, y + h])
+        layout.append((y, i, box))
+        y += h + TILE_GAP
+    return mosaic, boxes, layout
+
+def scatter(results, layout, count):
+    # Maps each mosaic detection back to its frame, in frame coordinates
+    per_frame = [[] for _ in range(count)]
+    starts    = [y for y, _, _ in layout]
+    for bbox, text, conf in results:
+        top    = min(p[1] for p in bbox)
+        tile   = max(bisect.bisect_right(starts, top) - 1, 0)
+        y0, i, (x1, _, y1, _) = layout[tile]
+        per_frame[i].append(([[int(px + x1), int(py - y0 + y1)] for px, py in bbox], text, conf))
+    return per_frame
+
+# ── Micro-batcher ──────────────────────────────────────────────────────────
+# Collects frames from concurrent sessions for up to `max_wait` seconds (or
+# until `max_batch` are waiting) and reads them with one model call on a
+# single inference thread:
+#   RegionReader  proposals run in the submitting thread, then all crops go
+#                 through one reader.recognize over a crop mosaic
+#   plain reader  same-sized frames go through reader.readtext_batched
+# submit() returns a Future of the usual readtext result list; readtext()
+# blocks on it, so the batcher is a drop-in reader for threaded callers.
+class OCRBatcher:
+    def __init__(self, reader, max_batch=MAX_BATCH, max_wait=MAX_WAIT):
+        self.regions   = isinstance(reader, RegionReader)
+        self.reader    = reader.reader if self.regions else reader
+        self.max_batch = max(1, max_batch)
+        self.max_wait  = max_wait
+        self.batches   = 0
+        self.frames    = 0
+
+        self._cond    = threading.Condition()
+        self._queue   = []      # (frame, boxes, future)
+        self._closed  = False
+        self._thread  = threading.Thread(target=self._loop, name="ocr-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, frame):
+        future = Future()
+        boxes  = propose_text_regions(frame) if self.regions else None
+        if self.regions and not boxes:
+            future.set_result([])
+            return future
+        with self._cond:
+            if self._closed:
+                future.set_result([])
+                return future
+            self._queue.append((frame, boxes, future))
+            self._cond.notify()
+        return future
+
+    def readtext(self, frame):
+        return self.submit(frame).result()
+
+    def mean_batch(self):
+        return self.frames / self.batches if self.batches else 0.0
+
+    def _next_batch(self):
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            deadline = time.perf_counter() + self.max_wait
+            while len(self._queue) < self.max_batch and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch       = self._queue[:self.max_batch]
+            self._queue = self._queue[self.max_batch:]
+            return batch
+
+    def _loop(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            try:
+                results = self._read(batch)
+            except Exception as e:
+                print(f"⚠️  Batched OCR failed: {e}")
+                results = [[] for _ in batch]
+            for (_, _, future), result in zip(batch, results):
+                future.set_result(result)
+            self.batches += 1
+            self.frames  += len(batch)
+
+    def _read(self, batch):
+        if self.regions:
+            mosaic, boxes, layout = crop_mosaic([(frame, boxes) for frame, boxes, _ in batch])
+            if mosaic is None:
+                return [[] for _ in batch]
+            results = self.reader.recognize(mosaic, horizontal_list=boxes, free_list=[],
+                                            batch_size=len(boxes))
+            return scatter(results, layout, len(batch))
+
+        # Full frames: one readtext_batched call per distinct frame size
+        results = [None] * len(batch)
+        groups  = {}
+        for i, (frame, _, _) in enumerate(batch):
+            groups.setdefault(frame.shape, []).append(i)
+        for idx in groups.values():
+            frames = [batch[i][0] for i in idx]
+            for i, result in zip(idx, self.reader.readtext_batched(frames, batch_size=len(frames))):
+                results[i] = result
+        return results
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            pending, self._queue = self._queue, []
+            self._cond.notify_all()
+        for _, _, future in pending:
+            future.set_result([])
@@ -0,0 +1,107 @@
+import math
+import time
+import numpy as np
+
+from frame_gate import FrameGate
+
+# ── Config ─────────────────────────────────────────────────────────────────
+CPU_BUDGET     = 0.5     # cores' worth of time OCR may use on average
+MIN_INTERVAL   = 0.05    # s, never OCR more often than this
+MAX_INTERVAL   = 2.0     # s, never leave the scene unread longer than this
+STATIC_SLACK   = 4.0     # interval multiplier when the camera is still
+MOTION_FULL    = 12.0    # frame-to-frame thumbnail MAD that counts as walking
+WALK_SPEED_PX  = 60.0    # floorplan pixels walked per second (rough)
+NEAR_FRACTION  = 0.5     # next node counts as close after this share of its ETA
+LATENCY_ALPHA  = 0.2     # EMA weight of the newest readtext latency
+
+# ── Route leg lengths ──────────────────────────────────────────────────────
+# Pixel length of each route leg from the node centres; unknown legs are 0,
+# which makes the next node count as close straight away.
+def leg_distances(points):
+    return [math.dist(a, b) if a is not None and b is not None else 0.0
+            for a, b in zip(points, points[1:])]
+
+# ── Adaptive scheduler ─────────────────────────────────────────────────────
+# Decides per frame whether OCR should run. The base interval keeps OCR
+# within `cpu_budget` cores given the measured readtext latency, or, with a
+# `latency_slo`, keeps "sign enters view → OCR result" under that many
+# seconds. The budget is a floor in both modes: an SLO tighter than the
+# measured latency allows is reported (`slo_met`) rather than met by pinning
+# the CPU. In budget mode the interval is stretched up to STATIC_SLACK× when
+# the camera is still, and never stretched while the next node is expected.
+class OCRScheduler:
+    def __init__(self, leg_px=None, cpu_budget=CPU_BUDGET, latency_slo=None,
+                 min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL,
+                 walk_speed=WALK_SPEED_PX):
+        self.leg_px       = leg_px or []
+        self.cpu_budget   = cpu_budget
+        self.latency_slo  = latency_slo
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.walk_speed   = walk_speed
+
+        self.latency      = None      # EMA of readtext seconds
+        self.motion       = 0.0       # last frame-to-frame thumbnail MAD
+        self.interval     = min_interval
+        self.scheduled    = 0
+        self.slo_met      = True
+        self._last_thumb  = None
+        self._last_run    = -math.inf
+        self._step        = None
+        self._step_start  = 0.0
+
+    def set_route(self, leg_px):
+        # A re-planned route restarts the leg timing from its first leg
+        self.leg_px = leg_px or []
+        self._step  = None
+
+    def record_latency(self, seconds):
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += LATENCY_ALPHA * (seconds - self.latency)
+
+    def observe_motion(self, frame):
+        thumb = FrameGate.thumbnail(frame).astype(np.int16)
+        if self._last_thumb is not None:
+            self.motion = float(np.abs(thumb - self._last_thumb).mean())
+        self._last_thumb = thumb
+        return self.motion
+
+    def near_next(self, now):
+        if self._step is None or self._step >= len(self.leg_px):
+            return True
+        eta = self.leg_px[self._step] / self.walk_speed
+        return now - self._step_start >= NEAR_FRACTION * eta
+
+    def next_interval(self, now):
+        latency = self.latency or 0.0
+        # The budget is a hard floor, even above max_interval
+        floor   = latency / self.cpu_budget
+        if self.latency_slo is not None:
+            interval = self.latency_slo - latency
+            met      = interval >= floor
+            if met != self.slo_met:
+                self.slo_met = met
+                print(f"⚠️  OCR latency SLO {self.latency_slo:.2f}s unreachable within "
+                      f"{self.cpu_budget:g} cores ({latency:.2f}s per read)" if not met
+                      else f"✅ OCR latency SLO {self.latency_slo:.2f}s reachable again")
+        else:
+            interval = floor
+            if not self.near_next(now):
+                still     = 1.0 - min(self.motion / MOTION_FULL, 1.0)
+                interval *= 1.0 + (STATIC_SLACK - 1.0) * still
+        return max(min(interval, self.max_interval), floor, self.min_interval)
+
+    def due(self, frame, step, now=None):
+        now = time.perf_counter() if now is None else now
+        if step != self._step:
+            self._step       = step
+            self._step_start = now
+        self.observe_motion(frame)
+        self.interval = self.next_interval(now)
+        if now - self._last_run < self.interval:
+            return False
+        self._last_run  = now
+        self.scheduled += 1
+        return True
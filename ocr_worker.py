@@ -0,0 +1,143 @@
+import os
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+
+# ── GPU detection ──────────────────────────────────────────────────────────
+# easyocr runs on torch, so CUDA is usable exactly when torch can see it.
+def detect_gpu():
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+# ── Process-pool reader ────────────────────────────────────────────────────
+# Each pool process owns its own easyocr.Reader; it is created once by the
+# pool initializer and reused for every frame handed to that process.
+_process_reader = None
+
+def _init_process_reader(languages, gpu, regions):
+    global _process_reader
+    import easyocr
+    _process_reader = easyocr.Reader(languages, gpu=gpu, verbose=False)
+    if regions:
+        from text_regions import RegionReader
+        _process_reader = RegionReader(_process_reader)
+
+def _process_readtext(frame):
+    return _process_reader.readtext(frame)
+
+# ── Latest-frame-wins OCR worker ───────────────────────────────────────────
+class OCRWorker:
+    def __init__(self, readtext, workers=1, pool=None):
+        self.readtext  = readtext
+        self.pool      = pool
+        self.submitted = 0
+        self.dropped   = 0
+        self.completed = 0
+        self.stale     = 0
+        self.latency   = None   # seconds taken by the last published readtext
+
+        self._cond        = threading.Condition()
+        self._pending     = None   # (seq, frame) waiting for a free worker
+        self._result      = None   # (seq, results) not yet polled
+        self._latest_seq  = 0      # newest seq whose result was published
+        self._seq         = 0
+        self._closed      = False
+        self._threads     = []
+        for i in range(max(1, workers)):
+            t = threading.Thread(target=self._loop, name=f"ocr-worker-{i}",
+                                 daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    @classmethod
+    def processes(cls, languages=("en",), gpu=False, workers=None, regions=False):
+        workers = workers or os.cpu_count() or 1
+        pool    = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_process_reader,
+            initargs=(list(languages), gpu, regions),
+        )
+        return cls(lambda frame: pool.submit(_process_readtext, frame).result(),
+                   workers=workers, pool=pool)
+
+    def submit(self, frame):
+        # The caller keeps drawing on its frame, so hand the worker a copy.
+        frame = frame.copy()
+        with self._cond:
+            if self._closed:
+                return
+            if self._pending is not None:
+                self.dropped += 1
+            self._seq       += 1
+            self.submitted  += 1
+            self._pending    = (self._seq, frame)
+            self._cond.notify()
+
+    def poll(self):
+        with self._cond:
+            result, self._result = self._result, None
+        return None if result is None else result[1]
+
+    def busy(self):
+        with self._cond:
+            return self._pending is not None
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                seq, frame    = self._pending
+                self._pending = None
+
+            start = time.perf_counter()
+            try:
+                results = self.readtext(frame)
+            except CancelledError:
+                return      # close() cancelled the queued pool job
+            except Exception as e:
+                if self._closed:
+                    return
+                print(f"⚠️  OCR failed: {e}")
+                results = []
+            elapsed = time.perf_counter() - start
+
+            with self._cond:
+                self.completed += 1
+                # With several workers a slow older frame can finish after a
+                # newer one; never let it overwrite fresher results.
+                if seq < self._latest_seq:
+                    self.stale += 1
+                    continue
+                self._latest_seq = seq
+                self._result     = (seq, results)
+                self.latency     = elapsed
+
+    def close(self):
+        with self._cond:
+            self._closed  = True
+            self._pending = None
+            self._cond.notify_all()
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+# ── Factory ────────────────────────────────────────────────────────────────
+# `reader` is anything with readtext(frame): an easyocr.Reader or a
+# RegionReader wrapping one. Process workers build their own.
+def create_ocr_worker(mode, reader=None, workers=None, languages=("en",), gpu=False,
+                      regions=False):
+    if mode == "inline":
+        return None
+    if mode == "thread":
+        return OCRWorker(reader.readtext, workers=workers or 1)
+    if mode == "process":
+        return OCRWorker.processes(languages=languages, gpu=gpu, workers=workers,
+                                   regions=regions)
+    raise ValueError(f"Unknown OCR execution mode: {mode}")
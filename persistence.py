@@ -0,0 +1,186 @@
+import os
+import json
+import atexit
+import threading
+from collections.abc import Mapping
+
+# ── Journaled JSON store ───────────────────────────────────────────────────
+# A dict persisted as `<path>` (a plain JSON snapshot, same format as
+# before) plus `<path>.journal` (one JSON op per line). Mutations only touch
+# memory; a background thread appends them to the journal in batches and
+# folds the journal into a fresh snapshot via write-temp + atomic rename.
+# Every op is an idempotent key write, so replaying a journal over a
+# snapshot that already contains it is harmless.
+class JournaledStore(Mapping):
+    def __init__(self, path, default=None, flush_interval=2.0, compact_every=256):
+        # Absolute, so flushes from the background thread and atexit land in
+        # the same place whatever the working directory is by then
+        self.path           = os.path.abspath(path)
+        self.journal_path   = self.path + ".journal"
+        self.flush_interval = flush_interval
+        self.compact_every  = compact_every
+
+        self._lock          = threading.Lock()
+        self._io_lock       = threading.Lock()
+        self._pending       = []      # serialized ops not yet on disk
+        self._journal_ops   = 0       # ops in the journal since last compaction
+        self._needs_compact = False
+        self._closed        = False
+        self._data          = self._load(default or {})
+
+        self._stop   = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name=f"store-{os.path.basename(path)}")
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ── Mapping ────────────────────────────────────────────────────────────
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(list(self._data))
+
+    def __len__(self):
+        return len(self._data)
+
+    def items(self):
+        with self._lock:
+            return list(self._data.items())
+
+    # ── Mutations (memory only, never block on disk) ───────────────────────
+    def set(self, key, value):
+        op = json.dumps({"op": "set", "key": key, "value": value})
+        with self._lock:
+            self._data[key] = value
+            self._pending.append(op)
+
+    def update(self, key, fn, default=None):
+        # set(key, fn(current value)) with no other mutation in between
+        with self._lock:
+            value           = fn(self._data.get(key, default))
+            self._data[key] = value
+            self._pending.append(json.dumps({"op": "set", "key": key, "value": value}))
+        return value
+
+    def delete(self, key):
+        op = json.dumps({"op": "del", "key": key})
+        with self._lock:
+            if key in self._data:
+                del self._data[key]
+                self._pending.append(op)
+
+    # ── Loading ────────────────────────────────────────────────────────────
+    def _load(self, default):
+        data = None
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            # Keep the damaged file for inspection instead of silently
+            # replacing it with defaults.
+            backup = self.path + ".corrupt"
+            print(f"⚠️  {self.path} is unreadable ({e}); moved to {backup}")
+            os.replace(self.path, backup)
+
+        if data is None:
+            data                = json.loads(json.dumps(default))
+            self._needs_compact = True
+
+        replayed = self._replay(data)
+        if replayed:
+            self._journal_ops   = replayed
+            self._needs_compact = True
+        return data
+
+    def _replay(self, data):
+        try:
+            with open(self.journal_path, "r") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return 0
+
+        replayed, good = 0, []
+        for line in lines:
+            try:
+                op = json.loads(line)
+            except ValueError:
+                # Only the tail can be torn by a crash mid-append
+                print(f"⚠️  Ignoring truncated journal entry in {self.journal_path}")
+                break
+            if op["op"] == "set":
+                data[op["key"]] = op["value"]
+            elif op["op"] == "del":
+                data.pop(op["key"], None)
+            good.append(line.rstrip("\n") + "\n")
+            replayed += 1
+
+        # Cut a torn or unterminated tail off now: the next append would be
+        # glued onto it, and the following load would drop everything after
+        if good != lines:
+            with open(self.journal_path, "w") as f:
+                f.write("".join(good))
+                f.flush()
+                os.fsync(f.fileno())
+            self._needs_compact = True
+        return replayed
+
+    # ── Flushing ───────────────────────────────────────────────────────────
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        with self._io_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if pending:
+                with open(self.journal_path, "a") as f:
+                    f.write("\n".join(pending) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._journal_ops += len(pending)
+            if self._needs_compact or self._journal_ops >= self.compact_every:
+                self._compact()
+
+    def _compact(self):
+        with self._lock:
+            snapshot = json.dumps(self._data, indent=4)
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(snapshot)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        _fsync_dir(self.path)
+
+        # The snapshot already holds everything journaled so far
+        with open(self.journal_path, "w") as f:
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_ops   = 0
+        self._needs_compact = False
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        self._needs_compact = True
+        self.flush()
+
+def _fsync_dir(path):
+    # Makes the rename durable on POSIX; directories can't be opened on Windows
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
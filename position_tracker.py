@@ -0,0 +1,114 @@
+# ── Config ─────────────────────────────────────────────────────────────────
+STAY         = 0.7      # chance of still being at the same node per motion step
+FOLLOW       = 0.7      # share of the moving mass that follows the route
+MOTION_STEPS = 1        # motion steps per detection
+FALSE_RATE   = 0.2      # likelihood of a detection unrelated to where you are
+NEAR         = 0.3      # ... of reading a neighbouring node's sign, × conf
+ESCAPE       = 0.01     # mass moved to the detected node out of nowhere
+PRUNE        = 1e-4     # beliefs below this are dropped
+MAX_SUPPORT  = 64       # most nodes the belief is kept over
+
+# ── Route as a graph ───────────────────────────────────────────────────────
+# When the building graph cannot place the route (the surveyed fallback
+# order), the route itself is the graph: step k is node k, a chain.
+class RouteGraph:
+    def __init__(self, route):
+        self.route = route
+        self._ids  = {}
+        for k, node_id in enumerate(route):
+            self._ids.setdefault(node_id, []).append(k)
+
+    def neighbors(self, k):
+        if k > 0:
+            yield k - 1, 1.0
+        if k + 1 < len(self.route):
+            yield k + 1, 1.0
+
+    def nodes_with_id(self, node_id):
+        return self._ids.get(node_id, [])
+
+def place_route(graph, route, floors):
+    # (graph, nodes of each route step). A connector step is both of its
+    # floors' nodes: the user is "at the stairs" at either end.
+    if graph is not None:
+        try:
+            steps = []
+            for k, node_id in enumerate(route):
+                nodes = [graph.node(floors[k], node_id)]
+                if k and floors[k - 1] != floors[k]:
+                    nodes += [n for n in graph.nodes_with_id(node_id) if n[0] == floors[k - 1]]
+                steps.append(nodes)
+            return graph, steps
+        except KeyError:
+            pass
+    return RouteGraph(route), [[k] for k in range(len(route))]
+
+# ── Position tracker ───────────────────────────────────────────────────────
+# Discrete HMM over graph nodes with a sparse belief {node: probability}.
+# Per detection: MOTION_STEPS of motion along the edges (stay; or move on,
+# FOLLOW of the time to the next route node when `follow` names one, else
+# to a uniformly chosen neighbour), then the OCR observation: a node is likely
+# in proportion to FALSE_RATE + conf if its own sign was read, + conf × NEAR
+# if a neighbour's was. Only nodes holding belief and the detected node's
+# neighbourhood are touched, so an update costs O(support × degree) however
+# large the building is.
+class PositionTracker:
+    def __init__(self, graph, start, follow=None):
+        self.graph   = graph
+        self.follow  = follow or {}      # node → next node along the route
+        self.belief  = {}
+        self.reset(start)
+
+    def reset(self, nodes):
+        nodes       = list(nodes)
+        self.belief = {n: 1.0 / len(nodes) for n in nodes}
+
+    def predict(self):
+        moved = {}
+        for node, p in self.belief.items():
+            moved[node] = moved.get(node, 0.0) + p * STAY
+            p          *= 1.0 - STAY
+            ahead       = self.follow.get(node)
+            if ahead is not None:
+                moved[ahead] = moved.get(ahead, 0.0) + p * FOLLOW
+                p           *= 1.0 - FOLLOW
+            nbrs = [n for n, _ in self.graph.neighbors(node)]
+            if not nbrs:
+                moved[node] += p
+                continue
+            for n in nbrs:
+                moved[n] = moved.get(n, 0.0) + p / len(nbrs)
+        self.belief = moved
+
+    def observe(self, node_id, conf=1.0):
+        for _ in range(MOTION_STEPS):
+            self.predict()
+
+        hits = self.graph.nodes_with_id(node_id)
+        near = {n for h in hits for n, _ in self.graph.neighbors(h)}
+        for h in hits:
+            self.belief[h] = self.belief.get(h, 0.0) + ESCAPE / len(hits)
+
+        hits = set(hits)
+        for node in self.belief:
+            like = FALSE_RATE
+            if node in hits:
+                like += conf
+            elif node in near:
+                like += conf * NEAR
+            self.belief[node] *= like
+        self._normalize()
+
+    def _normalize(self):
+        total = sum(self.belief.values())
+        kept  = sorted(((p / total, n) for n, p in self.belief.items() if p / total >= PRUNE),
+                       key=lambda item: item[0], reverse=True)[:MAX_SUPPORT]
+        total = sum(p for p, _ in kept) or 1.0
+        self.belief = {n: p / total for p, n in kept}
+
+    def estimate(self):
+        # Most likely node and its probability
+        if not self.belief:
+            return None, 0.0
+        node = max(self.belief, key=self.belief.get)
+        return node, self.belief[node]
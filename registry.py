@@ -0,0 +1,189 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+
+from routing import FloorGraph, BuildingGraph, CONNECTOR_COSTS
+
+# ── Config ─────────────────────────────────────────────────────────────────
+MEMORY_CAP = 512 * 1024 * 1024     # bytes of floor data kept resident
+
+# ── Manifest ───────────────────────────────────────────────────────────────
+# One JSON file describes every building; paths are relative to it:
+#
+#   {"buildings": {
+#       "main_building": {
+#           "label": "Main Building",
+#           "start": ["lower", "entrance"],
+#           "floors": [                          bottom → top
+#               {"id": "lower", "label": "Lower Level",
+#                "nodemap": "lower/nodemap.json",
+#                "sign_map": "lower/signs.json"},      optional
+#               ...],
+#           "destinations": {"room_045": {"floor": "lower", "label": "Room 045"}},
+#           "connector_costs": {"stairs": 200.0}}}}   optional
+def load_manifest(path):
+    with open(path, "r") as f:
+        manifest = json.load(f)
+    return resolve_paths(manifest, os.path.dirname(os.path.abspath(path)))
+
+def resolve_paths(manifest, root):
+    for building in manifest["buildings"].values():
+        for floor in building["floors"]:
+            for key in ("nodemap", "sign_map"):
+                if floor.get(key):
+                    floor[key] = os.path.join(root, floor[key])
+    return manifest
+
+# ── Floor tile ─────────────────────────────────────────────────────────────
+# Everything resident for one floor. The graph is loaded with the tile; the
+# sign map only when first asked for.
+class FloorTile:
+    def __init__(self, spec, graph):
+        self.spec     = spec
+        self.graph    = graph
+        self.sign_map = None
+        self.extra    = 0          # bytes of the sign map
+
+    def nbytes(self):
+        # Re-measured each time: the spatial index is built on first use
+        return self.graph.nbytes() + self.extra
+
+# ── Building registry ──────────────────────────────────────────────────────
+# Floors load the first time a route touches them and are kept in LRU order;
+# when resident floors exceed `memory_cap` the coldest are evicted. A route
+# between two floors needs the floors in between too (the connectors chain
+# through them), so route() loads exactly that span of the building.
+# Evicting a floor only drops the registry's reference: a BuildingGraph an
+# active session still holds keeps working.
+class Registry:
+    def __init__(self, manifest, memory_cap=MEMORY_CAP):
+        self.manifest   = manifest
+        self.memory_cap = memory_cap
+        self.hits       = 0
+        self.misses     = 0
+        self.evictions  = 0
+        self._tiles     = OrderedDict()      # (building, floor) → FloorTile
+        self._graphs    = {}                 # (building, floor span) → BuildingGraph
+        self._lock      = threading.RLock()
+
+    @classmethod
+    def from_file(cls, path, memory_cap=MEMORY_CAP):
+        return cls(load_manifest(path), memory_cap)
+
+    # ── Manifest lookups ───────────────────────────────────────────────────
+    def buildings(self):
+        return list(self.manifest["buildings"])
+
+    def building(self, building):
+        try:
+            return self.manifest["buildings"][building]
+        except KeyError:
+            raise KeyError(f"Unknown building: {building}") from None
+
+    def floor_order(self, building):
+        return [f["id"] for f in self.building(building)["floors"]]
+
+    def floor_spec(self, building, floor):
+        for spec in self.building(building)["floors"]:
+            if spec["id"] == floor:
+                return spec
+        raise KeyError(f"{floor} is not a floor of {building}")
+
+    def destinations(self, building):
+        return self.building(building).get("destinations", {})
+
+    def start(self, building):
+        return tuple(self.building(building)["start"])
+
+    # ── Tiles ──────────────────────────────────────────────────────────────
+    def resident(self):
+        with self._lock:
+            return list(self._tiles)
+
+    def resident_bytes(self):
+        with self._lock:
+            return sum(tile.nbytes() for tile in self._tiles.values())
+
+    def _tile(self, building, floor, pinned=()):
+        key = (building, floor)
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self.hits += 1
+                self._tiles.move_to_end(key)
+                return tile
+
+            self.misses += 1
+            spec             = self.floor_spec(building, floor)
+            tile             = FloorTile(spec, FloorGraph.load(floor, spec["nodemap"]))
+            self._tiles[key] = tile
+            self._evict({key, *pinned})
+            return tile
+
+    def _evict(self, pinned):
+        # Coldest first; floors the current request needs are never evicted
+        while self.resident_bytes() > self.memory_cap:
+            key = next((k for k in self._tiles if k not in pinned), None)
+            if key is None:
+                return
+            del self._tiles[key]
+            self._graphs = {g: v for g, v in self._graphs.items()
+                            if not (g[0] == key[0] and key[1] in g[1])}
+            self.evictions += 1
+
+    def _grow(self, building, floor, tile, nbytes):
+        with self._lock:
+            tile.extra += nbytes
+            self._evict({(building, floor)})
+
+    def floor(self, building, floor):
+        return self._tile(building, floor).graph
+
+    def sign_map(self, building, floor):
+        with self._lock:
+            tile = self._tile(building, floor)
+            if tile.sign_map is None:
+                path          = tile.spec.get("sign_map")
+                tile.sign_map = {}
+                if path and os.path.exists(path):
+                    with open(path, "r") as f:
+                        tile.sign_map = json.load(f)
+                self._grow(building, floor, tile, len(json.dumps(tile.sign_map)))
+            return tile.sign_map
+
+    # ── Routing ────────────────────────────────────────────────────────────
+    def span(self, building, *floors):
+        # Contiguous run of floors covering all of `floors`
+        order = self.floor_order(building)
+        for f in floors:
+            if f not in order:
+                raise KeyError(f"{f} is not a floor of {building}")
+        idx   = [order.index(f) for f in floors]
+        return order[min(idx):max(idx) + 1]
+
+    def graph(self, building, floors=None):
+        floors = tuple(self.span(building, *floors) if floors else self.floor_order(building))
+        key    = (building, floors)
+        with self._lock:
+            pinned = {(building, f) for f in floors}
+            tiles  = {f: self._tile(building, f, pinned) for f in floors}   # LRU refresh
+            graph  = self._graphs.get(key)
+            if graph is None:
+                costs = self.building(building).get("connector_costs", CONNECTOR_COSTS)
+                graph = BuildingGraph({f: t.graph for f, t in tiles.items()}, list(floors), costs)
+                self._graphs[key] = graph
+            return graph
+
+    def route(self, building, source, target, astar=True):
+        graph = self.graph(building, [source[0], target[0]])
+        return graph.route(source, target, astar)
+
+    def stats(self):
+        with self._lock:
+            return {"resident":   len(self._tiles),
+                    "bytes":      self.resident_bytes(),
+                    "cap":        self.memory_cap,
+                    "hits":       self.hits,
+                    "misses":     self.misses,
+                    "evictions":  self.evictions}
@@ -0,0 +1,203 @@
+import os
+import cv2
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+
+# ── Config ─────────────────────────────────────────────────────────────────
+SESSION_INDEX  = "index.jsonl"
+SESSION_META   = "session.json"
+IMAGE_EXTS     = (".jpg", ".jpeg", ".png", ".bmp")
+JPEG_QUALITY   = 90
+
+# ── Frame sources ──────────────────────────────────────────────────────────
+# Yields (frame index, seconds since start or None, BGR frame) from a
+# recorded session directory, a plain directory of images, or a video file.
+def iter_frames(source):
+    if not os.path.isdir(source):
+        cap = cv2.VideoCapture(source)
+        if not cap.isOpened():
+            raise FileNotFoundError(f"Cannot open video: {source}")
+        i = 0
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield i, cap.get(cv2.CAP_PROP_POS_MSEC) / 1000, frame
+            i += 1
+        cap.release()
+        return
+
+    index = os.path.join(source, SESSION_INDEX)
+    if os.path.exists(index):
+        with open(index, "r") as f:
+            for line in f:
+                rec = json.loads(line)
+                yield rec["frame"], rec["t"], cv2.imread(os.path.join(source, rec["file"]))
+        return
+
+    names = sorted(n for n in os.listdir(source) if n.lower().endswith(IMAGE_EXTS))
+    for i, name in enumerate(names):
+        yield i, None, cv2.imread(os.path.join(source, name))
+
+# ── Recorder ───────────────────────────────────────────────────────────────
+def record(out_dir, camera=0, seconds=None, max_frames=None):
+    os.makedirs(out_dir, exist_ok=True)
+    cap = cv2.VideoCapture(camera)
+    if not cap.isOpened():
+        print("❌ Cannot open camera!")
+        return
+
+    with open(os.path.join(out_dir, SESSION_META), "w") as f:
+        json.dump({"camera":  camera,
+                   "started": time.time(),
+                   "width":   int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                   "height":  int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))}, f, indent=4)
+
+    print(f"⏺️  Recording to {out_dir} (Ctrl+C to stop)")
+    start  = time.perf_counter()
+    frames = 0
+    try:
+        with open(os.path.join(out_dir, SESSION_INDEX), "w") as index:
+            while max_frames is None or frames < max_frames:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                t = time.perf_counter() - start
+                if seconds is not None and t > seconds:
+                    break
+                name = f"frame_{frames:06d}.jpg"
+                cv2.imwrite(os.path.join(out_dir, name), frame,
+                            [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+                index.write(json.dumps({"frame": frames, "t": round(t, 4), "file": name}) + "\n")
+                frames += 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        cap.release()
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Recorded {frames} frames in {elapsed:.1f}s ({frames / max(elapsed, 1e-9):.1f} fps)")
+
+# ── Event log ──────────────────────────────────────────────────────────────
+class EventLog:
+    def __init__(self, path):
+        self.f = open(path, "w") if path else None
+
+    def write(self, event, **fields):
+        if self.f is not None:
+            self.f.write(json.dumps({"event": event, **fields}) + "\n")
+
+    def close(self):
+        if self.f is not None:
+            self.f.close()
+
+# ── Headless replay ────────────────────────────────────────────────────────
+# Runs OCR → match_text → Navigator.update on every `every`-th frame as fast
+# as possible, with no window and no destination prompt.
+def run(destination, source, log_path=None, every=1, use_llama=False, building=None):
+    import full_navigation as nav_pipeline
+
+    if destination not in nav_pipeline.destinations(building):
+        raise SystemExit(f"❌ Unknown destination: {destination}")
+    nav_pipeline.USE_LLAMA = use_llama
+
+    # Signs learned during a replay go to a scratch copy of the sign map, so
+    # the same footage always matches the same way and sign_map.json is left
+    # as it was
+    scratch   = tempfile.mkdtemp(prefix="navigrid-replay-")
+    sign_path = nav_pipeline.SIGN_MAP_PATH
+    for suffix in ("", ".journal"):
+        if os.path.exists(nav_pipeline.SIGN_MAP_PATH + suffix):
+            shutil.copy(nav_pipeline.SIGN_MAP_PATH + suffix,
+                        os.path.join(scratch, "sign_map.json" + suffix))
+    nav_pipeline.SIGN_MAP_PATH = os.path.join(scratch, "sign_map.json")
+    # The log records each instruction when the step advances, so wait for it
+    nav_pipeline.STREAM_LLAMA = False
+
+    route, floor_type, floors = nav_pipeline.build_route(destination, building)
+    nav = nav_pipeline.Navigator(route, floor_type, floors,
+                                 nav_pipeline.route_graph(floors, building))
+    log = EventLog(log_path)
+    log.write("start", destination=destination, building=building or nav_pipeline.BUILDING_ID,
+              route=route, floors=floors, source=source)
+
+    ocr_ms = []
+    frames = 0
+    start  = time.perf_counter()
+    for i, t, frame in iter_frames(source):
+        frames += 1
+        if frame is None or i % every:
+            continue
+
+        t0      = time.perf_counter()
+        results = nav_pipeline.reader.get().readtext(frame)
+        ocr_ms.append((time.perf_counter() - t0) * 1000)
+
+        step, revision = nav.current_step, nav.revision
+        node = nav_pipeline.handle_ocr_results(results, nav)
+        log.write("ocr", frame=i, t=t, ms=round(ocr_ms[-1], 2),
+                  texts=[[r[1], round(float(r[2]), 4)] for r in results], match=node)
+        if nav.revision != revision:
+            log.write("reroute", frame=i, t=t, route=nav.route, floors=nav.floors,
+                      instruction=nav.last_instruction)
+        elif nav.current_step != step:
+            log.write("advance", frame=i, t=t, step=nav.current_step,
+                      node=nav.current_position, instruction=nav.last_instruction)
+        if nav.completed:
+            log.write("arrived", frame=i, t=t, node=route[-1])
+            break
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "frames":      frames,
+        "ocr_calls":   len(ocr_ms),
+        "elapsed_s":   round(elapsed, 3),
+        "fps":         round(frames / max(elapsed, 1e-9), 2),
+        "ocr_ms_mean": round(float(np.mean(ocr_ms)), 2) if ocr_ms else None,
+        "ocr_ms_p95":  round(float(np.percentile(ocr_ms, 95)), 2) if ocr_ms else None,
+        "completed":   nav.completed,
+        "step":        nav.current_step,
+        "route_steps": len(nav.route) - 1,
+        "reroutes":    nav.revision,
+    }
+    log.write("summary", **summary)
+    log.close()
+    nav_pipeline.PREFETCHER.close()
+    nav_pipeline.SIGN_MAP.close()
+    nav_pipeline.SIGN_MAP_PATH = sign_path
+    shutil.rmtree(scratch, ignore_errors=True)
+    print(f"📊 {json.dumps(summary)}")
+    return summary
+
+# ── Main ───────────────────────────────────────────────────────────────────
+def main():
+    parser = argparse.ArgumentParser(description="NaviGrid headless record / replay")
+    sub    = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="capture a timestamped camera session")
+    rec.add_argument("out_dir")
+    rec.add_argument("--camera",  type=int,   default=0)
+    rec.add_argument("--seconds", type=float, default=None)
+    rec.add_argument("--frames",  type=int,   default=None)
+
+    rep = sub.add_parser("run", help="navigate a recorded session, image folder or video")
+    rep.add_argument("source")
+    rep.add_argument("--destination", required=True)
+    rep.add_argument("--building", default=None, help="manifest building (default: BUILDING_ID)")
+    rep.add_argument("--log",   default=None, help="JSONL event log path")
+    rep.add_argument("--every", type=int, default=1, help="OCR every Nth frame")
+    rep.add_argument("--llama", action="store_true", help="ask LLaMA for instructions")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args.out_dir, args.camera, args.seconds, args.frames)
+    else:
+        run(args.destination, args.source, args.log, max(args.every, 1), args.llama,
+            args.building)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import json
+import math
+import heapq
+
+from nodemap_binary import nodemap_arrays, compiled_path, is_fresh, load_compiled
+from spatial_index import FloorIndex, SpatialIndex
+
+# ── Config ─────────────────────────────────────────────────────────────────
+# Cost (in floorplan pixels) of changing floor through a shared connector
+CONNECTOR_COSTS = {
+    "stairs":   200.0,
+    "elevator": 250.0,
+}
+
+# ── Floor graph ────────────────────────────────────────────────────────────
+# One floor's nodemap as CSR adjacency: the neighbours of node i are
+# indices[indptr[i]:indptr[i+1]] with matching weights. Edges are undirected.
+# The arrays come either from the JSON nodemap or memory-mapped from its
+# compiled .ngm twin (see nodemap_binary.py).
+class FloorGraph:
+    def __init__(self, name, ids, coords, indptr, indices, weights, bbox=None):
+        self.name     = name
+        self.ids      = ids
+        self.coords   = coords
+        self.bbox     = bbox
+        self.indptr   = indptr
+        self.indices  = indices
+        self.weights  = weights
+        self._index   = None
+        self._spatial = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def spatial(self):
+        # Built once per floor and shared by every BuildingGraph using it
+        if self._spatial is None:
+            self._spatial = FloorIndex(self.coords, self.bbox)
+        return self._spatial
+
+    def nbytes(self):
+        # Resident size estimate: the arrays, the id table and the index
+        size = sum(getattr(a, "nbytes", 0) for a in
+                   (self.coords, self.bbox, self.indptr, self.indices, self.weights))
+        size += self.ids.nbytes() if hasattr(self.ids, "nbytes") \
+                else sum(len(i) + 49 for i in self.ids)
+        if self._spatial is not None:
+            sp    = self._spatial
+            size += sp.coords.nbytes * 3 + sp.bbox.nbytes + sp.boxes.nbytes + sp.indptr.nbytes
+        return size
+
+    @classmethod
+    def from_nodemap(cls, name, data):
+        return cls(name, **nodemap_arrays(data))
+
+    @classmethod
+    def load(cls, name, path):
+        if is_fresh(path):
+            return cls(name, **load_compiled(compiled_path(path)))
+        with open(path, "r") as f:
+            return cls.from_nodemap(name, json.load(f))
+
+    def lookup(self, node_id):
+        if hasattr(self.ids, "lookup"):
+            return self.ids.lookup(node_id)
+        if self._index is None:
+            self._index = {n: i for i, n in enumerate(self.ids)}
+        return self._index.get(node_id)
+
+    def neighbors(self, i):
+        a, b = self.indptr[i], self.indptr[i + 1]
+        return zip(self.indices[a:b].tolist(), self.weights[a:b].tolist())
+
+# ── Multi-floor building graph ─────────────────────────────────────────────
+# Nodes are (floor, local index) pairs. A connector id (stairs, elevator)
+# present on two adjacent floors links them at CONNECTOR_COSTS[id].
+# `spatial` answers floorplan point → node queries (see spatial_index.py).
+class BuildingGraph:
+    def __init__(self, floors, floor_order=None, connector_costs=None):
+        self.floors          = floors
+        self.floor_order     = floor_order or list(floors)
+        self.connector_costs = CONNECTOR_COSTS if connector_costs is None else connector_costs
+        self.links           = {}
+        self.expanded        = 0      # nodes settled by the last search
+        self._connectors     = {name: [] for name in floors}
+        self._spatial        = None
+
+        for lower, upper in zip(self.floor_order, self.floor_order[1:]):
+            for node_id, cost in self.connector_costs.items():
+                a = floors[lower].lookup(node_id)
+                b = floors[upper].lookup(node_id)
+                if a is None or b is None:
+                    continue
+                self.links.setdefault((lower, a), []).append(((upper, b), cost))
+                self.links.setdefault((upper, b), []).append(((lower, a), cost))
+                self._connectors[lower].append((self.coords((lower, a)), cost))
+                self._connectors[upper].append((self.coords((upper, b)), cost))
+
+    @classmethod
+    def from_files(cls, paths, connector_costs=None):
+        floors = {name: FloorGraph.load(name, path) for name, path in paths.items()}
+        return cls(floors, list(paths), connector_costs)
+
+    @property
+    def spatial(self):
+        # Built on first query, so routing alone keeps the memmapped floors
+        # cold and never pays for the KD-trees
+        if self._spatial is None:
+            self._spatial = SpatialIndex(self.floors)
+        return self._spatial
+
+    def node(self, floor, node_id):
+        i = self.floors[floor].lookup(node_id)
+        if i is None:
+            raise KeyError(f"{node_id} is not on {floor}")
+        return floor, i
+
+    def nodes_with_id(self, node_id):
+        # Every (floor, index) carrying node_id; a connector has one per floor
+        found = []
+        for name, g in self.floors.items():
+            i = g.lookup(node_id)
+            if i is not None:
+                found.append((name, i))
+        return found
+
+    def node_id(self, node):
+        floor, i = node
+        return self.floors[floor].ids[i]
+
+    def coords(self, node):
+        floor, i = node
+        return tuple(self.floors[floor].coords[i].tolist())
+
+    def neighbors(self, node):
+        floor, i = node
+        for j, w in self.floors[floor].neighbors(i):
+            yield (floor, j), w
+        yield from self.links.get(node, ())
+
+    def edge_length(self, a, b):
+        # Stored edge weight (walking distance once the nodemap has been
+        # re-weighted), or the straight line when a and b are not adjacent
+        for nxt, w in self.neighbors(a):
+            if nxt == b:
+                return w
+        return math.dist(self.coords(a), self.coords(b))
+
+    def exit_cost(self, node):
+        # Least it costs to leave node's floor: the walk to a connector plus
+        # its cost (inf on a floor without connectors)
+        here = self.coords(node)
+        return min((math.dist(here, xy) + cost for xy, cost in self._connectors[node[0]]),
+                   default=math.inf)
+
+    def heuristic(self, node, goal):
+        # Off the goal floor: the walk to the closest connector plus its
+        # cost. On it: the straight line, unless leaving the floor and coming
+        # back through another connector could be cheaper. Each floor has its
+        # own pixel frame, so that detour is only bounded by the two exits,
+        # never by pixels compared across floors.
+        cost = self.exit_cost(node)
+        if node[0] == goal[0]:
+            return min(math.dist(self.coords(node), self.coords(goal)),
+                       cost + self.exit_cost(goal))
+        return 0.0 if cost == math.inf else cost
+
+    def shortest_path(self, source, target, astar=True):
+        if source == target:
+            return [source], 0.0
+
+        dist    = {source: 0.0}
+        parent  = {source: None}
+        h       = self.heuristic if astar else (lambda node, goal: 0.0)
+        heap    = [(h(source, target), 0.0, source)]
+        self.expanded = 0
+
+        # Stale heap entries are skipped by distance rather than a closed
+        # set, so a node reached more cheaply later is simply reopened.
+        while heap:
+            _, d, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            self.expanded += 1
+            if node == target:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parent[node]
+                return path[::-1], d
+
+            for nxt, w in self.neighbors(node):
+                nd = d + w
+                if nd < dist.get(nxt, math.inf):
+                    dist[nxt]   = nd
+                    parent[nxt] = node
+                    heapq.heappush(heap, (nd + h(nxt, target), nd, nxt))
+
+        return None, math.inf
+
+    def route(self, source, target, astar=True):
+        # Route as node ids with the floor of each step
+        path, cost = self.shortest_path(self.node(*source), self.node(*target), astar)
+        if path is None:
+            return None, None, math.inf
+        ids, floors = self.path_ids(path)
+        return ids, floors, cost
+
+    def path_ids(self, path):
+        # A floor change shows up as the same connector on both floors; the
+        # user sees it once
+        ids, floors = [], []
+        for node in path:
+            node_id = self.node_id(node)
+            if ids and ids[-1] == node_id and node_id in self.connector_costs:
+                floors[-1] = node[0]
+                continue
+            ids.append(node_id)
+            floors.append(node[0])
+        return ids, floors
@@ -0,0 +1,344 @@
+import json
+import time
+import uuid
+import asyncio
+import argparse
+import cv2
+import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
+from aiohttp import web, WSMsgType
+
+import full_navigation as nav_pipeline
+from metrics import Metrics
+from ocr_batcher import OCRBatcher
+
+# ── Config ─────────────────────────────────────────────────────────────────
+HOST            = "0.0.0.0"
+PORT            = 8080
+OCR_BATCH       = 8          # frames from different sessions read in one model call
+OCR_BATCH_WAIT  = 0.010      # s a frame may wait for others to join its batch
+DECODE_THREADS  = 4          # JPEG decode + text-region proposals
+NAV_THREADS     = 4          # Navigator.update may block on a LLaMA call
+SESSION_TTL     = 300        # s without frames before a session is dropped
+MAX_FRAME_BYTES = 4 * 1024 * 1024
+
+# ── Session ────────────────────────────────────────────────────────────────
+# One phone. Frames arrive as encoded JPEG bytes; only the newest one waits
+# for OCR (latest wins), so a slow model or a burst of uploads never builds
+# a queue, and each processed result is pushed to the session's websockets.
+class Session:
+    def __init__(self, destination, building=None):
+        route, floor_type, floors = nav_pipeline.build_route(destination, building)
+        self.id          = uuid.uuid4().hex[:12]
+        self.building    = building or nav_pipeline.BUILDING_ID
+        self.destination = destination
+        self.nav         = nav_pipeline.Navigator(route, floor_type, floors,
+                                                  nav_pipeline.route_graph(floors, building))
+        self.received    = 0
+        self.dropped     = 0
+        self.processed   = 0
+        self.seq         = 0         # client frame number of the last processed frame
+        self.detected    = None
+        self.texts       = []
+        self.last_seen   = time.monotonic()
+        self.sockets     = set()
+        self.task        = None
+        self._pending    = None      # (seq, jpeg bytes)
+        self._wake       = asyncio.Event()
+
+    def submit(self, data, seq=None):
+        self.received  += 1
+        self.last_seen  = time.monotonic()
+        if self._pending is not None:
+            self.dropped += 1
+        self._pending = (self.received if seq is None else seq, data)
+        self._wake.set()
+
+    async def next_frame(self):
+        await self._wake.wait()
+        self._wake.clear()
+        pending, self._pending = self._pending, None
+        return pending
+
+    def state(self):
+        nav       = self.nav
+        next_node = nav.route[nav.current_step + 1] if nav.current_step + 1 < len(nav.route) else None
+        return {
+            "session":     self.id,
+            "building":    self.building,
+            "destination": self.destination,
+            "route":       nav.route,
+            "revision":    nav.revision,
+            "step":        nav.current_step,
+            "progress":    round(nav.progress(), 3),
+            "position":    nav.current_position,
+            "next":        next_node,
+            "floor":       nav.current_floor,
+            "instruction": nav.last_instruction,
+            "completed":   nav.completed,
+            "detected":    self.detected,
+            "texts":       self.texts,
+            "seq":         self.seq,
+            "received":    self.received,
+            "dropped":     self.dropped,
+            "processed":   self.processed,
+        }
+
+# ── Navigation service ─────────────────────────────────────────────────────
+# Owns the one OCR model, the building registry and every session. Frames
+# from all sessions meet in one OCRBatcher, which reads them in micro-batches
+# on a single inference thread.
+class NavigationService:
+    def __init__(self, ocr_batch=OCR_BATCH, ocr_batch_wait=OCR_BATCH_WAIT,
+                 nav_threads=NAV_THREADS, session_ttl=SESSION_TTL):
+        self.sessions     = {}
+        self.session_ttl  = session_ttl
+        self.metrics      = Metrics()
+        self.batcher      = None
+        self._batch       = (ocr_batch, ocr_batch_wait)
+        self._decode_pool = ThreadPoolExecutor(DECODE_THREADS, thread_name_prefix="decode")
+        self._nav_pool    = ThreadPoolExecutor(nav_threads, thread_name_prefix="nav")
+        self._reaper      = None
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        for component in (nav_pipeline.REGISTRY, nav_pipeline.SIGN_MATCHER,
+                          nav_pipeline.SIGN_FUZZY, nav_pipeline.PREFETCHER, nav_pipeline.reader):
+            await loop.run_in_executor(None, component.get)
+        self.batcher = OCRBatcher(nav_pipeline.reader.get(), *self._batch)
+        self._reaper = asyncio.create_task(self._reap())
+        print("✅ Navigation service ready")
+
+    async def stop(self):
+        for session in list(self.sessions.values()):
+            await self.close(session.id)
+        if self._reaper is not None:
+            self._reaper.cancel()
+        if self.batcher is not None:
+            self.batcher.close()
+        self._decode_pool.shutdown(wait=False, cancel_futures=True)
+        self._nav_pool.shutdown(wait=False, cancel_futures=True)
+        for component in (nav_pipeline.PREFETCHER, nav_pipeline.SIGN_MAP, nav_pipeline.memory):
+            component.close()
+        self.metrics.close()
+
+    def open(self, destination, building=None):
+        session = Session(destination, building)
+        if nav_pipeline.USE_LLAMA:
+            nav = session.nav
+            nav_pipeline.PREFETCHER.get().prefetch(nav_pipeline.route_legs(nav.route, nav.floors))
+        session.task = asyncio.create_task(self._run(session))
+        session.task.add_done_callback(lambda task: self._task_done(session, task))
+        self.sessions[session.id] = session
+        self.metrics.count("sessions_opened")
+        return session
+
+    async def close(self, session_id):
+        session = self.sessions.pop(session_id, None)
+        if session is None:
+            return
+        session.task.cancel()
+        for ws in list(session.sockets):
+            await ws.close()
+
+    def submit(self, session, data, seq=None):
+        dropped = session.dropped
+        session.submit(data, seq)
+        self.metrics.count("frames_received")
+        if session.dropped != dropped:
+            self.metrics.count("frames_dropped")
+
+    def _enqueue(self, data):
+        # Runs on the decode pool; returns a Future of the OCR results
+        frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            future = Future()
+            future.set_result([])
+            return future
+        return self.batcher.submit(frame)
+
+    async def _run(self, session):
+        # One bad frame (undecodable, OCR or navigation error) is reported
+        # and skipped; the session keeps going with the next one
+        while True:
+            seq, data = await session.next_frame()
+            try:
+                await self._process(session, seq, data)
+            except Exception as e:
+                print(f"❌ Session {session.id}: frame {seq} failed: {e!r}")
+                self.metrics.count("frame_error")
+
+    async def _process(self, session, seq, data):
+        loop      = asyncio.get_running_loop()
+        start     = time.perf_counter()
+        future    = await loop.run_in_executor(self._decode_pool, self._enqueue, data)
+        results   = await asyncio.wrap_future(future)
+        self.metrics.stop("ocr", start)
+
+        # Matching runs on the event loop: the shared sign map has one writer
+        texts      = [(r[1], r[2]) for r in results]
+        node, _, conf = nav_pipeline.match_text(texts)
+        texts      = [[t, round(float(c), 3)] for t, c in texts]
+        if node:
+            self.metrics.count("sign_match")
+            session.detected = node
+            await loop.run_in_executor(self._nav_pool, session.nav.update, node, conf)
+        session.texts      = texts
+        session.seq        = seq
+        session.processed += 1
+        self.metrics.stop("frame", start)
+
+        state = json.dumps(session.state())
+        for ws in list(session.sockets):
+            try:
+                await ws.send_str(state)
+            except ConnectionResetError:
+                session.sockets.discard(ws)
+
+    def _task_done(self, session, task):
+        # Anything _run did not catch ends the session instead of leaving a
+        # socket open on a state that never changes again
+        if task.cancelled() or task.exception() is None:
+            return
+        print(f"❌ Session {session.id} crashed: {task.exception()!r}")
+        self.metrics.count("session_error")
+        if self.sessions.get(session.id) is session:
+            asyncio.ensure_future(self.close(session.id))
+
+    async def _reap(self):
+        while True:
+            await asyncio.sleep(min(self.session_ttl, 30))
+            now = time.monotonic()
+            for session in list(self.sessions.values()):
+                if now - session.last_seen > self.session_ttl and not session.sockets:
+                    await self.close(session.id)
+                    self.metrics.count("sessions_expired")
+
+# ── HTTP / WebSocket API ───────────────────────────────────────────────────
+#   GET    /destinations[?building=b]  destination ids and labels
+#   POST   /sessions                   {"destination": id, "building": b} → session state
+#   GET    /sessions/{id}              session state
+#   POST   /sessions/{id}/frames       JPEG body (optional ?seq=n) → 202
+#   GET    /sessions/{id}/ws           binary JPEG messages in, JSON states out
+#   DELETE /sessions/{id}
+#   GET    /metrics                    Prometheus text
+routes = web.RouteTableDef()
+
+def _session(request):
+    session = request.app["service"].sessions.get(request.match_info["id"])
+    if session is None:
+        raise web.HTTPNotFound(text="unknown session")
+    return session
+
+@routes.get("/destinations")
+async def destinations(request):
+    try:
+        found = nav_pipeline.destinations(request.query.get("building"))
+    except KeyError as e:
+        raise web.HTTPNotFound(text=str(e))
+    return web.json_response({k: v["label"] for k, v in found.items()})
+
+@routes.post("/sessions")
+async def open_session(request):
+    body        = await request.json()
+    destination = body.get("destination")
+    building    = body.get("building")
+    try:
+        known = nav_pipeline.destinations(building)
+    except KeyError as e:
+        raise web.HTTPBadRequest(text=str(e))
+    if destination not in known:
+        raise web.HTTPBadRequest(text=f"unknown destination: {destination}")
+    try:
+        session = request.app["service"].open(destination, building)
+    except ValueError as e:
+        raise web.HTTPConflict(text=str(e))
+    return web.json_response(session.state(), status=201)
+
+@routes.get("/sessions/{id}")
+async def session_state(request):
+    return web.json_response(_session(request).state())
+
+@routes.delete("/sessions/{id}")
+async def close_session(request):
+    await request.app["service"].close(_session(request).id)
+    return web.Response(status=204)
+
+@routes.post("/sessions/{id}/frames")
+async def post_frame(request):
+    session = _session(request)
+    data    = await request.read()
+    if not data:
+        raise web.HTTPBadRequest(text="empty frame")
+    seq = request.query.get("seq")
+    request.app["service"].submit(session, data, int(seq) if seq else None)
+    return web.json_response({"received": session.received, "dropped": session.dropped},
+                             status=202)
+
+@routes.get("/sessions/{id}/ws")
+async def session_socket(request):
+    session = _session(request)
+    service = request.app["service"]
+    ws      = web.WebSocketResponse(max_msg_size=MAX_FRAME_BYTES)
+    await ws.prepare(request)
+    session.sockets.add(ws)
+    await ws.send_str(json.dumps(session.state()))
+    seq = 0
+    try:
+        async for msg in ws:
+            if msg.type == WSMsgType.BINARY:
+                seq += 1
+                service.submit(session, msg.data, seq)
+            elif msg.type == WSMsgType.ERROR:
+                break
+    finally:
+        session.sockets.discard(ws)
+    return ws
+
+@routes.get("/metrics")
+async def metrics(request):
+    service = request.app["service"]
+    text    = service.metrics.prometheus()
+    text   += f"# TYPE navigrid_sessions gauge\nnavigrid_sessions {len(service.sessions)}\n"
+    if service.batcher is not None:
+        text += (f"# TYPE navigrid_ocr_mean_batch gauge\n"
+                 f"navigrid_ocr_mean_batch {service.batcher.mean_batch():.3f}\n")
+    if nav_pipeline.REGISTRY.loaded():
+        stats = nav_pipeline.REGISTRY.get().stats()
+        text += (f"# TYPE navigrid_floors_resident gauge\nnavigrid_floors_resident {stats['resident']}\n"
+                 f"# TYPE navigrid_floor_bytes gauge\nnavigrid_floor_bytes {stats['bytes']}\n"
+                 f"# TYPE navigrid_floor_evictions_total counter\n"
+                 f"navigrid_floor_evictions_total {stats['evictions']}\n")
+    return web.Response(text=text, content_type="text/plain")
+
+def create_app(service=None):
+    app            = web.Application(client_max_size=MAX_FRAME_BYTES)
+    app["service"] = service or NavigationService()
+    app.add_routes(routes)
+
+    async def startup(app):
+        await app["service"].start()
+
+    async def cleanup(app):
+        await app["service"].stop()
+
+    app.on_startup.append(startup)
+    app.on_cleanup.append(cleanup)
+    return app
+
+# ── Main ───────────────────────────────────────────────────────────────────
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NaviGrid multi-session navigation server")
+    parser.add_argument("--host",        default=HOST)
+    parser.add_argument("--port",        type=int, default=PORT)
+    parser.add_argument("--ocr-batch",   type=int,   default=OCR_BATCH)
+    parser.add_argument("--ocr-wait",    type=float, default=OCR_BATCH_WAIT)
+    parser.add_argument("--no-llama",    action="store_true", help="plain instructions only")
+    args = parser.parse_args(argv)
+
+    nav_pipeline.USE_LLAMA = not args.no_llama
+    service = NavigationService(ocr_batch=args.ocr_batch, ocr_batch_wait=args.ocr_wait)
+    web.run_app(create_app(service), host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
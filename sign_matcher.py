@@ -0,0 +1,87 @@
+from collections import deque
+
+# ── Sign matcher ───────────────────────────────────────────────────────────
+# Aho–Corasick automaton over the sign map keys. One pass over an OCR string
+# finds every key it contains; the key that was added to the sign map first
+# wins, exactly like scanning SIGN_MAP.items() in order with `key in text`.
+NO_MATCH = float("inf")
+
+class SignMatcher:
+    def __init__(self, sign_map=None):
+        self._goto   = [{}]        # state → {char: state}
+        self._fail   = [0]
+        self._own    = [NO_MATCH]  # rank of the key ending exactly here
+        self._best   = [NO_MATCH]  # lowest rank ending here or on a suffix
+        self._ranks  = {}          # key → insertion rank
+        self._values = []          # rank → node id
+        self._dirty  = False
+        for key, node_id in (sign_map or {}).items():
+            self.add(key, node_id)
+
+    def __len__(self):
+        return len(self._ranks)
+
+    def add(self, key, node_id):
+        if key in self._ranks:
+            self._values[self._ranks[key]] = node_id
+            return
+
+        rank              = len(self._values)
+        self._ranks[key]  = rank
+        self._values.append(node_id)
+
+        state = 0
+        for ch in key:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._own.append(NO_MATCH)
+                self._best.append(NO_MATCH)
+                self._goto[state][ch] = nxt
+            state = nxt
+        self._own[state] = min(self._own[state], rank)
+
+        # New states can become the failure target of existing ones, so the
+        # links are recomputed lazily before the next search.
+        self._dirty = True
+
+    def _build(self):
+        self._best[0] = self._own[0]
+        queue         = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            self._best[child] = min(self._own[child], self._best[0])
+            queue.append(child)
+
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                f                 = self._goto[f].get(ch, 0)
+                self._fail[child] = f
+                self._best[child] = min(self._own[child], self._best[f])
+                queue.append(child)
+
+        self._dirty = False
+
+    def match(self, text):
+        if self._dirty:
+            self._build()
+
+        goto, fail, best_at = self._goto, self._fail, self._best
+        best  = best_at[0]
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if best_at[state] < best:
+                best = best_at[state]
+                if best == 0:
+                    break
+
+        return None if best == NO_MATCH else self._values[best]
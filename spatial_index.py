@@ -0,0 +1,182 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+# ── Config ─────────────────────────────────────────────────────────────────
+CELL_BOXES = 4       # target boxes per grid cell
+MAX_CELLS  = 64      # boxes spanning more cells go on the always-checked list
+
+# ── One floor ──────────────────────────────────────────────────────────────
+# Two structures over the same nodes:
+#   cKDTree over the node centres       nearest(), within()
+#   uniform grid over the annotation    containing(), boxes_at()
+#   boxes, CSR-packed (cell → boxes)
+# Every query takes an (M, 2) array of floorplan points and answers all of
+# them in one vectorized pass; a single (x, y) works too.
+class FloorIndex:
+    def __init__(self, coords, bbox=None):
+        self.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        n           = len(self.coords)
+        if bbox is None:
+            bbox = np.concatenate([self.coords, self.coords], axis=1)
+        self.bbox   = np.asarray(bbox, dtype=np.float64).reshape(n, 4)
+        self.area   = (self.bbox[:, 2] - self.bbox[:, 0]) * (self.bbox[:, 3] - self.bbox[:, 1])
+        self.tree   = cKDTree(self.coords) if n else None
+        self._build_grid()
+
+    def __len__(self):
+        return len(self.coords)
+
+    def _build_grid(self):
+        n = len(self.bbox)
+        if n == 0:
+            self.origin, self.cell, self.shape = np.zeros(2), 1.0, (1, 1)
+            self.indptr  = np.zeros(2, dtype=np.int64)
+            self.boxes   = np.empty(0, dtype=np.int64)
+            self.big     = np.empty(0, dtype=np.int64)
+            return
+
+        lo     = self.bbox[:, :2].min(axis=0)
+        hi     = self.bbox[:, 2:].max(axis=0)
+        extent = np.maximum(hi - lo, 1.0)
+        sides  = np.maximum(self.bbox[:, 2:] - self.bbox[:, :2], 1.0)
+        cell   = max(float(np.sqrt(extent[0] * extent[1] * CELL_BOXES / n)),
+                     float(np.median(sides)))
+        gw, gh = (np.floor(extent / cell).astype(np.int64) + 1).tolist()
+
+        c0    = self._cells(self.bbox[:, :2], lo, cell, gw, gh)
+        c1    = self._cells(self.bbox[:, 2:], lo, cell, gw, gh)
+        span  = c1 - c0 + 1
+        count = span[:, 0] * span[:, 1]
+        big   = count > MAX_CELLS
+        small = np.flatnonzero(~big)
+
+        # Expand every small box into the cells it overlaps
+        reps   = count[small]
+        box    = np.repeat(small, reps)
+        k      = np.arange(reps.sum()) - np.repeat(np.cumsum(reps) - reps, reps)
+        w      = span[box, 0]
+        cx     = c0[box, 0] + k % w
+        cy     = c0[box, 1] + k // w
+        cells  = cy * gw + cx
+        order  = np.argsort(cells, kind="stable")
+
+        self.origin, self.cell, self.shape = lo, cell, (gw, gh)
+        self.indptr     = np.zeros(gw * gh + 1, dtype=np.int64)
+        self.indptr[1:] = np.cumsum(np.bincount(cells, minlength=gw * gh))
+        self.boxes      = box[order]
+        self.big        = np.flatnonzero(big)
+
+    @staticmethod
+    def _cells(points, lo, cell, gw, gh):
+        c = np.floor((points - lo) / cell).astype(np.int64)
+        return np.clip(c, 0, [gw - 1, gh - 1])
+
+    # ── Point in box ───────────────────────────────────────────────────────
+    # All (point index, node index) pairs where the node's box contains the
+    # point, sorted by point.
+    def boxes_at(self, points):
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        m      = len(points)
+        gw, gh = self.shape
+        c      = self._cells(points, self.origin, self.cell, gw, gh)
+        cells  = c[:, 1] * gw + c[:, 0]
+        inside = np.all((points >= self.origin) &
+                        (points <= self.origin + self.cell * np.array([gw, gh])), axis=1)
+
+        start  = self.indptr[cells]
+        reps   = np.where(inside, self.indptr[cells + 1] - start, 0)
+        pt     = np.repeat(np.arange(m), reps)
+        k      = np.arange(reps.sum()) - np.repeat(np.cumsum(reps) - reps, reps)
+        node   = self.boxes[np.repeat(start, reps) + k]
+        if len(self.big):
+            pt   = np.concatenate([pt, np.repeat(np.arange(m), len(self.big))])
+            node = np.concatenate([node, np.tile(self.big, m)])
+
+        b   = self.bbox[node]
+        p   = points[pt]
+        hit = (p[:, 0] >= b[:, 0]) & (p[:, 0] <= b[:, 2]) & \
+              (p[:, 1] >= b[:, 1]) & (p[:, 1] <= b[:, 3])
+        pt, node = pt[hit], node[hit]
+        order    = np.lexsort((self.area[node], pt))
+        return pt[order], node[order]
+
+    def containing(self, points):
+        # Smallest box containing each point, or -1
+        points   = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        pt, node = self.boxes_at(points)
+        out       = np.full(len(points), -1, dtype=np.int64)
+        first     = np.ones(len(pt), dtype=bool)
+        first[1:] = pt[1:] != pt[:-1]
+        out[pt[first]] = node[first]
+        return out
+
+    # ── Nearest centres ────────────────────────────────────────────────────
+    def nearest(self, points, k=1, max_dist=np.inf):
+        # (distances, indices), shaped (M,) for k=1 else (M, k); misses are
+        # inf / len(self)
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if self.tree is None:
+            shape = (len(points),) if k == 1 else (len(points), k)
+            return np.full(shape, np.inf), np.zeros(shape, dtype=np.int64)
+        return self.tree.query(points, k=k, distance_upper_bound=max_dist)
+
+    def within(self, points, radius):
+        # Indices of every centre within `radius` of each point, nearest first
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if self.tree is None:
+            return [np.empty(0, dtype=np.int64) for _ in points]
+        out = []
+        for p, idx in zip(points, self.tree.query_ball_point(points, radius)):
+            idx = np.asarray(idx, dtype=np.int64)
+            d   = np.hypot(*(self.coords[idx] - p).T)
+            out.append(idx[np.argsort(d, kind="stable")])
+        return out
+
+    def locate(self, points):
+        # Snap: the containing node if any, else the nearest centre
+        hit  = self.containing(points)
+        miss = hit < 0
+        if miss.any() and self.tree is not None:
+            hit[miss] = self.nearest(np.asarray(points, dtype=np.float64).reshape(-1, 2)[miss])[1]
+        return hit
+
+# ── Whole building ─────────────────────────────────────────────────────────
+# One FloorIndex per floor of a BuildingGraph. Results are routing nodes,
+# (floor, local index) pairs; floor=None searches every floor, which only
+# makes sense when the floorplans share one pixel frame (aligned plans).
+class SpatialIndex:
+    def __init__(self, floors):
+        self.floors = {name: g.spatial if hasattr(g, "spatial") else FloorIndex(g.coords, g.bbox)
+                       for name, g in floors.items()}
+
+    def _names(self, floor):
+        return list(self.floors) if floor is None else [floor]
+
+    def containing(self, points, floor=None):
+        hits = []
+        for name in self._names(floor):
+            idx = self.floors[name].containing(points)
+            hits.append([(name, int(i)) if i >= 0 else None for i in idx])
+        return [next((h for h in row if h is not None), None) for row in zip(*hits)]
+
+    def nearest(self, points, floor=None, max_dist=np.inf):
+        best = None
+        for name in self._names(floor):
+            d, i = self.floors[name].nearest(points, max_dist=max_dist)
+            if best is None:
+                best = (d, np.array([name] * len(d), dtype=object), i)
+                continue
+            closer          = d < best[0]
+            best[0][closer] = d[closer]
+            best[1][closer] = name
+            best[2][closer] = i[closer]
+        d, names, idx = best
+        return [(float(di), (n, int(i)) if np.isfinite(di) else None)
+                for di, n, i in zip(d, names, idx)]
+
+    def within(self, points, radius, floor=None):
+        out = [[] for _ in range(len(np.asarray(points).reshape(-1, 2)))]
+        for name in self._names(floor):
+            for row, idx in zip(out, self.floors[name].within(points, radius)):
+                row.extend((name, int(i)) for i in idx)
+        return out
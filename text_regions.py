@@ -0,0 +1,74 @@
+import cv2
+import numpy as np
+
+# ── Config ─────────────────────────────────────────────────────────────────
+PROPOSAL_SCALE = 0.5     # proposals are computed on a half-size frame
+MIN_GRADIENT   = 40      # floor under Otsu so flat walls don't light up
+MIN_TEXT_H     = 6       # px at proposal scale
+MAX_TEXT_H     = 0.25    # fraction of frame height
+MIN_FILL       = 0.35    # text lines fill most of their box once closed
+MAX_REGIONS    = 12
+PAD            = 6       # px added around each box at full scale
+
+_GRADIENT_KERNEL = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+_LINE_KERNEL     = cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1))
+_LONG_H_KERNEL   = cv2.getStructuringElement(cv2.MORPH_RECT, (25, 1))
+_LONG_V_KERNEL   = cv2.getStructuringElement(cv2.MORPH_RECT, (1, 25))
+
+# ── Region proposals ───────────────────────────────────────────────────────
+# Characters are dense, high-contrast strokes: a morphological gradient
+# closed horizontally merges them into one blob per text line. Long straight
+# edges (door frames, skirting, sign borders) are removed first so they
+# don't chain unrelated blobs together. Returns EasyOCR `horizontal_list`
+# boxes ([x_min, x_max, y_min, y_max]) in full-frame pixels.
+def propose_text_regions(frame, scale=PROPOSAL_SCALE, max_regions=MAX_REGIONS):
+    gray  = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    sh, sw = small.shape
+
+    grad   = cv2.morphologyEx(small, cv2.MORPH_GRADIENT, _GRADIENT_KERNEL)
+    thresh = max(cv2.threshold(grad, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)[0],
+                 MIN_GRADIENT)
+    mask   = (grad > thresh).astype(np.uint8)
+    lines  = (cv2.morphologyEx(mask, cv2.MORPH_OPEN, _LONG_H_KERNEL) |
+              cv2.morphologyEx(mask, cv2.MORPH_OPEN, _LONG_V_KERNEL))
+    mask[lines > 0] = 0
+    mask   = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, _LINE_KERNEL)
+
+    _, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    x, y, w, h, area = stats[1:].T.astype(np.float32)
+    keep = ((h >= MIN_TEXT_H) & (h <= MAX_TEXT_H * sh) &
+            (w >= h) & (w <= 0.9 * sw) &
+            (area / np.maximum(w * h, 1) >= MIN_FILL))
+    if not keep.any():
+        return []
+
+    x, y, w, h, area = x[keep], y[keep], w[keep], h[keep], area[keep]
+    best = np.argsort(-area)[:max_regions]
+
+    fh, fw = gray.shape
+    boxes  = np.stack([x[best] / scale - PAD,
+                       (x[best] + w[best]) / scale + PAD,
+                       y[best] / scale - PAD,
+                       (y[best] + h[best]) / scale + PAD], axis=1)
+    boxes  = np.clip(boxes, 0, [fw, fw, fh, fh]).astype(np.int32)
+    return boxes.tolist()
+
+# ── Region-only OCR ────────────────────────────────────────────────────────
+# Drop-in for easyocr.Reader.readtext: skips the CRAFT detector and runs the
+# recognizer once over all proposed crops. EasyOCR crops `horizontal_list`
+# boxes itself and reports each result in full-frame coordinates, so
+# draw_overlay works unchanged.
+class RegionReader:
+    def __init__(self, reader, max_regions=MAX_REGIONS):
+        self.reader       = reader
+        self.max_regions  = max_regions
+        self.last_regions = []
+
+    def readtext(self, frame):
+        boxes             = propose_text_regions(frame, max_regions=self.max_regions)
+        self.last_regions = boxes
+        if not boxes:
+            return []
+        return self.reader.recognize(frame, horizontal_list=boxes, free_list=[],
+                                     batch_size=len(boxes))